@@ -4,7 +4,9 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 import json
-from functions import FUNCTION_DEFINITIONS, execute_function
+from functions import get_function_definitions, execute_function
+from tool_registry import tool_registry
+from mcp_client import mcp_client
 
 # 환경 변수 로드
 load_dotenv()
@@ -14,6 +16,15 @@ app = Flask(__name__)
 # OpenAI API 클라이언트 초기화
 client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
 
+# MCP 서버 capabilities 기반 도구 레지스트리 시작 (디스크 캐시 -> 백그라운드 동기화)
+# python app.py(debug 리로더)로 실행하면 실제 서빙은 자식 프로세스(WERKZEUG_RUN_MAIN=true)에서만 하므로
+# 감시만 하는 부모 프로세스에서는 시작하지 않음 (WSGI 서버가 import하는 경우는 그대로 시작)
+if __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+    tool_registry.start()
+
+# 채팅 요청 1건에서 MCP 도구 호출에 쓸 수 있는 총 시간(초)
+CHAT_TOOL_BUDGET_SECONDS = float(os.getenv('CHAT_TOOL_BUDGET_SECONDS', 30))
+
 # 채팅 기록을 저장할 리스트
 chat_history = []
 
@@ -57,7 +68,7 @@ def chat():
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=api_messages,
-            tools=FUNCTION_DEFINITIONS,
+            tools=get_function_definitions(),
             tool_choice="auto",
             max_tokens=2000
         )
@@ -75,50 +86,54 @@ def chat():
         max_rounds = 5
         round_count = 0
         
-        while message.tool_calls and round_count < max_rounds:
-            round_count += 1
-            print(f"=== Function Calling Round {round_count} ===")
+        # 모든 라운드의 MCP 도구 호출이 하나의 시간 예산을 공유 (라운드별 타임아웃 누적 방지)
+        # LLM 호출 시간은 도구 예산에서 빼지 않도록 deadline을 멈춘 채 호출
+        with mcp_client.deadline(CHAT_TOOL_BUDGET_SECONDS):
+            while message.tool_calls and round_count < max_rounds:
+                round_count += 1
+                print(f"=== Function Calling Round {round_count} ===")
             
-            # 함수 호출 메시지를 추가 (첫 라운드부터)
-            api_messages.append(message)
+                # 함수 호출 메시지를 추가 (첫 라운드부터)
+                api_messages.append(message)
             
-            # 각 function 호출 처리
-            for tool_call in message.tool_calls:
-                function_name = tool_call.function.name
-                arguments = json.loads(tool_call.function.arguments)
+                # 각 function 호출 처리
+                for tool_call in message.tool_calls:
+                    function_name = tool_call.function.name
+                    arguments = json.loads(tool_call.function.arguments)
                 
-                # 디버깅 로그
-                print(f"=== Function Call ===")
-                print(f"Function: {function_name}")
-                print(f"Arguments: {arguments}")
+                    # 디버깅 로그
+                    print(f"=== Function Call ===")
+                    print(f"Function: {function_name}")
+                    print(f"Arguments: {arguments}")
                 
-                # 함수 실행
-                function_result = execute_function(function_name, arguments)
+                    # 함수 실행
+                    function_result = execute_function(function_name, arguments)
                 
-                print(f"Result: {function_result}")
+                    print(f"Result: {function_result}")
                 
-                # 결과를 메시지에 추가
-                api_messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "name": function_name,
-                    "content": function_result
-                })
+                    # 결과를 메시지에 추가
+                    api_messages.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call.id,
+                        "name": function_name,
+                        "content": function_result
+                    })
             
-            # 함수 실행 결과를 바탕으로 다음 응답 생성 (다음 라운드의 함수 호출 또는 최종 응답)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=api_messages,
-                tools=FUNCTION_DEFINITIONS,
-                tool_choice="auto",
-                max_tokens=2000
-            )
-            message = response.choices[0].message
+                # 함수 실행 결과를 바탕으로 다음 응답 생성 (다음 라운드의 함수 호출 또는 최종 응답)
+                with mcp_client.deadline_paused():
+                    response = client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=api_messages,
+                        tools=get_function_definitions(),
+                        tool_choice="auto",
+                        max_tokens=2000
+                    )
+                message = response.choices[0].message
             
-            # 더 이상 함수 호출이 없으면 최종 응답 저장하고 종료
-            if not message.tool_calls:
-                ai_response = message.content or ""
-                break
+                # 더 이상 함수 호출이 없으면 최종 응답 저장하고 종료
+                if not message.tool_calls:
+                    ai_response = message.content or ""
+                    break
         
         # 함수 호출이 없었던 경우 (처음부터 응답만 있었던 경우)
         if not message.tool_calls and ai_response == "":
@@ -172,5 +187,12 @@ def clear_chat():
 def get_history():
     return jsonify({'history': chat_history})
 
+@app.route('/mcp-latency')
+def get_mcp_latency():
+    """MCP 엔드포인트별 지연 히스토그램과 현재 적응형 타임아웃 (튜닝용)"""
+    stats = mcp_client.latency_stats()
+    stats['chat_tool_budget_seconds'] = CHAT_TOOL_BUDGET_SECONDS
+    return jsonify(stats)
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5002)
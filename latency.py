@@ -0,0 +1,166 @@
+"""
+MCP 호출 지연 히스토그램과 적응형 타임아웃
+
+- 엔드포인트별 최근 N개 지연(rolling window)과 고정 버킷 누적 히스토그램을 유지합니다.
+- 타임아웃 = clamp(p99 x factor, floor, ceiling). 표본이 부족하면 호출부의 기본값을 사용합니다.
+  멱등하지 않은 호출(POST 발송/등록/생성)은 짧은 타임아웃 후 재시도가 중복을 만들 수 있어 적응형을 쓰지 않고 기본값을 사용합니다.
+- deadline(seconds) 컨텍스트 안에서는 남은 예산을 넘는 타임아웃을 주지 않으며,
+  예산이 소진되면 요청을 보내기 전에 requests Timeout을 발생시킵니다.
+  paused() 컨텍스트 안에서 흐른 시간(LLM 호출 등)은 예산에서 빠지지 않습니다.
+
+환경변수:
+- MCP_TIMEOUT_FACTOR (기본 3.0)
+- MCP_TIMEOUT_FLOOR (기본 1.0초)
+- MCP_TIMEOUT_CEILING (기본 30초)
+- MCP_LATENCY_WINDOW (기본 200개)
+- MCP_LATENCY_MIN_SAMPLES (기본 20개)
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+import requests
+
+# 누적 히스토그램 버킷 상한(ms), 마지막은 +Inf
+BUCKET_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+def percentile(sorted_samples, p):
+    """정렬된 표본의 p 백분위수 (nearest-rank)"""
+    if not sorted_samples:
+        return None
+    idx = min(len(sorted_samples) - 1, max(0, int(round(p / 100.0 * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[idx]
+
+
+class LatencyHistogram:
+    """엔드포인트 하나의 지연 분포"""
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+    def record(self, seconds, error=False):
+        self.samples.append(seconds)
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        if error:
+            self.errors += 1
+
+    def percentiles(self):
+        ordered = sorted(self.samples)
+        return {p: percentile(ordered, p) for p in (50, 90, 99)}, (ordered[-1] if ordered else None)
+
+
+class AdaptiveTimeouts:
+    """엔드포인트별 지연 기반 타임아웃 + 요청 단위 deadline 예산"""
+
+    def __init__(self, factor=None, floor=None, ceiling=None, window=None, min_samples=None):
+        self.factor = factor or float(os.getenv('MCP_TIMEOUT_FACTOR', 3.0))
+        self.floor = floor or float(os.getenv('MCP_TIMEOUT_FLOOR', 1.0))
+        self.ceiling = ceiling or float(os.getenv('MCP_TIMEOUT_CEILING', 30.0))
+        self.window = window or int(os.getenv('MCP_LATENCY_WINDOW', 200))
+        self.min_samples = min_samples or int(os.getenv('MCP_LATENCY_MIN_SAMPLES', 20))
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ===== deadline =====
+    @contextmanager
+    def deadline(self, seconds):
+        """현재 스레드의 MCP 호출 전체에 남은 시간 예산 적용 (중첩 시 더 이른 마감 유지)"""
+        previous = getattr(self._local, 'deadline', None)
+        new_deadline = time.monotonic() + seconds
+        self._local.deadline = min(previous, new_deadline) if previous else new_deadline
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+
+    @contextmanager
+    def paused(self):
+        """현재 스레드의 deadline을 잠시 멈춤 (블록 안에서 흐른 시간은 예산에서 빼지 않음)"""
+        remaining = self.remaining()
+        self._local.deadline = None
+        try:
+            yield
+        finally:
+            self._local.deadline = time.monotonic() + remaining if remaining is not None else None
+
+    def remaining(self):
+        """남은 예산(초). deadline 밖이면 None"""
+        deadline = getattr(self._local, 'deadline', None)
+        if deadline is None:
+            return None
+        return deadline - time.monotonic()
+
+    # ===== 타임아웃 =====
+    def adaptive_timeout(self, key, default):
+        """지연 분포 기반 타임아웃 (표본 부족 시 default)"""
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None or len(hist.samples) < self.min_samples:
+                return default
+            ordered = sorted(hist.samples)
+        p99 = percentile(ordered, 99)
+        return min(self.ceiling, max(self.floor, p99 * self.factor))
+
+    def timeout_for(self, key, default, adaptive=True):
+        """
+        adaptive 타임아웃(adaptive=False면 default)과 남은 deadline 중 작은 값. 예산 소진 시 Timeout 발생
+        """
+        timeout = self.adaptive_timeout(key, default) if adaptive else default
+        remaining = self.remaining()
+        if remaining is not None:
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"요청 시간 예산 소진 (deadline exceeded): {key}")
+            timeout = min(timeout, remaining)
+        return timeout
+
+    def record(self, key, seconds, error=False):
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = LatencyHistogram(self.window)
+            hist.record(seconds, error=error)
+
+    # ===== 조회 =====
+    def snapshot(self):
+        """엔드포인트별 히스토그램/백분위수/현재 타임아웃 (튜닝용)"""
+        with self._lock:
+            items = list(self._histograms.items())
+        endpoints = {}
+        for key, hist in items:
+            pcts, max_seconds = hist.percentiles()
+            buckets = {f"le_{b}ms": c for b, c in zip(BUCKET_BOUNDS_MS, hist.buckets)}
+            buckets["le_inf"] = hist.buckets[-1]
+            endpoints[key] = {
+                "count": hist.count,
+                "errors": hist.errors,
+                "window": len(hist.samples),
+                "mean_ms": round(hist.total / hist.count * 1000, 2) if hist.count else None,
+                "p50_ms": round(pcts[50] * 1000, 2) if pcts[50] is not None else None,
+                "p90_ms": round(pcts[90] * 1000, 2) if pcts[90] is not None else None,
+                "p99_ms": round(pcts[99] * 1000, 2) if pcts[99] is not None else None,
+                "max_ms": round(max_seconds * 1000, 2) if max_seconds is not None else None,
+                "adaptive_timeout_s": round(self.adaptive_timeout(key, None), 3)
+                    if len(hist.samples) >= self.min_samples else None,
+                "buckets": buckets
+            }
+        return {
+            "settings": {
+                "factor": self.factor,
+                "floor_s": self.floor,
+                "ceiling_s": self.ceiling,
+                "window": self.window,
+                "min_samples": self.min_samples
+            },
+            "endpoints": endpoints
+        }
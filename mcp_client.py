@@ -2,13 +2,232 @@
 MCP 서버 호출 클라이언트
 """
 import requests
+import importlib
 import json
 import os
+import sys
+import threading
+import itertools
+import time
+from latency import AdaptiveTimeouts
+from uds_transport import UDS_SCHEME, UnixSocketAdapter
+from mcp_server.mcp_dispatch import call_route, resolve_endpoint
+
+MCP_SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mcp_server')
+
+# capabilities를 제공하는 MCP 서버 목록 (이름 -> capabilities 경로)
+MCP_SERVERS = {
+    'kakao': '/mcp/kakao/capabilities',
+    'famoussaying': '/mcp/famoussaying/capabilities',
+    'tam_admin': '/mcp/tam-admin/capabilities',
+    'devtalk': '/mcp/devtalk/capabilities',
+    'github': '/mcp/github/capabilities',
+    'kakao_calendar': '/mcp/kakao-calendar/capabilities',
+}
+
+# embedded 모드에서 인프로세스로 적재할 MCP 서버 모듈 (mcp_server/ 기준)
+MCP_SERVER_MODULES = {
+    'kakao': 'kakao_mcp_server',
+    'famoussaying': 'famoussaying_mcp_server',
+    'tam_admin': 'tam_admin_mcp_server',
+    'devtalk': 'devtalk_mcp_server',
+    'github': 'github_mcp_server',
+    'kakao_calendar': 'kakao_calendar_mcp_server',
+}
+
+# 표준 MCP 프로토콜 버전 (Streamable HTTP)
+MCP_PROTOCOL_VERSION = '2025-03-26'
+
+def parse_extra_servers(value):
+    """MCP_EXTRA_SERVERS="name=url,name2=url2" -> {name: url} (서드파티 MCP 서버 엔드포인트)"""
+    servers = {}
+    for item in (value or '').split(','):
+        name, sep, url = item.strip().partition('=')
+        if sep and name and url:
+            servers[name.strip()] = url.strip()
+    return servers
+
+def _int_or_none(value):
+    return int(value) if value is not None else None
+
+# embedded 모드에서 라우트/JSON 변환 없이 핸들러 객체를 직접 호출하는 경로
+# (server, method, path) -> fn(module, args) -> dict
+EMBEDDED_DIRECT_HANDLERS = {
+    ('famoussaying', 'GET', '/mcp/famoussaying/get'):
+        lambda mod, args: mod.famous_saying_client.get_random_famous_saying(),
+    ('kakao', 'GET', '/mcp/kakao/me'):
+        lambda mod, args: mod.messenger.get_my_info(),
+    ('kakao', 'GET', '/mcp/kakao/friends'):
+        lambda mod, args: mod.messenger.get_friends(
+            offset=_int_or_none(args.get('offset')),
+            limit=_int_or_none(args.get('limit')),
+            order=args.get('order')
+        ),
+}
+
+class EmbeddedResponse:
+    """embedded 모드 호출 결과 (requests.Response 호환 최소 인터페이스)"""
+
+    def __init__(self, status_code, data, path):
+        self.status_code = status_code
+        self._data = data
+        self.url = f"embedded://{path}"
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        if self._data is None:
+            raise ValueError("empty body")
+        return self._data
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+class MCPError(Exception):
+    """MCP JSON-RPC 오류 응답"""
+
+    def __init__(self, code, message):
+        super().__init__(f"MCP error {code}: {message}")
+        self.code = code
+
+
+class MCPSession:
+    """
+    MCP 서버 하나에 대한 장기 세션 (Streamable HTTP)
+
+    initialize 핸드셰이크는 최초 1회만 수행하고 Mcp-Session-Id를 재사용합니다.
+    요청 id로 응답을 구분하므로 여러 스레드가 동시에 같은 세션(keep-alive 연결 풀)을 공유할 수 있습니다.
+    """
+
+    def __init__(self, url, http=None, client_name='tam-agent', timeout=15):
+        self.url = url
+        self.http = http or requests.Session()
+        self.client_name = client_name
+        self.timeout = timeout
+        self.session_id = None
+        self.server_info = None
+        self._ids = itertools.count(1)
+        self._init_lock = threading.Lock()
+
+    def _headers(self):
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json, text/event-stream',
+            'MCP-Protocol-Version': MCP_PROTOCOL_VERSION
+        }
+        if self.session_id:
+            headers['Mcp-Session-Id'] = self.session_id
+        return headers
+
+    @staticmethod
+    def _parse_response(response, req_id):
+        """application/json 또는 text/event-stream 응답에서 req_id 결과 추출"""
+        content_type = response.headers.get('Content-Type', '')
+        if content_type.startswith('text/event-stream'):
+            messages = []
+            data_lines = []
+            for line in response.text.splitlines() + ['']:
+                if line.startswith('data:'):
+                    data_lines.append(line[5:].strip())
+                elif not line and data_lines:
+                    messages.append(json.loads('\n'.join(data_lines)))
+                    data_lines = []
+        else:
+            body = response.json()
+            messages = body if isinstance(body, list) else [body]
+        for message in messages:
+            if isinstance(message, dict) and message.get('id') == req_id:
+                if 'error' in message:
+                    raise MCPError(message['error'].get('code'), message['error'].get('message'))
+                return message.get('result')
+        raise MCPError(-32603, f"no response for request id {req_id}")
+
+    def _post(self, payload, timeout=None):
+        return self.http.post(self.url, json=payload, headers=self._headers(), timeout=timeout or self.timeout)
+
+    def initialize(self):
+        """initialize 핸드셰이크 (세션 발급) + initialized 알림"""
+        with self._init_lock:
+            if self.session_id:
+                return self.server_info
+            self.session_id = None
+            req_id = next(self._ids)
+            response = self._post({
+                "jsonrpc": "2.0",
+                "id": req_id,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": MCP_PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": self.client_name, "version": "1.0.0"}
+                }
+            })
+            response.raise_for_status()
+            result = self._parse_response(response, req_id)
+            self.session_id = response.headers.get('Mcp-Session-Id')
+            self.server_info = result.get('serverInfo')
+            self._post({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            return self.server_info
+
+    def request(self, method, params=None, timeout=None):
+        """JSON-RPC 요청. 세션 만료(404) 시 한 번 재초기화 후 재시도"""
+        if not self.session_id:
+            self.initialize()
+        for attempt in range(2):
+            req_id = next(self._ids)
+            payload = {"jsonrpc": "2.0", "id": req_id, "method": method}
+            if params is not None:
+                payload["params"] = params
+            response = self._post(payload, timeout=timeout)
+            if response.status_code == 404 and attempt == 0:
+                self.session_id = None
+                self.initialize()
+                continue
+            response.raise_for_status()
+            return self._parse_response(response, req_id)
+
+    def list_tools(self):
+        """tools/list (cursor 페이지네이션 포함)"""
+        tools = []
+        cursor = None
+        while True:
+            result = self.request('tools/list', {"cursor": cursor} if cursor else {})
+            tools.extend(result.get('tools') or [])
+            cursor = result.get('nextCursor')
+            if not cursor:
+                return tools
+
+    def call_tool(self, name, arguments=None, timeout=None):
+        """tools/call 결과를 dict로 변환 (structuredContent 우선, 없으면 text content JSON 파싱)"""
+        result = self.request('tools/call', {"name": name, "arguments": arguments or {}}, timeout=timeout)
+        if isinstance(result.get('structuredContent'), dict):
+            return result['structuredContent']
+        text = '\n'.join(c.get('text', '') for c in result.get('content') or [] if c.get('type') == 'text')
+        try:
+            data = json.loads(text)
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
+        return {"success": not result.get('isError'), "content": text}
+
+    def close(self):
+        """세션 종료 (DELETE)"""
+        if self.session_id:
+            try:
+                self.http.delete(self.url, headers=self._headers(), timeout=5)
+            except requests.exceptions.RequestException:
+                pass
+            self.session_id = None
+
 
 class MCPClient:
     """MCP 서버와 통신하는 클라이언트"""
     
-    def __init__(self, base_url=None):
+    def __init__(self, base_url=None, transport=None):
         self.base_url = base_url or os.getenv('MCP_SERVER_URL', 'http://localhost:5003')
         # tam-admin MCP 서버 URL (별도 포트/서비스)
         self.tam_admin_base_url = os.getenv('TAM_ADMIN_MCP_SERVER_URL', 'http://localhost:5005')
@@ -18,6 +237,201 @@ class MCPClient:
         self.github_base_url = os.getenv('GITHUB_MCP_SERVER_URL', 'http://localhost:5011')
         # kakao calendar MCP 서버 URL
         self.kakao_cal_base_url = os.getenv('KAKAO_CAL_MCP_SERVER_URL', 'http://localhost:5012')
+        # 명언 MCP 서버 URL
+        self.famoussaying_base_url = os.getenv('FAMOUSSAYING_MCP_SERVER_URL', 'http://localhost:5004')
+        # 전송 모드: http(기본, 서버별 프로세스) | embedded(MCP 서버 핸들러를 인프로세스로 직접 호출)
+        #           | mcp(서버별 표준 MCP JSON-RPC 세션)
+        self.transport = (transport or os.getenv('MCP_TRANSPORT', 'http')).lower()
+        self._embedded_modules = {}
+        self._embedded_lock = threading.Lock()
+        # http 모드 세션: *_MCP_SERVER_URL이 http+unix:// 이면 Unix domain socket으로 연결
+        self._http = requests.Session()
+        self._http.mount(UDS_SCHEME, UnixSocketAdapter())
+        # 서드파티 MCP 서버 (이름 -> MCP 엔드포인트 URL): 래퍼 없이 tools/list, tools/call로 연동
+        self.extra_servers = parse_extra_servers(os.getenv('MCP_EXTRA_SERVERS', ''))
+        self._mcp_sessions = {}
+        self._mcp_sessions_lock = threading.Lock()
+        # 엔드포인트별 지연 히스토그램 기반 적응형 타임아웃 (+ 요청 단위 deadline 예산)
+        self.latency = AdaptiveTimeouts()
+
+    def server_url(self, server):
+        """MCP 서버 이름으로 base URL 조회"""
+        return {
+            'kakao': self.base_url,
+            'famoussaying': self.famoussaying_base_url,
+            'tam_admin': self.tam_admin_base_url,
+            'devtalk': self.devtalk_base_url,
+            'github': self.github_base_url,
+            'kakao_calendar': self.kakao_cal_base_url,
+        }.get(server)
+
+    @property
+    def servers(self):
+        """도구를 제공하는 전체 서버 이름 (내장 + 서드파티)"""
+        return list(MCP_SERVERS.keys()) + [n for n in self.extra_servers if n not in MCP_SERVERS]
+
+    # ===== 표준 MCP 세션 =====
+    def uses_mcp(self, server):
+        """해당 서버를 표준 MCP JSON-RPC로 호출하는지 여부"""
+        return self.transport == 'mcp' or server in self.extra_servers
+
+    def mcp_session(self, server):
+        """서버별 장기 MCP 세션 (최초 호출 시 생성, 이후 재사용)"""
+        session = self._mcp_sessions.get(server)
+        if session is None:
+            with self._mcp_sessions_lock:
+                session = self._mcp_sessions.get(server)
+                if session is None:
+                    url = self.extra_servers.get(server) or f"{self.server_url(server).rstrip('/')}/mcp"
+                    session = MCPSession(url, http=self._http)
+                    self._mcp_sessions[server] = session
+        return session
+
+    def list_tools(self, server):
+        """MCP tools/list -> capabilities 형식 도구 목록"""
+        return [
+            {
+                "name": t.get('name'),
+                "description": t.get('description', ''),
+                "parameters": t.get('inputSchema') or {"type": "object", "properties": {}}
+            }
+            for t in self.mcp_session(server).list_tools()
+        ]
+
+    def call_tool(self, server, name, arguments=None, timeout=15, idempotent=False):
+        """MCP tools/call (idempotent=True인 조회 도구만 적응형 타임아웃 적용)"""
+        key = f"{server} tools/call {name}"
+        try:
+            timeout = self.latency.timeout_for(key, timeout, adaptive=idempotent)
+        except requests.exceptions.Timeout as e:
+            return {"success": False, "error": str(e)}
+        started = time.perf_counter()
+        error = True
+        try:
+            result = self.mcp_session(server).call_tool(name, arguments, timeout=timeout)
+            error = False
+            return result
+        except MCPError as e:
+            return {"success": False, "error": str(e)}
+        except requests.exceptions.RequestException as e:
+            return {"success": False, "error": f"MCP 서버 호출 오류: {str(e)}"}
+        except Exception as e:
+            return {"success": False, "error": f"알 수 없는 오류: {str(e)}"}
+        finally:
+            self.latency.record(key, time.perf_counter() - started, error=error)
+
+    # ===== 지연/타임아웃 =====
+    def deadline(self, seconds):
+        """
+        현재 스레드의 MCP 호출 전체에 시간 예산 적용 (컨텍스트 매니저)
+
+        예) with mcp_client.deadline(30): ... 여러 라운드의 도구 호출 ...
+        각 호출의 타임아웃은 min(적응형 타임아웃, 남은 예산)이 됩니다.
+        """
+        return self.latency.deadline(seconds)
+
+    def deadline_paused(self):
+        """
+        deadline 안에서 MCP 호출이 아닌 작업(LLM 호출 등)의 시간을 예산에서 제외 (컨텍스트 매니저)
+
+        예) with mcp_client.deadline_paused(): response = client.chat.completions.create(...)
+        """
+        return self.latency.paused()
+
+    def latency_stats(self):
+        """엔드포인트별 지연 히스토그램/백분위수/현재 타임아웃"""
+        return self.latency.snapshot()
+
+    # ===== 전송 계층 =====
+    def _embedded_module(self, server):
+        """MCP 서버 모듈을 인프로세스로 적재 (최초 1회)"""
+        module = self._embedded_modules.get(server)
+        if module is not None:
+            return module
+        with self._embedded_lock:
+            module = self._embedded_modules.get(server)
+            if module is None:
+                if MCP_SERVER_DIR not in sys.path:
+                    sys.path.insert(0, MCP_SERVER_DIR)
+                module = importlib.import_module(MCP_SERVER_MODULES[server])
+                # 서버가 백그라운드 작업을 가진 경우 함께 기동
+                if hasattr(module, 'start_background_workers'):
+                    module.start_background_workers()
+                self._embedded_modules[server] = module
+                print(f"[mcp_client] embedded server loaded: {server}")
+        return module
+
+    def _request(self, server, method, path, params=None, json_body=None, timeout=10, base_url=None, route=None):
+        """
+        MCP 서버 라우트 호출 (http | embedded)
+
+        timeout은 지연 표본이 쌓이기 전의 기본값이며, 이후 GET은
+        clamp(p99 x factor, floor, ceiling)과 남은 deadline 예산 중 작은 값을 사용합니다.
+        GET 외(발송/등록/생성 등 멱등하지 않은 호출)는 짧게 끊고 재시도하면 중복이 생길 수 있어 기본값과 남은 예산 중 작은 값만 씁니다.
+        route는 지연 집계 키로 쓸 경로 템플릿입니다 (기본: path).
+        embedded 모드는 인프로세스 호출이라 timeout으로 끊지 않고, 남은 예산 소진 여부만 호출 전에 확인합니다.
+
+        Returns:
+            requests.Response | EmbeddedResponse
+        """
+        method = method.upper()
+        key = f"{server} {method} {route or path}"
+        timeout = self.latency.timeout_for(key, timeout, adaptive=method == 'GET')
+        started = time.perf_counter()
+        error = True
+        try:
+            if self.transport == 'embedded':
+                module = self._embedded_module(server)
+                args = params if method == 'GET' else json_body
+                direct = EMBEDDED_DIRECT_HANDLERS.get((server, method, path))
+                if direct is not None:
+                    response = EmbeddedResponse(200, direct(module, args or {}), path)
+                else:
+                    status_code, data = call_route(module.app, method, path, args)
+                    response = EmbeddedResponse(status_code, data, path)
+            else:
+                url = f"{(base_url or self.server_url(server)).rstrip('/')}{path}"
+                response = self._http.request(method, url, params=params, json=json_body, timeout=timeout)
+            error = response.status_code >= 500
+            return response
+        finally:
+            self.latency.record(key, time.perf_counter() - started, error=error)
+
+    def get_capabilities(self, server, timeout=5):
+        """MCP 서버 capabilities 조회 (도구 목록)"""
+        response = self._request(server, 'GET', MCP_SERVERS[server], timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def call_endpoint(self, server, endpoint, arguments=None, timeout=15):
+        """
+        capabilities에 기술된 endpoint로 도구 호출 (제너릭 디스패치)
+
+        Args:
+            server (str): MCP 서버 이름
+            endpoint (dict): {"method": "GET|POST", "path": "/mcp/...", "param_map": {...}}
+            arguments (dict|None): 도구 인자
+            timeout (int): 기본 타임아웃(초, 지연 표본이 쌓이면 적응형 타임아웃 사용)
+        Returns:
+            dict
+        """
+        try:
+            method, path, args = resolve_endpoint(endpoint, arguments)
+            route = endpoint.get('path')
+            if method == 'GET':
+                r = self._request(server, method, path, params=args, timeout=timeout, route=route)
+            else:
+                r = self._request(server, method, path, json_body=args, timeout=timeout, route=route)
+            # 서버가 4xx/5xx에도 JSON 본문을 주므로 본문을 우선 반환
+            try:
+                return r.json()
+            except ValueError:
+                r.raise_for_status()
+                return {"success": False, "error": "Invalid JSON from MCP server", "status_code": r.status_code}
+        except requests.exceptions.RequestException as e:
+            return {"success": False, "error": f"MCP 서버 호출 오류: {str(e)}"}
+        except Exception as e:
+            return {"success": False, "error": f"알 수 없는 오류: {str(e)}"}
     
     def send_kakao_message(self, message, template_id=None, web_url=None, mobile_web_url=None, button_title=None):
         """
@@ -34,7 +448,7 @@ class MCPClient:
             dict: 발송 결과
         """
         try:
-            url = f"{self.base_url}/mcp/kakao/send"
+            path = "/mcp/kakao/send"
             payload = {
                 "message": message
             }
@@ -48,8 +462,8 @@ class MCPClient:
             if button_title:
                 payload["button_title"] = button_title
             
-            print("[mcp_client] POST /mcp/kakao/send", {"url": url, "payload": payload})
-            response = requests.post(url, json=payload, timeout=10)
+            print("[mcp_client] POST /mcp/kakao/send", {"transport": self.transport, "payload": payload})
+            response = self._request('kakao', 'POST', path, json_body=payload, timeout=10)
             response.raise_for_status()
             return response.json()
             
@@ -67,8 +481,8 @@ class MCPClient:
     def health_check(self):
         """MCP 서버 헬스 체크"""
         try:
-            url = f"{self.base_url}/mcp/kakao/health"
-            response = requests.get(url, timeout=5)
+            path = "/mcp/kakao/health"
+            response = self._request('kakao', 'GET', path, timeout=5)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -85,10 +499,7 @@ class MCPClient:
             dict: 명언 정보
         """
         try:
-            famoussaying_url = base_url or os.getenv('FAMOUSSAYING_MCP_SERVER_URL', 'http://localhost:5004')
-            url = f"{famoussaying_url}/mcp/famoussaying/get"
-            
-            response = requests.get(url, timeout=10)
+            response = self._request('famoussaying', 'GET', '/mcp/famoussaying/get', timeout=10, base_url=base_url)
             response.raise_for_status()
             return response.json()
             
@@ -114,8 +525,8 @@ class MCPClient:
             if order is not None:
                 params['order'] = order
 
-            url = f"{self.base_url}/mcp/kakao/friends"
-            response = requests.get(url, params=params, timeout=10)
+            path = "/mcp/kakao/friends"
+            response = self._request('kakao', 'GET', path, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -126,8 +537,8 @@ class MCPClient:
     def get_kakao_me(self):
         """카카오 MCP 서버를 통해 사용자 정보(내정보) 조회"""
         try:
-            url = f"{self.base_url}/mcp/kakao/me"
-            response = requests.get(url, timeout=10)
+            path = "/mcp/kakao/me"
+            response = self._request('kakao', 'GET', path, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -138,7 +549,7 @@ class MCPClient:
     # ===== github MCP 연동 =====
     def get_github_repos(self, user=None, visibility=None, affiliation=None, per_page=None, page=None):
         try:
-            url = f"{self.github_base_url}/mcp/github/repos"
+            path = "/mcp/github/repos"
             params = {}
             if user:
                 params['user'] = user
@@ -150,7 +561,7 @@ class MCPClient:
                 params['per_page'] = per_page
             if page:
                 params['page'] = page
-            r = requests.get(url, params=params, timeout=15)
+            r = self._request('github', 'GET', path, params=params, timeout=15)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -161,7 +572,7 @@ class MCPClient:
     # ===== kakao calendar MCP 연동 =====
     def create_kakao_calendar(self, name: str, color: str = None, reminder: int = None, reminder_all_day: int = None):
         try:
-            url = f"{self.kakao_cal_base_url}/mcp/kakao-calendar/create/calendar"
+            path = "/mcp/kakao-calendar/create/calendar"
             body = {"name": name}
             if color is not None:
                 body["color"] = color
@@ -169,7 +580,7 @@ class MCPClient:
                 body["reminder"] = reminder
             if reminder_all_day is not None:
                 body["reminder_all_day"] = reminder_all_day
-            r = requests.post(url, json=body, timeout=10)
+            r = self._request('kakao_calendar', 'POST', path, json_body=body, timeout=10)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -179,9 +590,9 @@ class MCPClient:
 
     def create_kakao_calendar_event(self, calendar_id: str, event: dict):
         try:
-            url = f"{self.kakao_cal_base_url}/mcp/kakao-calendar/create/event"
+            path = "/mcp/kakao-calendar/create/event"
             body = {"calendar_id": calendar_id, "event": event}
-            r = requests.post(url, json=body, timeout=12)
+            r = self._request('kakao_calendar', 'POST', path, json_body=body, timeout=12)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -191,9 +602,9 @@ class MCPClient:
 
     def get_kakao_calendar_holidays(self, date_from: str, date_to: str):
         try:
-            url = f"{self.kakao_cal_base_url}/mcp/kakao-calendar/holidays"
+            path = "/mcp/kakao-calendar/holidays"
             params = {"from": date_from, "to": date_to}
-            r = requests.get(url, params=params, timeout=10)
+            r = self._request('kakao_calendar', 'GET', path, params=params, timeout=10)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -203,7 +614,7 @@ class MCPClient:
 
     def create_kakao_calendar_event_simple(self, calendar_id: str, title: str, start_local: str, duration_minutes: int = 60, description: str = None, color: str = None):
         try:
-            url = f"{self.kakao_cal_base_url}/mcp/kakao-calendar/create/event-simple"
+            path = "/mcp/kakao-calendar/create/event-simple"
             body = {
                 "calendar_id": calendar_id,
                 "title": title,
@@ -214,7 +625,7 @@ class MCPClient:
                 body["description"] = description
             if color:
                 body["color"] = color
-            r = requests.post(url, json=body, timeout=12)
+            r = self._request('kakao_calendar', 'POST', path, json_body=body, timeout=12)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -224,11 +635,11 @@ class MCPClient:
 
     def get_kakao_calendars(self, filter_value: str = None):
         try:
-            url = f"{self.kakao_cal_base_url}/mcp/kakao-calendar/calendars"
+            path = "/mcp/kakao-calendar/calendars"
             params = {}
             if filter_value:
                 params['filter'] = filter_value
-            r = requests.get(url, params=params, timeout=10)
+            r = self._request('kakao_calendar', 'GET', path, params=params, timeout=10)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -238,7 +649,7 @@ class MCPClient:
 
     def get_kakao_calendar_events(self, calendar_id: str, date_from: str = None, date_to: str = None, limit: int = None):
         try:
-            url = f"{self.kakao_cal_base_url}/mcp/kakao-calendar/events"
+            path = "/mcp/kakao-calendar/events"
             params = {"calendar_id": calendar_id}
             if date_from:
                 params['from'] = date_from
@@ -246,7 +657,7 @@ class MCPClient:
                 params['to'] = date_to
             if limit:
                 params['limit'] = limit
-            r = requests.get(url, params=params, timeout=12)
+            r = self._request('kakao_calendar', 'GET', path, params=params, timeout=12)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -357,7 +768,7 @@ class MCPClient:
             dict: 발송 결과
         """
         try:
-            url = f"{self.base_url}/mcp/kakao/send-to-friends"
+            path = "/mcp/kakao/send-to-friends"
             payload = {
                 "receiver_uuids": receiver_uuids,
                 "message": message
@@ -370,8 +781,8 @@ class MCPClient:
             if button_title:
                 payload["button_title"] = button_title
             
-            print("[mcp_client] POST /mcp/kakao/send-to-friends", {"url": url, "payload": payload})
-            response = requests.post(url, json=payload, timeout=10)
+            print("[mcp_client] POST /mcp/kakao/send-to-friends", {"transport": self.transport, "payload": payload})
+            response = self._request('kakao', 'POST', path, json_body=payload, timeout=10)
             response.raise_for_status()
             return response.json()
             
@@ -390,8 +801,8 @@ class MCPClient:
     def tam_admin_health(self):
         """tam-admin MCP 서버 헬스 체크"""
         try:
-            url = f"{self.tam_admin_base_url}/mcp/tam-admin/health"
-            response = requests.get(url, timeout=5)
+            path = "/mcp/tam-admin/health"
+            response = self._request('tam_admin', 'GET', path, timeout=5)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -400,8 +811,8 @@ class MCPClient:
     def tam_admin_capabilities(self):
         """tam-admin MCP 서버 capabilities 조회"""
         try:
-            url = f"{self.tam_admin_base_url}/mcp/tam-admin/capabilities"
-            response = requests.get(url, timeout=5)
+            path = "/mcp/tam-admin/capabilities"
+            response = self._request('tam_admin', 'GET', path, timeout=5)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -419,9 +830,9 @@ class MCPClient:
             dict
         """
         try:
-            url = f"{self.tam_admin_base_url}/mcp/tam-admin/proxy"
+            path = "/mcp/tam-admin/proxy"
             body = {"action": action, "payload": payload or {}, "method": method}
-            response = requests.post(url, json=body, timeout=10)
+            response = self._request('tam_admin', 'POST', path, json_body=body, timeout=10)
             # 501도 JSON 본문을 담고 있으므로 raise_for_status를 쓰지 않고 그대로 반환 처리
             try:
                 return response.json()
@@ -435,8 +846,8 @@ class MCPClient:
     # ===== devtalk MCP 연동 =====
     def devtalk_health(self):
         try:
-            url = f"{self.devtalk_base_url}/mcp/devtalk/health"
-            r = requests.get(url, timeout=5)
+            path = "/mcp/devtalk/health"
+            r = self._request('devtalk', 'GET', path, timeout=5)
             r.raise_for_status()
             return r.json()
         except Exception as e:
@@ -444,8 +855,8 @@ class MCPClient:
 
     def get_devtalk_unanswered_count(self):
         try:
-            url = f"{self.devtalk_base_url}/mcp/devtalk/unanswered-count"
-            r = requests.get(url, timeout=10)
+            path = "/mcp/devtalk/unanswered-count"
+            r = self._request('devtalk', 'GET', path, timeout=10)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -455,8 +866,8 @@ class MCPClient:
 
     def get_devtalk_unanswered_list(self):
         try:
-            url = f"{self.devtalk_base_url}/mcp/devtalk/unanswered-list"
-            r = requests.get(url, timeout=15)
+            path = "/mcp/devtalk/unanswered-list"
+            r = self._request('devtalk', 'GET', path, timeout=15)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -466,13 +877,13 @@ class MCPClient:
 
     def post_devtalk_reply(self, topic_id, raw, target_recipients=None, archetype=None):
         try:
-            url = f"{self.devtalk_base_url}/mcp/devtalk/reply"
+            path = "/mcp/devtalk/reply"
             payload = {"topic_id": topic_id, "raw": raw}
             if target_recipients:
                 payload["target_recipients"] = target_recipients
             if archetype:
                 payload["archetype"] = archetype
-            r = requests.post(url, json=payload, timeout=15)
+            r = self._request('devtalk', 'POST', path, json_body=payload, timeout=15)
             r.raise_for_status()
             return r.json()
         except requests.exceptions.RequestException as e:
@@ -483,9 +894,7 @@ class MCPClient:
     def get_devtalk_chat_matching_list(self):
         """분류별 데브톡 사전 답변 목록 조회 (tam-admin MCP)"""
         try:
-            tamadmin_url = os.getenv('TAM_ADMIN_MCP_SERVER_URL', 'http://localhost:5005')
-            url = tamadmin_url.rstrip('/') + '/mcp/tam-admin/devtalk-chat-matching-list'
-            r = requests.get(url, timeout=10)
+            r = self._request('tam_admin', 'GET', '/mcp/tam-admin/devtalk-chat-matching-list', timeout=10)
             r.raise_for_status()
             return r.json()
         except requests.RequestException as e:
@@ -0,0 +1,103 @@
+"""
+Devtalk 사전 답변 매칭 엔진 (문자 n-gram BM25)
+
+- 한국어는 띄어쓰기/조사 때문에 단어 단위 매칭이 약하므로, 어절마다 양끝을 표시한 뒤
+  문자 2-gram/3-gram으로 쪼개 색인합니다. ("로그인 오류" -> "^로", "로그", "그인", "인$", ...)
+- AnswerIndex는 역색인(term -> [(문서, tf)])으로 질의에 등장한 term의 문서만 점수를 계산합니다.
+- 답변 항목의 필드 구조가 확정되지 않았으므로 TEXT_FIELDS에 해당하는 문자열 필드를, 없으면 모든 문자열 필드를 색인합니다.
+"""
+import heapq
+import math
+import re
+from collections import Counter
+from datetime import datetime
+
+NGRAM_SIZES = (2, 3)
+TEXT_FIELDS = ('title', 'question', 'keyword', 'keywords', 'major_category', 'sub_category', 'answer', 'content')
+ID_FIELDS = ('id', 'answer_id', 'matching_id', 'seq')
+_WORD_RE = re.compile(r'[0-9A-Za-z가-힣ㄱ-ㅎㅏ-ㅣ_]+')
+
+
+def char_ngrams(text):
+    """텍스트 -> 문자 n-gram 목록 (소문자, 어절 경계 ^/$ 포함)"""
+    grams = []
+    for word in _WORD_RE.findall((text or '').lower()):
+        padded = f"^{word}$"
+        for n in NGRAM_SIZES:
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def answer_text(item):
+    """답변 항목에서 색인할 텍스트"""
+    if not isinstance(item, dict):
+        return str(item)
+    parts = [str(item[k]) for k in TEXT_FIELDS if isinstance(item.get(k), (str, int)) and item.get(k) != '']
+    if not parts:
+        parts = [v for v in item.values() if isinstance(v, str) and not v.startswith('http')]
+    return ' '.join(parts)
+
+
+def answer_id(item, fallback):
+    if isinstance(item, dict):
+        for key in ID_FIELDS:
+            if item.get(key) is not None:
+                return item[key]
+    return fallback
+
+
+class AnswerIndex:
+    """사전 답변 BM25 색인"""
+
+    def __init__(self, answers, k1=1.5, b=0.75):
+        self.answers = list(answers)
+        self.k1 = k1
+        self.b = b
+        self.built_at = datetime.now().isoformat()
+        self._postings = {}  # term -> [(doc, tf)]
+        self._lengths = []
+        for doc, item in enumerate(self.answers):
+            counts = Counter(char_ngrams(answer_text(item)))
+            self._lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self._postings.setdefault(term, []).append((doc, tf))
+        n = len(self.answers)
+        self._avg_length = (sum(self._lengths) / n) if n else 0.0
+        # BM25 idf (음수 방지형)
+        self._idf = {
+            term: math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self._postings.items()
+        }
+
+    def __len__(self):
+        return len(self.answers)
+
+    def search(self, text, top_k=3, min_score=0.0):
+        """
+        질의 텍스트와 가장 비슷한 답변
+
+        Returns:
+            list[tuple]: [(score, doc index)] 점수 내림차순
+        """
+        query = Counter(char_ngrams(text))
+        if not query or not self.answers:
+            return []
+        scores = {}
+        k1, b, avg = self.k1, self.b, self._avg_length or 1.0
+        for term, q_tf in query.items():
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = self._idf[term]
+            for doc, tf in posting:
+                norm = tf * (k1 + 1) / (tf + k1 * (1 - b + b * self._lengths[doc] / avg))
+                scores[doc] = scores.get(doc, 0.0) + idf * norm * q_tf
+        best = heapq.nlargest(top_k, ((score, doc) for doc, score in scores.items() if score > min_score))
+        return best
+
+    def suggest(self, text, top_k=3, min_score=0.0):
+        """search 결과를 응답용 dict 목록으로"""
+        return [
+            {"answer_id": answer_id(self.answers[doc], doc), "score": round(score, 3), "answer": self.answers[doc]}
+            for score, doc in self.search(text, top_k=top_k, min_score=min_score)
+        ]
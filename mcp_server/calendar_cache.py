@@ -0,0 +1,320 @@
+"""
+카카오 캘린더 일정 캐시 (calendar_id별 구간 인덱스)
+
+- 캘린더마다 "이미 조회한 시간 구간"(coverage)을 정렬된 겹치지 않는 구간 리스트로 유지합니다.
+- 범위 조회 시 coverage로 덮이지 않은(또는 TTL이 지난) 부분 구간만 업스트림에서 가져오고,
+  나머지는 캐시된 일정으로 응답합니다. (같은 월/주 보기를 반복 조회하면 업스트림 호출 없음)
+- 일정 생성 시 해당 시간 구간만 무효화합니다. (반복 일정 등 범위를 알 수 없으면 캘린더 전체)
+- 반복 일정(rrule)은 업스트림이 발생을 돌려주지 않고 원본 한 건만 돌려준 경우에만, 그 조회 구간으로 로컬 전개해
+  업스트림 결과와 함께 캐시합니다. (같은 구간은 처음 조회든 캐시 조회든 같은 결과)
+  · 같은 반복(rrule + 제목)이 구간에 두 건 이상 왔거나, 온 한 건이 첫 발생이 아니면 업스트림이 전개한 것으로 보고 그대로 씁니다.
+  · 실제 시작을 모르면 구간보다 앞서 시작한 원본이 온 경우만 전개합니다. (구간 안의 한 건은 원본인지 발생인지 알 수 없음)
+  · 전개 기준은 반복의 실제 시작(dt_start / dtstart 필드 또는 rrule의 DTSTART)이고, EXDATE(exdate 필드 또는 rrule의 EXDATE 줄)는 제외합니다.
+  · 실제 시작을 모르면 COUNT 규칙은 전개하지 않습니다. (본 발생부터 세면 없는 발생이 생김)
+    COUNT가 없는 규칙은 본 발생을 기준으로 전개해도 주기가 같으므로 그대로 전개합니다.
+
+시각은 모두 UTC epoch 초로 다룹니다.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+from calendar_rrule import expand_event, parse_rrule
+
+
+def parse_utc(value):
+    """ISO8601(Z 또는 오프셋) -> epoch 초"""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def format_utc(ts):
+    """epoch 초 -> 2025-11-01T00:00:00Z"""
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def event_span(event):
+    """일정의 (start, end) epoch 초. 시간 정보가 없으면 None"""
+    t = event.get('time') or {}
+    try:
+        start = parse_utc(t['start_at'])
+        end = parse_utc(t.get('end_at') or t['start_at'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return start, max(end, start)
+
+
+def parse_rfc_or_iso(value):
+    """20251103 / 20251103T000000Z / ISO8601 -> epoch 초. 알 수 없으면 None"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        if value[:8].isdigit() and '-' not in value:
+            # RFC 5545 형식 (TZID 로컬 시각은 기준 타임존을 알 수 없어 제외)
+            if len(value) == 8:
+                return datetime.strptime(value, '%Y%m%d').replace(tzinfo=timezone.utc).timestamp()
+            if value.endswith('Z'):
+                return datetime.strptime(value[:-1], '%Y%m%dT%H%M%S').replace(tzinfo=timezone.utc).timestamp()
+            return None
+        return parse_utc(value)
+    except ValueError:
+        return None
+
+
+def _rule_lines(event, name):
+    """rrule 텍스트에서 name(DTSTART / EXDATE)으로 시작하는 줄의 값 목록"""
+    values = []
+    for line in str(event.get('rrule') or '').splitlines():
+        line = line.strip()
+        if line.upper().startswith(name):
+            values.append(line.split(':', 1)[-1])
+    return values
+
+
+def series_start(event):
+    """반복 일정의 실제 시작(DTSTART) epoch 초. 알 수 없으면 None"""
+    value = event.get('dt_start') or event.get('dtstart')
+    if not value:
+        lines = _rule_lines(event, 'DTSTART')
+        value = lines[0] if lines else None
+    return parse_rfc_or_iso(value)
+
+
+def excluded_starts(event):
+    """EXDATE로 제외된 발생 시작 epoch 초(정수) 집합"""
+    raw = event.get('exdate') or event.get('exdates') or []
+    values = [raw] if isinstance(raw, str) else list(raw)
+    values += _rule_lines(event, 'EXDATE')
+    excluded = set()
+    for value in values:
+        for item in str(value).split(','):
+            ts = parse_rfc_or_iso(item)
+            if ts is not None:
+                excluded.add(int(ts))
+    return excluded
+
+
+def expansion_master(event, first):
+    """
+    로컬 전개에 쓸 반복 일정 원본 (time.start_at을 반복 시작으로 맞춤). 안전하게 전개할 수 없으면 None
+
+    Args:
+        event (dict): 업스트림이 돌려준 발생 (rrule 포함)
+        first (float): 업스트림이 돌려준 발생의 시작
+    """
+    rule = parse_rrule(event.get('rrule'))
+    if rule is None:
+        return None
+    dtstart = series_start(event)
+    if dtstart is None:
+        if rule["count"] is not None:
+            return None
+        dtstart = first
+    span = event_span(event)
+    t = event.get('time') or {}
+    return {**event, 'time': {**t, 'start_at': format_utc(dtstart), 'end_at': format_utc(dtstart + span[1] - span[0])}}
+
+
+class Coverage:
+    """정렬된 비중첩 구간 [start, end) 목록 + 구간별 조회 시각"""
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.fetched = []
+
+    def subtract(self, start, end):
+        """[start, end)를 coverage에서 제거 (걸친 구간은 잘라서 보존)"""
+        i = bisect_right(self.ends, start)
+        j = bisect_left(self.starts, end)
+        if i >= j:
+            return
+        keep = []
+        if self.starts[i] < start:
+            keep.append((self.starts[i], start, self.fetched[i]))
+        if self.ends[j - 1] > end:
+            keep.append((end, self.ends[j - 1], self.fetched[j - 1]))
+        self.starts[i:j] = [k[0] for k in keep]
+        self.ends[i:j] = [k[1] for k in keep]
+        self.fetched[i:j] = [k[2] for k in keep]
+
+    def add(self, start, end, fetched_at):
+        """[start, end)를 fetched_at 시각으로 조회 완료 처리 (겹치는 부분 교체)"""
+        self.subtract(start, end)
+        i = bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.fetched.insert(i, fetched_at)
+
+    def gaps(self, start, end, min_fetched_at):
+        """[start, end) 중 coverage가 없거나 min_fetched_at 이전에 조회된 부분 구간 목록"""
+        gaps = []
+        cursor = start
+        i = bisect_right(self.ends, start)
+        while i < len(self.starts) and self.starts[i] < end:
+            if self.fetched[i] >= min_fetched_at:
+                if self.starts[i] > cursor:
+                    gaps.append((cursor, self.starts[i]))
+                cursor = max(cursor, self.ends[i])
+            i += 1
+        if cursor < end:
+            gaps.append((cursor, end))
+        # 만료 구간으로 생긴 인접 gap 병합
+        merged = []
+        for g in gaps:
+            if merged and merged[-1][1] >= g[0]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], g[1]))
+            else:
+                merged.append(g)
+        return merged
+
+    def intervals(self):
+        return list(zip(self.starts, self.ends))
+
+
+class CalendarState:
+    def __init__(self):
+        self.coverage = Coverage()
+        self.events = {}  # (id, start_at) -> (start, end, event)
+        self.lock = threading.Lock()  # 같은 캘린더의 동시 채우기 직렬화
+
+
+class EventCache:
+    """calendar_id별 일정 구간 캐시"""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._calendars = {}
+        self._lock = threading.Lock()
+        self.stats = {"queries": 0, "full_hits": 0, "upstream_ranges": 0, "expanded_occurrences": 0}
+
+    def _state(self, calendar_id):
+        with self._lock:
+            state = self._calendars.get(calendar_id)
+            if state is None:
+                state = self._calendars[calendar_id] = CalendarState()
+            return state
+
+    @staticmethod
+    def _key(event):
+        return (event.get('id'), (event.get('time') or {}).get('start_at'))
+
+    @staticmethod
+    def _expand_masters(start, end, events):
+        """업스트림이 원본 한 건만 돌려준 반복 일정을 [start, end)로 전개한 발생 목록 (원본 자신 제외)"""
+        series = {}
+        for event in events:
+            span = event_span(event)
+            if event.get('rrule') and span is not None:
+                key = (str(event['rrule']).strip(), event.get('title'))
+                series.setdefault(key, []).append((span[0], event))
+        expanded = []
+        for seen in series.values():
+            if len(seen) > 1:
+                continue  # 업스트림이 발생을 돌려줌
+            first, event = seen[0]
+            dtstart = series_start(event)
+            if dtstart is not None:
+                if int(dtstart) != int(first):
+                    continue  # 첫 발생이 아닌 발생 = 업스트림이 전개한 결과
+            elif first >= start:
+                continue  # 실제 시작을 모르면 구간 안의 한 건이 원본인지 발생인지 알 수 없음
+            master = expansion_master(event, first)
+            if master is None:
+                continue
+            excluded = excluded_starts(event)
+            for occurrence in expand_event(master, start, end) or []:
+                occurrence_start = int(event_span(occurrence)[0])
+                if occurrence_start != int(first) and occurrence_start not in excluded:
+                    expanded.append(occurrence)
+        return expanded
+
+    def _store(self, state, start, end, events, fetched_at):
+        # 조회 구간과 겹치는 기존 일정(전에 전개한 발생 포함)은 업스트림 결과로 교체
+        for key, (s, e, _) in list(state.events.items()):
+            if s < end and (e > start or s >= start):
+                del state.events[key]
+        expanded = self._expand_masters(start, end, events)
+        for event in list(events) + expanded:
+            span = event_span(event)
+            if span is not None:
+                state.events[self._key(event)] = (span[0], span[1], event)
+        self.stats["expanded_occurrences"] += len(expanded)
+        state.coverage.add(start, end, fetched_at)
+
+    def get_events(self, calendar_id, start, end, fetch, refresh=False):
+        """
+        [start, end) 구간 일정 조회
+
+        Args:
+            calendar_id (str): 캘린더 ID
+            start, end (float): UTC epoch 초
+            fetch (callable): fn(calendar_id, start, end) -> list[event] (실패 시 예외)
+            refresh (bool): True면 캐시 무시하고 전체 구간 재조회
+        Returns:
+            tuple: (시작순 정렬된 events, 업스트림에서 가져온 구간 목록)
+        """
+        state = self._state(calendar_id)
+        with state.lock:
+            self.stats["queries"] += 1
+            if refresh or self.ttl <= 0:
+                gaps = [(start, end)]
+            else:
+                gaps = state.coverage.gaps(start, end, time.time() - self.ttl)
+            if not gaps:
+                self.stats["full_hits"] += 1
+            for gap_start, gap_end in gaps:
+                fetched_at = time.time()
+                events = fetch(calendar_id, gap_start, gap_end)
+                self._store(state, gap_start, gap_end, events, fetched_at)
+                self.stats["upstream_ranges"] += 1
+            matched = [
+                (s, ev) for s, e, ev in state.events.values()
+                if s < end and (e > start or s >= start)
+            ]
+        matched.sort(key=lambda item: item[0])
+        return [ev for _, ev in matched], gaps
+
+    def invalidate(self, calendar_id, start=None, end=None):
+        """구간(또는 캘린더 전체) 무효화"""
+        if start is None or end is None:
+            with self._lock:
+                self._calendars.pop(calendar_id, None)
+            return
+        state = self._state(calendar_id)
+        with state.lock:
+            state.coverage.subtract(start, end)
+            for key, (s, e, _) in list(state.events.items()):
+                if s < end and (e > start or s >= start):
+                    del state.events[key]
+
+    def invalidate_event(self, calendar_id, event):
+        """생성/수정된 일정이 걸친 구간 무효화 (반복 일정이면 캘린더 전체)"""
+        span = event_span(event) if isinstance(event, dict) else None
+        if span is None or event.get('rrule'):
+            self.invalidate(calendar_id)
+        else:
+            # 종료 시각이 시작과 같은 경우도 포함되도록 최소 1초 폭
+            self.invalidate(calendar_id, span[0], max(span[1], span[0] + 1))
+
+    def snapshot(self):
+        with self._lock:
+            calendars = dict(self._calendars)
+        return {
+            "ttl_seconds": self.ttl,
+            **self.stats,
+            "calendars": {
+                cid: {
+                    "events": len(state.events),
+                    "expanded": sum(1 for _, _, ev in state.events.values() if ev.get('recurring_instance')),
+                    "coverage": [[format_utc(s), format_utc(e)] for s, e in state.coverage.intervals()]
+                }
+                for cid, state in calendars.items()
+            }
+        }
@@ -0,0 +1,225 @@
+"""
+반복 일정(RRULE) 로컬 전개 - RFC 5545 부분 집합
+
+지원: FREQ=DAILY|WEEKLY|MONTHLY, INTERVAL, COUNT, UNTIL, BYDAY(예: MO,WE / 2TU / -1FR), BYMONTHDAY
+그 외 FREQ(YEARLY 등)는 전개하지 않고 None을 반환합니다. (호출 측은 업스트림 결과를 그대로 사용)
+
+- 전개는 일정의 time_zone(기본 Asia/Seoul) 벽시계 기준으로 계산합니다. (종일 일정은 UTC 날짜 기준)
+- 같은 (규칙, 시작 시각, 조회 구간) 전개 결과는 LRU로 캐시되어 월 보기/빈 시간 계산이 반복돼도 다시 계산하지 않습니다.
+"""
+import calendar
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # pragma: no cover
+    ZoneInfo = None
+
+KST = timezone(timedelta(hours=9))
+WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+SUPPORTED_FREQ = ('DAILY', 'WEEKLY', 'MONTHLY')
+MAX_OCCURRENCES = 5000  # 한 번의 전개에서 생성할 최대 발생 수 (무한 반복 방지)
+
+
+def _zone(name):
+    if name in (None, '', 'Asia/Seoul'):
+        return KST
+    if ZoneInfo is not None:
+        try:
+            return ZoneInfo(name)
+        except Exception:
+            pass
+    return KST
+
+
+def _parse_until(value, tz):
+    """UNTIL 값(20251231T150000Z / 20251231T240000 / 20251231) -> epoch 초"""
+    value = value.strip()
+    if len(value) == 8:
+        day = datetime.strptime(value, '%Y%m%d')
+        # 날짜만 주어지면 그날 하루 전체 포함
+        return (day + timedelta(days=1)).replace(tzinfo=tz).timestamp() - 1
+    if value.endswith('Z'):
+        return datetime.strptime(value[:-1], '%Y%m%dT%H%M%S').replace(tzinfo=timezone.utc).timestamp()
+    return datetime.strptime(value, '%Y%m%dT%H%M%S').replace(tzinfo=tz).timestamp()
+
+
+def parse_rrule(rrule):
+    """
+    'FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10' -> dict 또는 지원하지 않으면 None
+
+    Returns:
+        dict: {"freq", "interval", "count", "until"(원문), "byday": [(ordinal|None, weekday)], "bymonthday": [int]}
+    """
+    if not rrule or not isinstance(rrule, str):
+        return None
+    text = rrule.strip()
+    # 'DTSTART:...\nRRULE:...' 형태면 RRULE 줄만 사용
+    for line in text.splitlines():
+        if line.strip().upper().startswith('RRULE:'):
+            text = line.strip()
+            break
+    if text.upper().startswith('RRULE:'):
+        text = text[6:]
+    parts = {}
+    for item in text.split(';'):
+        if '=' in item:
+            key, value = item.split('=', 1)
+            parts[key.strip().upper()] = value.strip()
+    freq = parts.get('FREQ', '').upper()
+    if freq not in SUPPORTED_FREQ:
+        return None
+    try:
+        rule = {
+            "freq": freq,
+            "interval": max(1, int(parts.get('INTERVAL') or 1)),
+            "count": int(parts['COUNT']) if parts.get('COUNT') else None,
+            "until": parts.get('UNTIL'),
+            "byday": [],
+            "bymonthday": [int(d) for d in parts['BYMONTHDAY'].split(',')] if parts.get('BYMONTHDAY') else []
+        }
+        for token in filter(None, (parts.get('BYDAY') or '').upper().split(',')):
+            token = token.strip()
+            ordinal = int(token[:-2]) if token[:-2] else None
+            rule["byday"].append((ordinal, WEEKDAYS[token[-2:]]))
+    except (KeyError, ValueError):
+        return None
+    return rule
+
+
+def _month_days(year, month, rule, dtstart):
+    """MONTHLY 한 달 안의 발생 일자 목록 (정렬)"""
+    last_day = calendar.monthrange(year, month)[1]
+    days = set()
+    if rule["byday"]:
+        for ordinal, weekday in rule["byday"]:
+            matches = [d for d in range(1, last_day + 1) if calendar.weekday(year, month, d) == weekday]
+            if ordinal is None:
+                days.update(matches)
+            elif 0 < ordinal <= len(matches):
+                days.add(matches[ordinal - 1])
+            elif 0 < -ordinal <= len(matches):
+                days.add(matches[ordinal])
+    elif rule["bymonthday"]:
+        for d in rule["bymonthday"]:
+            day = d if d > 0 else last_day + d + 1
+            if 1 <= day <= last_day:
+                days.add(day)
+    elif dtstart.day <= last_day:
+        # 해당 일자가 없는 달(31일 등)은 건너뜀 (RFC 5545)
+        days.add(dtstart.day)
+    return sorted(days)
+
+
+def _iter_local(rule, dtstart, skip_to):
+    """
+    규칙에 따른 발생 시작 시각(로컬 naive datetime)을 시간순으로 생성
+
+    COUNT가 없으면 skip_to(로컬 naive) 직전 주기까지 건너뛰어 오래된 반복 일정도 빠르게 전개합니다.
+    """
+    freq, interval = rule["freq"], rule["interval"]
+    weekdays = {w for _, w in rule["byday"]}
+    if freq == 'DAILY':
+        period = 0
+        if rule["count"] is None and skip_to > dtstart:
+            period = max(0, (skip_to - dtstart).days // interval - 1)
+        while True:
+            current = dtstart + timedelta(days=period * interval)
+            if not weekdays or current.weekday() in weekdays:
+                yield current
+            period += 1
+    elif freq == 'WEEKLY':
+        week0 = dtstart - timedelta(days=dtstart.weekday())
+        days = sorted(weekdays) if weekdays else [dtstart.weekday()]
+        period = 0
+        if rule["count"] is None and skip_to > dtstart:
+            period = max(0, (skip_to - week0).days // (7 * interval) - 1)
+        while True:
+            week = week0 + timedelta(weeks=period * interval)
+            for weekday in days:
+                yield week + timedelta(days=weekday)
+            period += 1
+    else:  # MONTHLY
+        period = 0
+        if rule["count"] is None and skip_to > dtstart:
+            months = (skip_to.year - dtstart.year) * 12 + skip_to.month - dtstart.month
+            period = max(0, months // interval - 1)
+        while True:
+            index = dtstart.month - 1 + period * interval
+            year, month = dtstart.year + index // 12, index % 12 + 1
+            if year > 9999:
+                return
+            for day in _month_days(year, month, rule, dtstart):
+                yield dtstart.replace(year=year, month=month, day=day)
+            period += 1
+
+
+@lru_cache(maxsize=2048)
+def expand_starts(rrule, dtstart_ts, duration, tz_name, start, end):
+    """
+    [start, end)와 겹치는 발생의 시작 epoch 초 튜플 (LRU 캐시)
+
+    Args:
+        rrule (str): RRULE 문자열
+        dtstart_ts (float): 첫 발생 시작 epoch 초
+        duration (float): 발생 하나의 길이(초)
+        tz_name (str): 벽시계 계산 기준 타임존 ('UTC' 또는 IANA 이름)
+        start, end (float): 조회 구간 epoch 초
+    Returns:
+        tuple[float] | None: 지원하지 않는 규칙이면 None
+    """
+    rule = parse_rrule(rrule)
+    if rule is None:
+        return None
+    tz = timezone.utc if tz_name == 'UTC' else _zone(tz_name)
+    until = _parse_until(rule["until"], tz) if rule["until"] else None
+    dtstart = datetime.fromtimestamp(dtstart_ts, tz).replace(tzinfo=None)
+    skip_to = datetime.fromtimestamp(start - duration, tz).replace(tzinfo=None)
+    starts = []
+    produced = 0
+    for local in _iter_local(rule, dtstart, skip_to):
+        if local < dtstart:
+            continue
+        ts = local.replace(tzinfo=tz).timestamp()
+        if ts >= end or (until is not None and ts > until):
+            break
+        produced += 1
+        if rule["count"] is not None and produced > rule["count"]:
+            break
+        if ts + duration > start or (duration == 0 and ts >= start):
+            starts.append(ts)
+        if len(starts) >= MAX_OCCURRENCES:
+            break
+    return tuple(starts)
+
+
+def _format(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def expand_event(event, start, end):
+    """
+    반복 일정 -> [start, end) 구간의 발생 일정 목록 (원본 필드 복사 + time 교체)
+
+    Returns:
+        list[dict] | None: rrule이 없거나 지원하지 않으면 None
+    """
+    t = event.get('time') or {}
+    try:
+        first = datetime.fromisoformat(t['start_at'].replace('Z', '+00:00')).timestamp()
+        last = datetime.fromisoformat((t.get('end_at') or t['start_at']).replace('Z', '+00:00')).timestamp()
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    duration = max(0.0, last - first)
+    tz_name = 'UTC' if t.get('all_day') else (t.get('time_zone') or 'Asia/Seoul')
+    starts = expand_starts(event.get('rrule'), first, duration, tz_name, start, end)
+    if starts is None:
+        return None
+    occurrences = []
+    for ts in starts:
+        occurrence = dict(event)
+        occurrence['time'] = {**t, 'start_at': _format(ts), 'end_at': _format(ts + duration)}
+        occurrence['recurring_instance'] = True
+        occurrences.append(occurrence)
+    return occurrences
@@ -0,0 +1,181 @@
+"""
+빈 시간(free/busy) 계산
+
+- merge_busy(): 여러 캘린더 일정 구간을 sweep-line으로 합쳐 겹치지 않는 바쁜 구간 목록 생성
+- working_windows(): 조회 범위를 KST 근무 시간 창으로 나눔 (주말/공휴일 제외)
+- free_blocks(): 근무 시간 창에서 바쁜 구간을 빼고 duration 이상 남는 빈 구간 반환
+- candidate_slots(): 빈 구간마다 step 단위로 맞춘 가장 이른 후보 시각
+
+시각은 모두 UTC epoch 초, 날짜 판단은 Asia/Seoul 기준입니다.
+"""
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+
+def parse_hhmm(value):
+    """'09:30' -> 570 (자정 기준 분)"""
+    hour, minute = value.split(':')
+    minutes = int(hour) * 60 + int(minute)
+    if not 0 <= minutes <= 24 * 60:
+        raise ValueError(f"잘못된 시각: {value}")
+    return minutes
+
+
+def kst_date(ts):
+    return datetime.fromtimestamp(ts, KST).date()
+
+
+def kst_day_start(day):
+    """KST 날짜 00:00의 epoch 초"""
+    return datetime(day.year, day.month, day.day, tzinfo=KST).timestamp()
+
+
+def merge_busy(intervals):
+    """
+    (start, end) 구간들을 겹침/맞닿음 기준으로 병합 (sweep-line)
+
+    시작 이벤트(+1)와 종료 이벤트(-1)를 시각순으로 훑으며 동시 진행 수가
+    0 -> 1이 되는 시점부터 1 -> 0이 되는 시점까지를 하나의 바쁜 구간으로 만듭니다.
+    같은 시각에는 시작을 먼저 처리해 연달아 붙은 일정 사이에 0초짜리 빈 구간이 생기지 않게 합니다.
+    """
+    points = []
+    for start, end in intervals:
+        if end > start:
+            points.append((start, 0))  # 0: 시작 (정렬 시 종료보다 앞)
+            points.append((end, 1))
+    points.sort()
+    merged = []
+    active = 0
+    opened = None
+    for at, kind in points:
+        if kind == 0:
+            if active == 0:
+                opened = at
+            active += 1
+        else:
+            active -= 1
+            if active == 0:
+                merged.append((opened, at))
+    return merged
+
+
+def working_windows(start, end, work_start, work_end, weekdays, holidays):
+    """
+    [start, end) 범위의 근무 시간 창 목록
+
+    Args:
+        start, end (float): UTC epoch 초
+        work_start, work_end (int): KST 자정 기준 분 (예: 540, 1080)
+        weekdays (set[int]): 허용 요일 (월=0 ... 일=6)
+        holidays (set[date]): 제외할 KST 날짜
+    """
+    windows = []
+    day = kst_date(start)
+    last = kst_date(end)
+    while day <= last:
+        if day.weekday() in weekdays and day not in holidays:
+            base = kst_day_start(day)
+            w_start = max(start, base + work_start * 60)
+            w_end = min(end, base + work_end * 60)
+            if w_end > w_start:
+                windows.append((w_start, w_end))
+        day += timedelta(days=1)
+    return windows
+
+
+def free_blocks(windows, busy, duration):
+    """
+    근무 시간 창에서 바쁜 구간을 뺀 빈 구간 중 duration(초) 이상인 것
+
+    windows와 busy 모두 시작순 정렬/비중첩이므로 두 포인터로 O(W + B)에 계산합니다.
+    """
+    blocks = []
+    j = 0
+    for w_start, w_end in windows:
+        while j < len(busy) and busy[j][1] <= w_start:
+            j += 1
+        cursor = w_start
+        k = j
+        while k < len(busy) and busy[k][0] < w_end:
+            if busy[k][0] - cursor >= duration:
+                blocks.append((cursor, busy[k][0]))
+            cursor = max(cursor, busy[k][1])
+            k += 1
+        if w_end - cursor >= duration:
+            blocks.append((cursor, w_end))
+    return blocks
+
+
+def candidate_slots(blocks, duration, step, limit):
+    """빈 구간마다 step(초) 단위로 올림한 가장 이른 시작 시각의 후보 1개씩 (최대 limit개)"""
+    slots = []
+    for b_start, b_end in blocks:
+        slot_start = -(-b_start // step) * step if step > 0 else b_start
+        if slot_start + duration <= b_end:
+            slots.append((slot_start, slot_start + duration))
+            if len(slots) >= limit:
+                break
+    return slots
+
+
+def event_busy_interval(event, include_all_day=True):
+    """
+    일정 -> 바쁜 구간 (start, end) 또는 None
+
+    종일 일정은 카카오가 UTC 자정으로 표기하므로 해당 날짜의 KST 하루 전체로 변환합니다.
+    """
+    t = event.get('time') or {}
+    try:
+        start_at = t['start_at']
+        end_at = t.get('end_at') or start_at
+        start = datetime.fromisoformat(start_at.replace('Z', '+00:00')).timestamp()
+        end = datetime.fromisoformat(end_at.replace('Z', '+00:00')).timestamp()
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    if t.get('all_day'):
+        if not include_all_day:
+            return None
+        first = datetime.fromtimestamp(start, timezone.utc).date()
+        last = datetime.fromtimestamp(max(end, start + 1) - 1, timezone.utc).date()
+        return kst_day_start(first), kst_day_start(last + timedelta(days=1))
+    return start, max(start, end)
+
+
+def holiday_dates(events):
+    """공휴일 API 응답 events -> 쉬는 날 KST 날짜 집합 (기념일 holiday=false 제외)"""
+    days = set()
+    for ev in events or []:
+        if ev.get('holiday') is False:
+            continue
+        span = event_busy_interval(ev)
+        if span is None:
+            continue
+        day = kst_date(span[0])
+        last = kst_date(max(span[1], span[0] + 1) - 1)
+        while day <= last:
+            days.add(day)
+            day += timedelta(days=1)
+    return days
+
+
+def to_kst_iso(ts):
+    return datetime.fromtimestamp(ts, KST).isoformat()
+
+
+def parse_weekdays(value):
+    """'0-4' 또는 '0,1,2,3,4' (월=0) -> set[int]"""
+    days = set()
+    for part in str(value).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            lo, hi = part.split('-', 1)
+            days.update(range(int(lo), int(hi) + 1))
+        else:
+            days.add(int(part))
+    if not days or not days <= set(range(7)):
+        raise ValueError(f"잘못된 요일: {value}")
+    return days
+
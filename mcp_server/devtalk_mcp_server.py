@@ -1,8 +1,41 @@
 """
 Devtalk MCP 서버 - 답변 없는 최근 작성글 수 조회
+
+Explorer 쿼리(13: 미답변 수, 12: 미답변 목록)는 stale-while-revalidate 캐시로 응답합니다.
+- DEVTALK_QUERY_CACHE_TTL (기본 60초): 이 시간 안의 결과는 그대로 사용
+- DEVTALK_QUERY_MAX_STALE (기본 3600초): TTL이 지난 결과는 즉시 응답하고 백그라운드 갱신, 이 시간을 넘으면 새로 조회
+
+미답변 토픽은 백그라운드에서 주기적으로(DEVTALK_SYNC_INTERVAL, 기본 300초) 로컬 DB(DEVTALK_TOPICS_PATH,
+기본 data/devtalk_topics.sqlite3)에 증분 동기화되며, 신규/경과 시간/첫 답변 소요 시간 통계는 이 DB로만 응답합니다.
+
+사전 답변 추천(suggest-answers)은 tam-admin 사전 답변 전체(TAM_ADMIN_API_HOST)를 받아 문자 n-gram BM25 색인을 만들고
+(DEVTALK_ANSWERS_TTL, 기본 3600초마다 백그라운드 재색인) 미답변 토픽마다 로컬에서 점수를 계산합니다.
+
+일괄 답변(reply-bulk)은 토픽별 작업을 SQLite 큐(DEVTALK_REPLY_JOBS_PATH)에 넣고 job_id로 즉시 응답하며,
+DEVTALK_REPLY_BULK_WORKERS개 워커가 DEVTALK_REPLY_RATE(초당) 레이트 리밋으로 등록합니다. (상태는 /mcp/devtalk/reply-jobs)
+토픽+본문(또는 지정한 idempotency_key)별 멱등성 키를 로컬(DEVTALK_REPLY_IDEMPOTENCY_PATH)에 남겨 재시도 시 중복 등록을 막습니다.
+
+DEVTALK_WEBHOOK_SECRET을 설정하면 웹훅 모드로 동작합니다. /mcp/devtalk/webhook이 Discourse 웹훅(topic_created, post_created)을
+서명 검증 후 미답변 목록에 즉시 반영하고, 미답변 수/목록은 Explorer 쿼리 대신 메모리 목록으로 응답합니다.
+(쿼리 13/12와 같은 지표가 되도록 DEVTALK_UNANSWERED_WINDOW_DAYS(기본 7일) 안에 작성된 토픽만, 목록은 쿼리 12의 컬럼 모양으로)
+폴링은 누락 이벤트 보정용으로만 DEVTALK_WEBHOOK_RECONCILE_INTERVAL(기본 3600초)마다 실행됩니다.
 """
 from flask import Flask, jsonify, request
+from server_runner import run_server
+from mcp_jsonrpc import register_mcp_endpoint
+from swr_cache import SWRCache
+from devtalk_topics import TopicStore, parse_time
+from answer_matcher import AnswerIndex
+from paged_catalog import PagedCatalog
+import devtalk_webhooks
+from idempotency import IdempotencyStore
+from job_queue import DurableJobQueue
+from rate_limit import TokenBucket
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import os
+import time
 import requests
 from dotenv import load_dotenv
 
@@ -17,6 +50,165 @@ DEVTALK_API_KEY = os.getenv('DEVTALK_API_KEY', '')
 DEVTALK_API_USERNAME = os.getenv('DEVTALK_API_USERNAME', '')
 DEVTALK_REPLY_API_KEY = os.getenv('DEVTALK_REPLY_API_KEY', '')
 DEVTALK_REPLY_API_USERNAME = os.getenv('DEVTALK_REPLY_API_USERNAME', '')
+DEVTALK_WEBHOOK_SECRET = os.getenv('DEVTALK_WEBHOOK_SECRET', '')
+# 웹훅 모드 미답변 수/목록 기간(일): Explorer 쿼리 13/12의 "최근" 기간과 같게 설정
+DEVTALK_UNANSWERED_WINDOW_DAYS = float(os.getenv('DEVTALK_UNANSWERED_WINDOW_DAYS', 7))
+LIVE_DEFAULT_COLUMNS = ["topic_id", "title", "created_at", "author", "url"]
+
+UNANSWERED_COUNT_QUERY_ID = 13
+UNANSWERED_LIST_QUERY_ID = 12
+
+ANSWERS_PAGE_LIMIT = 100
+ANSWERS_MAX_PAGES = 200
+
+# 일괄 답변: 동시 발송 수, 레이트 리밋, 429 재시도, 멱등성 키 저장소, 발송 큐
+REPLY_BULK_MAX = 100
+REPLY_BULK_WORKERS = int(os.getenv('DEVTALK_REPLY_BULK_WORKERS', 4))
+REPLY_RATE_LIMIT_RETRIES = 2
+REPLY_RETRY_MAX_WAIT = 10
+reply_limiter = TokenBucket(float(os.getenv('DEVTALK_REPLY_RATE', 2)))
+reply_idempotency = IdempotencyStore(
+	os.getenv('DEVTALK_REPLY_IDEMPOTENCY_PATH') or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'devtalk_reply_idempotency.sqlite3'),
+	ttl=int(os.getenv('DEVTALK_REPLY_IDEMPOTENCY_TTL', 30 * 24 * 3600))
+)
+DEVTALK_REPLY_JOBS_PATH = os.getenv('DEVTALK_REPLY_JOBS_PATH') or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'devtalk_reply_jobs.sqlite3')
+DEVTALK_REPLY_JOB_MAX_ATTEMPTS = int(os.getenv('DEVTALK_REPLY_JOB_MAX_ATTEMPTS', 3))
+
+# Explorer 쿼리 결과 캐시 (동시 갱신은 쿼리당 하나로 합쳐짐)
+query_cache = SWRCache(
+	ttl=float(os.getenv('DEVTALK_QUERY_CACHE_TTL', 60)),
+	max_stale=float(os.getenv('DEVTALK_QUERY_MAX_STALE', 3600)),
+	name='devtalk-query'
+)
+# 사전 답변 BM25 색인 캐시 (TTL이 지나면 이전 색인으로 응답하며 백그라운드 재색인)
+answers_cache = SWRCache(
+	ttl=float(os.getenv('DEVTALK_ANSWERS_TTL', 3600)),
+	max_stale=float(os.getenv('DEVTALK_ANSWERS_MAX_STALE', 7 * 24 * 3600)),
+	name='devtalk-answers'
+)
+
+# MCP 도구 목록 (parameters: OpenAI/JSON Schema, endpoint: 호출 라우트)
+TOOLS = [
+	{
+		"name": "get_devtalk_unanswered_count",
+		"description": "Devtalk 답변 없는 최근 작성글 수 조회 (응답의 cache.age_seconds 또는 live.last_event_at으로 데이터 신선도 확인)",
+		"parameters": {"type": "object", "properties": {}, "required": []},
+		"endpoint": {"method": "GET", "path": "/mcp/devtalk/unanswered-count"}
+	},
+	{
+		"name": "get_devtalk_unanswered_list",
+		"description": "Devtalk 미답변 글 목록 조회 (Explorer columns/rows 형식, 응답의 cache.age_seconds 또는 live.last_event_at으로 데이터 신선도 확인)",
+		"parameters": {"type": "object", "properties": {}, "required": []},
+		"endpoint": {"method": "GET", "path": "/mcp/devtalk/unanswered-list"}
+	},
+	{
+		"name": "post_devtalk_reply",
+		"description": "Devtalk 토픽에 답변 등록",
+		"parameters": {
+			"type": "object",
+			"properties": {
+				"topic_id": {"type": "integer", "description": "토픽 ID"},
+				"raw": {"type": "string", "description": "답변 본문"},
+				"target_recipients": {"type": "string", "description": "수신 대상 (선택)"},
+				"archetype": {"type": "string", "description": "유형 (선택)"}
+			},
+			"required": ["topic_id", "raw"]
+		},
+		"endpoint": {"method": "POST", "path": "/mcp/devtalk/reply"}
+	},
+	{
+		"name": "post_devtalk_replies_bulk",
+		"description": "Devtalk 여러 토픽에 답변을 한 번에 등록 (큐에 넣고 토픽별 job_id를 즉시 반환, 결과는 get_devtalk_reply_jobs로 확인). 같은 토픽에 같은 본문은 재시도해도 중복 등록되지 않음",
+		"parameters": {
+			"type": "object",
+			"properties": {
+				"replies": {
+					"type": "array",
+					"items": {
+						"type": "object",
+						"properties": {
+							"topic_id": {"type": "integer", "description": "토픽 ID"},
+							"raw": {"type": "string", "description": "답변 본문"},
+							"idempotency_key": {"type": "string", "description": "선택: 지정 시 본문 대신 이 키로 중복 판단"}
+						},
+						"required": ["topic_id", "raw"]
+					}
+				},
+				"target_recipients": {"type": "string", "description": "수신 대상 (선택)"},
+				"archetype": {"type": "string", "description": "유형 (선택)"}
+			},
+			"required": ["replies"]
+		},
+		"endpoint": {"method": "POST", "path": "/mcp/devtalk/reply-bulk"}
+	},
+	{
+		"name": "get_devtalk_reply_jobs",
+		"description": "Devtalk 일괄 답변 작업 상태 조회 (토픽별 queued/running/posted/duplicate/failed와 집계)",
+		"parameters": {
+			"type": "object",
+			"properties": {
+				"job_ids": {"type": "string", "description": "일괄 답변 응답의 job_id 목록 (쉼표 구분, 필수)"}
+			},
+			"required": ["job_ids"]
+		},
+		"endpoint": {"method": "GET", "path": "/mcp/devtalk/reply-jobs"}
+	},
+	{
+		"name": "get_devtalk_new_topics",
+		"description": "Devtalk 특정 시각 이후 새로 올라온 토픽 (로컬 동기화 DB, 답변 여부 포함)",
+		"parameters": {
+			"type": "object",
+			"properties": {
+				"since": {"type": "string", "description": "ISO8601 시각 (예: 2025-11-03T09:00:00+09:00)"},
+				"since_hours": {"type": "number", "description": "since 대신 최근 N시간"},
+				"limit": {"type": "integer", "description": "최대 개수 (기본 100)"}
+			},
+			"required": []
+		},
+		"endpoint": {"method": "GET", "path": "/mcp/devtalk/topics/new"}
+	},
+	{
+		"name": "get_devtalk_unanswered_aging",
+		"description": "Devtalk 현재 미답변 토픽의 경과 시간 구간별 분포 (<1h, 1-4h, 4-24h, 1-3d, 3-7d, >7d)",
+		"parameters": {"type": "object", "properties": {}, "required": []},
+		"endpoint": {"method": "GET", "path": "/mcp/devtalk/topics/aging"}
+	},
+	{
+		"name": "get_devtalk_answer_time_stats",
+		"description": "Devtalk 첫 답변까지 걸린 시간 분포 (p50/p90/평균, 구간별 건수)",
+		"parameters": {
+			"type": "object",
+			"properties": {
+				"days": {"type": "integer", "description": "최근 N일 내 답변된 토픽만 (기본 30)"}
+			},
+			"required": []
+		},
+		"endpoint": {"method": "GET", "path": "/mcp/devtalk/topics/answer-times"}
+	},
+	{
+		"name": "suggest_devtalk_answers",
+		"description": "Devtalk 미답변 토픽마다 tam-admin 사전 답변 중 가장 비슷한 답변 top-k를 점수와 함께 추천 (전체 미답변을 한 번에 매칭)",
+		"parameters": {
+			"type": "object",
+			"properties": {
+				"topic_ids": {"type": "array", "items": {"type": "integer"}, "description": "특정 토픽만 (생략 시 전체 미답변)"},
+				"text": {"type": "string", "description": "토픽 대신 임의 질문 텍스트로 매칭"},
+				"top_k": {"type": "integer", "description": "토픽당 추천 수 (기본 3)"},
+				"min_score": {"type": "number", "description": "이 점수 이하 추천 제외 (기본 0)"},
+				"limit": {"type": "integer", "description": "최대 토픽 수 (기본 100)"}
+			},
+			"required": []
+		},
+		"endpoint": {
+			"method": "GET",
+			"path": "/mcp/devtalk/suggest-answers",
+			"param_map": {"topic_ids": "topic_id"}
+		}
+	}
+]
+
+# 표준 MCP JSON-RPC 엔드포인트 (POST /mcp: initialize, tools/list, tools/call)
+register_mcp_endpoint(app, 'devtalk_mcp_server', TOOLS)
 
 @app.route('/mcp/devtalk/health', methods=['GET'])
 def health():
@@ -24,55 +216,49 @@ def health():
 
 @app.route('/mcp/devtalk/capabilities', methods=['GET'])
 def capabilities():
-	return jsonify({
-		"tools": [
-			{
-				"name": "get_devtalk_unanswered_count",
-				"description": "Devtalk 답변 없는 최근 작성글 수 조회",
-				"parameters": {}
-			},
-			{
-				"name": "post_devtalk_reply",
-				"description": "Devtalk 토픽에 답변 등록",
-				"parameters": {
-					"topic_id": "number (required)",
-					"raw": "string (required) - 답변 본문",
-					"target_recipients": "string (optional) - 기본 tambot",
-					"archetype": "string (optional) - 기본 regular"
-				}
-			},
-			{
-				"name": "get_devtalk_unanswered_list",
-				"description": "Devtalk 미답변 글 목록 조회",
-				"parameters": {}
-			}
-		]
-	}), 200
+	return jsonify({"tools": TOOLS}), 200
 
-@app.route('/mcp/devtalk/unanswered-count', methods=['GET'])
-def get_unanswered_count():
-	"""Devtalk Explorer Query(13) 실행 - 답변 없는 최근 작성글 수"""
-	if not DEVTALK_API_KEY or not DEVTALK_API_USERNAME:
-		return jsonify({"success": False, "error": "DEVTALK_API_KEY/DEVTALK_API_USERNAME가 설정되지 않았습니다."}), 400
-	url = f"{DEVTALK_HOST}/admin/plugins/explorer/queries/13/run"
+class DevtalkAPIError(Exception):
+	"""Devtalk(Discourse) API 오류 응답"""
+
+	def __init__(self, status_code, body):
+		super().__init__(f"Devtalk API 오류: {status_code}")
+		self.status_code = status_code
+		self.body = body
+
+def run_explorer_query(query_id):
+	"""Data Explorer 쿼리 실행 -> 결과 JSON (실패 시 DevtalkAPIError/requests 예외)"""
+	url = f"{DEVTALK_HOST}/admin/plugins/explorer/queries/{query_id}/run"
 	headers = {
 		'Api-Key': DEVTALK_API_KEY,
 		'Api-Username': DEVTALK_API_USERNAME
 	}
+	# multipart/form-data는 requests가 boundary를 설정하도록 files 또는 data 사용
+	# 본문이 필요 없다면 빈 data로 전달
+	resp = requests.post(url, headers=headers, data={}, timeout=10)
+	if resp.status_code != 200:
+		raise DevtalkAPIError(resp.status_code, resp.text)
+	return resp.json()
+
+def cached_query_response(query_id):
+	"""
+	Explorer 쿼리 결과를 query_cache(stale-while-revalidate)로 응답
+	refresh=true면 캐시를 무시하고 새로 조회
+	"""
+	if not DEVTALK_API_KEY or not DEVTALK_API_USERNAME:
+		return jsonify({"success": False, "error": "DEVTALK_API_KEY/DEVTALK_API_USERNAME가 설정되지 않았습니다."}), 400
+	force = (request.args.get('refresh') or '').lower() in ('1', 'true', 'yes')
 	try:
-		# multipart/form-data는 requests가 boundary를 설정하도록 files 또는 data 사용
-		# 본문이 필요 없다면 빈 data로 전달
-		resp = requests.post(url, headers=headers, data={}, timeout=10)
-		if resp.status_code == 200:
-			# Explorer 결과 포맷 그대로 전달
-			return jsonify({"success": True, "data": resp.json()}), 200
-		else:
-			return jsonify({
-				"success": False,
-				"error": f"Devtalk API 오류: {resp.status_code}",
-				"error_message": resp.text,
-				"status_code": resp.status_code
-			}), resp.status_code
+		data, meta = query_cache.get(query_id, lambda: run_explorer_query(query_id), force=force)
+		# Explorer 결과 포맷 그대로 전달 + 데이터 신선도
+		return jsonify({"success": True, "data": data, "cache": meta}), 200
+	except DevtalkAPIError as e:
+		return jsonify({
+			"success": False,
+			"error": f"Devtalk API 오류: {e.status_code}",
+			"error_message": e.body,
+			"status_code": e.status_code
+		}), e.status_code
 	except requests.exceptions.Timeout:
 		return jsonify({"success": False, "error": "Devtalk API 호출 시간 초과"}), 504
 	except requests.exceptions.RequestException as e:
@@ -80,33 +266,282 @@ def get_unanswered_count():
 	except Exception as e:
 		return jsonify({"success": False, "error": str(e)}), 500
 
+def use_live_topics():
+	"""웹훅 모드면 미답변 수/목록을 메모리 목록으로 응답 (source=explorer면 Explorer 쿼리)"""
+	return bool(DEVTALK_WEBHOOK_SECRET) and request.args.get('source') != 'explorer'
+
+def live_window_start():
+	"""쿼리 13/12와 같은 최근 기간의 시작 (epoch 초)"""
+	return time.time() - DEVTALK_UNANSWERED_WINDOW_DAYS * 24 * 3600
+
+def live_meta():
+	return {
+		"source": "webhook",
+		"window_days": DEVTALK_UNANSWERED_WINDOW_DAYS,
+		"last_event_at": topic_store.last_event_at,
+		"reconciled_at": topic_store.synced_at
+	}
+
+@app.route('/mcp/devtalk/unanswered-count', methods=['GET'])
+def get_unanswered_count():
+	"""Devtalk Explorer Query(13) - 답변 없는 최근 작성글 수 (캐시, 웹훅 모드면 메모리 목록)"""
+	if use_live_topics():
+		count = topic_store.open_count(since=live_window_start())
+		return jsonify({"success": True, "data": {"columns": ["count"], "rows": [[count]]}, "count": count, "live": live_meta()}), 200
+	return cached_query_response(UNANSWERED_COUNT_QUERY_ID)
+
 @app.route('/mcp/devtalk/unanswered-list', methods=['GET'])
 def get_unanswered_list():
-    """Devtalk Explorer Query(12) 실행 - 미답변 글 목록 조회"""
-    if not DEVTALK_API_KEY or not DEVTALK_API_USERNAME:
-        return jsonify({"success": False, "error": "DEVTALK_API_KEY/DEVTALK_API_USERNAME가 설정되지 않았습니다."}), 400
-    url = f"{DEVTALK_HOST}/admin/plugins/explorer/queries/12/run"
-    headers = {
-        'Api-Key': DEVTALK_API_KEY,
-        'Api-Username': DEVTALK_API_USERNAME
-    }
-    try:
-        resp = requests.post(url, headers=headers, data={}, timeout=10)
-        if resp.status_code == 200:
-            return jsonify({"success": True, "data": resp.json()}), 200
-        else:
-            return jsonify({
-                "success": False,
-                "error": f"Devtalk API 오류: {resp.status_code}",
-                "error_message": resp.text,
-                "status_code": resp.status_code
-            }), resp.status_code
-    except requests.exceptions.Timeout:
-        return jsonify({"success": False, "error": "Devtalk API 호출 시간 초과"}), 504
-    except requests.exceptions.RequestException as e:
-        return jsonify({"success": False, "error": f"Devtalk API 호출 실패: {str(e)}"}), 502
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+	"""Devtalk Explorer Query(12) - 미답변 글 목록 조회 (캐시, 웹훅 모드면 메모리 목록)"""
+	if use_live_topics():
+		# 첫 보정 동기화 전에는 쿼리 12의 컬럼을 모르므로 Explorer 쿼리로 응답 (API 키가 없을 때만 기본 컬럼)
+		if not topic_store.columns and DEVTALK_API_KEY and DEVTALK_API_USERNAME:
+			return cached_query_response(UNANSWERED_LIST_QUERY_ID)
+		# 쿼리 12와 같은 컬럼/행 모양 (웹훅으로만 알게 된 토픽은 컬럼 이름으로 채움)
+		data = topic_store.open_rows(
+			since=live_window_start(),
+			extra=lambda t: {"url": f"{DEVTALK_HOST}/t/{t['topic_id']}"},
+			default_columns=LIVE_DEFAULT_COLUMNS
+		)
+		return jsonify({"success": True, "data": data, "live": live_meta()}), 200
+	return cached_query_response(UNANSWERED_LIST_QUERY_ID)
+
+def fetch_unanswered_rows():
+	"""동기화용 미답변 목록 조회 (조회 결과는 unanswered-list 캐시에도 반영)"""
+	data, _ = query_cache.get(UNANSWERED_LIST_QUERY_ID, lambda: run_explorer_query(UNANSWERED_LIST_QUERY_ID), force=True)
+	return data
+
+def fetch_first_reply_at(topic_id):
+	"""토픽의 첫 답글(작성자 외) 작성 시각 epoch 초, 없으면 None"""
+	url = f"{DEVTALK_HOST}/t/{topic_id}.json"
+	headers = {
+		'Api-Key': DEVTALK_API_KEY,
+		'Api-Username': DEVTALK_API_USERNAME
+	}
+	resp = requests.get(url, headers=headers, timeout=10)
+	if resp.status_code != 200:
+		raise DevtalkAPIError(resp.status_code, resp.text)
+	posts = ((resp.json().get('post_stream') or {}).get('posts')) or []
+	author = posts[0].get('username') if posts else None
+	for post in posts:
+		if (post.get('post_number') or 0) > 1 and post.get('username') != author:
+			return parse_time(post.get('created_at'))
+	return None
+
+topic_store = TopicStore(
+	os.getenv('DEVTALK_TOPICS_PATH') or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'devtalk_topics.sqlite3'),
+	fetch_unanswered=fetch_unanswered_rows,
+	fetch_first_reply=fetch_first_reply_at
+)
+
+@app.route('/mcp/devtalk/topics/new', methods=['GET'])
+def topics_new_since():
+	"""since(ISO8601) 또는 since_hours 이후 작성된 토픽 (로컬 DB)"""
+	try:
+		if request.args.get('since'):
+			since = parse_time(request.args['since'])
+			if since is None:
+				return jsonify({"success": False, "error": "since는 ISO8601 형식이어야 합니다."}), 400
+		else:
+			since = time.time() - float(request.args.get('since_hours') or 24) * 3600
+		limit = int(request.args.get('limit') or 100)
+		result = topic_store.new_since(since, limit=limit)
+		return jsonify({"success": True, **result, "synced_at": topic_store.synced_at}), 200
+	except ValueError as e:
+		return jsonify({"success": False, "error": f"잘못된 파라미터: {str(e)}"}), 400
+	except Exception as e:
+		return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/mcp/devtalk/topics/aging', methods=['GET'])
+def topics_aging():
+	"""현재 미답변 토픽 경과 시간 분포 (로컬 DB)"""
+	try:
+		return jsonify({"success": True, **topic_store.aging(), "synced_at": topic_store.synced_at}), 200
+	except Exception as e:
+		return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/mcp/devtalk/topics/answer-times', methods=['GET'])
+def topics_answer_times():
+	"""최근 days일 내 답변된 토픽의 첫 답변 소요 시간 분포 (로컬 DB)"""
+	try:
+		days = float(request.args.get('days') or 30)
+		result = topic_store.answer_times(since=time.time() - days * 24 * 3600)
+		return jsonify({"success": True, "days": days, **result, "synced_at": topic_store.synced_at}), 200
+	except ValueError as e:
+		return jsonify({"success": False, "error": f"잘못된 파라미터: {str(e)}"}), 400
+	except Exception as e:
+		return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/mcp/devtalk/topics/sync', methods=['POST'])
+def topics_sync():
+	"""미답변 토픽 즉시 동기화"""
+	if not DEVTALK_API_KEY or not DEVTALK_API_USERNAME:
+		return jsonify({"success": False, "error": "DEVTALK_API_KEY/DEVTALK_API_USERNAME가 설정되지 않았습니다."}), 400
+	try:
+		return jsonify(topic_store.sync()), 200
+	except DevtalkAPIError as e:
+		return jsonify({
+			"success": False,
+			"error": f"Devtalk API 오류: {e.status_code}",
+			"error_message": e.body,
+			"status_code": e.status_code
+		}), e.status_code
+	except requests.exceptions.RequestException as e:
+		return jsonify({"success": False, "error": f"Devtalk API 호출 실패: {str(e)}"}), 502
+	except Exception as e:
+		return jsonify({"success": False, "error": str(e)}), 500
+
+def fetch_answer_page(page, limit, conditional_headers):
+	"""tam-admin 사전 답변 페이지 조회 (answers_catalog용)"""
+	host = os.getenv('TAM_ADMIN_API_HOST', '')
+	if not host:
+		raise RuntimeError("TAM_ADMIN_API_HOST env not set")
+	url = host.rstrip("/") + "/api/devtalk/chat-matching-list"
+	headers = {
+		"Authorization": os.getenv('TAM_ADMIN_API_AUTH', ''),
+		"User-Agent": 'tam-batch',
+		"TAM-CLIENT": 'TAM-AGENT',
+		**conditional_headers
+	}
+	return requests.get(url, headers=headers, params={'page': page, 'limit': limit}, timeout=10)
+
+# 사전 답변 전체 목록 (페이지 동시 조회, 재색인 시 바뀌지 않은 페이지는 304로 재사용)
+answers_catalog = PagedCatalog(fetch_answer_page, limit=ANSWERS_PAGE_LIMIT, max_pages=ANSWERS_MAX_PAGES, name='devtalk_answers')
+
+def build_answer_index():
+	answers = answers_catalog.refresh()
+	index = AnswerIndex(answers)
+	print(f"[devtalk_mcp_server] answer index built: {len(index)} answers")
+	return index
+
+def topic_query_text(topic):
+	"""토픽 매칭 질의: 제목 + 원본 행의 짧은 문자열 필드(요약 등)"""
+	parts = [topic.get('title') or '']
+	for key, value in (topic.get('row') or {}).items():
+		if isinstance(value, str) and value != topic.get('title') and not value.startswith('http') \
+				and key not in ('created_at', 'updated_at') and len(value) <= 500:
+			parts.append(value)
+	return ' '.join(parts)
+
+@app.route('/mcp/devtalk/suggest-answers', methods=['GET'])
+def suggest_answers():
+	"""
+	미답변 토픽별 사전 답변 추천 (BM25, 로컬 계산)
+
+	Query:
+	  - topic_id: 특정 토픽만 (반복/콤마 구분, 생략 시 전체 미답변)
+	  - text: 토픽 대신 임의 텍스트로 매칭
+	  - top_k (기본 3), min_score (기본 0), limit (기본 100)
+	  - refresh: true면 사전 답변을 다시 받아 재색인
+	"""
+	try:
+		top_k = int(request.args.get('top_k') or 3)
+		min_score = float(request.args.get('min_score') or 0)
+		limit = int(request.args.get('limit') or 100)
+		topic_ids = []
+		for value in request.args.getlist('topic_id'):
+			topic_ids.extend(int(t) for t in value.split(',') if t.strip())
+	except ValueError as e:
+		return jsonify({"success": False, "error": f"잘못된 파라미터: {str(e)}"}), 400
+	force = (request.args.get('refresh') or '').lower() in ('1', 'true', 'yes')
+	try:
+		index, meta = answers_cache.get('answers', build_answer_index, force=force)
+	except requests.exceptions.RequestException as e:
+		return jsonify({"success": False, "error": f"tam-admin API 호출 실패: {str(e)}"}), 502
+	except Exception as e:
+		return jsonify({"success": False, "error": f"사전 답변 색인 실패: {str(e)}"}), 502
+
+	text = request.args.get('text')
+	if text:
+		return jsonify({
+			"success": True,
+			"answers_indexed": len(index),
+			"index_built_at": index.built_at,
+			"cache": meta,
+			"suggestions": [{"text": text, "matches": index.suggest(text, top_k=top_k, min_score=min_score)}]
+		}), 200
+
+	try:
+		if topic_store.synced_at is None and DEVTALK_API_KEY and DEVTALK_API_USERNAME:
+			# 기동 직후 아직 동기화 전이면 한 번 채움
+			topic_store.sync()
+		topics = topic_store.open_topics(topic_ids=topic_ids or None, limit=limit)
+	except Exception as e:
+		return jsonify({"success": False, "error": f"미답변 토픽 조회 실패: {str(e)}"}), 502
+
+	t0 = time.perf_counter()
+	suggestions = [
+		{
+			"topic_id": topic["topic_id"],
+			"title": topic["title"],
+			"age_seconds": topic.get("age_seconds"),
+			"matches": index.suggest(topic_query_text(topic), top_k=top_k, min_score=min_score)
+		}
+		for topic in topics
+	]
+	return jsonify({
+		"success": True,
+		"answers_indexed": len(index),
+		"index_built_at": index.built_at,
+		"cache": meta,
+		"topics": len(suggestions),
+		"match_ms": round((time.perf_counter() - t0) * 1000, 1),
+		"suggestions": suggestions,
+		"topics_synced_at": topic_store.synced_at
+	}), 200
+
+@app.route('/mcp/devtalk/webhook', methods=['POST'])
+def receive_webhook():
+	"""
+	Discourse 웹훅 수신 (topic_created, post_created)
+
+	X-Discourse-Event-Signature(HMAC-SHA256, DEVTALK_WEBHOOK_SECRET)가 맞지 않으면 401.
+	처리하지 않는 이벤트도 Discourse가 재전송하지 않도록 200으로 응답합니다.
+	"""
+	if not DEVTALK_WEBHOOK_SECRET:
+		return jsonify({"success": False, "error": "DEVTALK_WEBHOOK_SECRET가 설정되지 않았습니다."}), 503
+	body = request.get_data()
+	if not devtalk_webhooks.verify_signature(DEVTALK_WEBHOOK_SECRET, body, request.headers.get(devtalk_webhooks.SIGNATURE_HEADER)):
+		return jsonify({"success": False, "error": "서명이 올바르지 않습니다."}), 401
+	event = request.headers.get(devtalk_webhooks.EVENT_HEADER, '')
+	try:
+		payload = json.loads(body or b'null')
+	except ValueError:
+		payload = None
+	if not isinstance(payload, dict):
+		return jsonify({"success": False, "error": "JSON 본문이 필요합니다."}), 400
+	try:
+		result = devtalk_webhooks.apply_event(topic_store, event, payload)
+	except Exception as e:
+		print("[devtalk_mcp_server] webhook error:", e)
+		return jsonify({"success": False, "error": str(e)}), 500
+	return jsonify({"success": True, **result, "open": topic_store.open_count(since=live_window_start())}), 200
+
+@app.route('/mcp/devtalk/cache', methods=['GET'])
+def cache_status():
+	"""Explorer 쿼리 캐시 상태 (쿼리별 데이터 나이, 적중 통계) + 토픽 동기화 상태"""
+	return jsonify({
+		"success": True,
+		**query_cache.snapshot(),
+		"answers_index": answers_cache.snapshot(),
+		"topic_sync": topic_store.snapshot()
+	}), 200
+
+def submit_reply(topic_id, raw, target_recipients='tambot', archetype='regular'):
+	"""Discourse posts.json 호출 -> requests.Response"""
+	url = f"{DEVTALK_HOST}/posts.json"
+	headers = {
+		'Content-Type': 'application/json;charset=utf-8',
+		'Api-Key': DEVTALK_REPLY_API_KEY,
+		'Api-Username': DEVTALK_REPLY_API_USERNAME
+	}
+	payload = {
+		'raw': raw,
+		'topic_id': str(topic_id),
+		'target_recipients': target_recipients,
+		'archetype': archetype
+	}
+	return requests.post(url, headers=headers, json=payload, timeout=15)
 
 @app.route('/mcp/devtalk/reply', methods=['POST'])
 def post_reply():
@@ -123,20 +558,7 @@ def post_reply():
 		if not topic_id or not raw:
 			return jsonify({"success": False, "error": "topic_id와 raw는 필수입니다."}), 400
 
-		url = f"{DEVTALK_HOST}/posts.json"
-		headers = {
-			'Content-Type': 'application/json;charset=utf-8',
-			'Api-Key': DEVTALK_REPLY_API_KEY,
-			'Api-Username': DEVTALK_REPLY_API_USERNAME
-		}
-		payload = {
-			'raw': raw,
-			'topic_id': str(topic_id),
-			'target_recipients': target_recipients,
-			'archetype': archetype
-		}
-
-		resp = requests.post(url, headers=headers, json=payload, timeout=15)
+		resp = submit_reply(topic_id, raw, target_recipients, archetype)
 		if resp.status_code in (200, 201):
 			return jsonify({"success": True, "data": resp.json()}), 200
 		else:
@@ -153,6 +575,206 @@ def post_reply():
 	except Exception as e:
 		return jsonify({"success": False, "error": str(e)}), 500
 
+def _retry_wait_seconds(resp):
+	"""429 응답의 대기 시간 (Retry-After 헤더 또는 Discourse extras.wait_seconds)"""
+	try:
+		return float(resp.headers.get('Retry-After'))
+	except (TypeError, ValueError):
+		pass
+	try:
+		return float(((resp.json() or {}).get('extras') or {}).get('wait_seconds'))
+	except (TypeError, ValueError, AttributeError):
+		return 1.0
+
+def _post_bulk_reply(index, item, target_recipients, archetype):
+	"""일괄 답변 항목 하나 처리 -> 토픽별 결과 dict"""
+	topic_id = item.get('topic_id')
+	raw = item.get('raw')
+	result = {"index": index, "topic_id": topic_id}
+	if not topic_id or not raw:
+		return {**result, "status": "invalid", "success": False, "error": "topic_id와 raw는 필수입니다."}
+
+	# 키를 지정하지 않으면 토픽+본문으로 만들어 같은 답변의 재시도를 중복으로 판단
+	key = item.get('idempotency_key') or hashlib.sha256(raw.encode('utf-8')).hexdigest()[:24]
+	key = f"{topic_id}:{key}"
+	result["idempotency_key"] = key
+	state, stored = reply_idempotency.begin(key)
+	if state == "done":
+		return {**result, **stored, "status": "duplicate", "duplicate": True}
+	if state == "pending":
+		return {**result, "status": "pending", "success": False, "error": "같은 idempotency_key 요청이 처리 중입니다.", "retryable": True}
+
+	try:
+		for attempt in range(REPLY_RATE_LIMIT_RETRIES + 1):
+			reply_limiter.acquire()
+			resp = submit_reply(topic_id, raw, target_recipients, archetype)
+			if resp.status_code != 429 or attempt == REPLY_RATE_LIMIT_RETRIES:
+				break
+			time.sleep(min(REPLY_RETRY_MAX_WAIT, _retry_wait_seconds(resp)))
+		if resp.status_code in (200, 201):
+			data = resp.json()
+			posted = {"success": True, "post_id": data.get('id'), "post_number": data.get('post_number')}
+			reply_idempotency.complete(key, posted)
+			return {**result, **posted, "status": "posted", "duplicate": False}
+		item_result = {
+			**result,
+			"status": "failed",
+			"success": False,
+			"status_code": resp.status_code,
+			"error": f"Devtalk API 오류: {resp.status_code}",
+			"error_message": resp.text[:500],
+			"retryable": resp.status_code == 429 or resp.status_code >= 500
+		}
+	except requests.exceptions.RequestException as e:
+		item_result = {**result, "status": "failed", "success": False, "error": f"Devtalk API 호출 실패: {str(e)}", "retryable": True}
+	reply_idempotency.release(key)
+	return item_result
+
+def _deliver_bulk_reply(payload):
+	"""답변 큐 핸들러: 토픽 하나 등록 (멱등성 키로 재시도 시 중복 방지)"""
+	return _post_bulk_reply(payload["index"], payload["item"], payload["target_recipients"], payload["archetype"])
+
+reply_jobs = DurableJobQueue(
+	DEVTALK_REPLY_JOBS_PATH,
+	handlers={'reply': _deliver_bulk_reply},
+	workers=REPLY_BULK_WORKERS,
+	max_attempts=DEVTALK_REPLY_JOB_MAX_ATTEMPTS,
+	is_retryable=lambda result: bool(result.get('retryable')),
+	name='devtalk_reply_jobs'
+)
+
+def _reply_job_status(job):
+	"""큐 작업 -> 토픽별 상태 (끝난 작업은 _post_bulk_reply 결과의 status)"""
+	payload = job["payload"]
+	status = job["status"]
+	entry = {"job_id": job["job_id"], "index": payload.get("index"), "topic_id": payload["item"].get("topic_id"),
+		"attempts": job["attempts"]}
+	if status in ('succeeded', 'failed') and isinstance(job["result"], dict):
+		return {**entry, **job["result"]}
+	if status == 'queued' and job["result"]:
+		# 재시도 대기 중: 직전 실패 사유 포함
+		return {**entry, "status": "queued", "success": False, "error": job["error"], "retry_at": job["next_attempt_at"]}
+	return {**entry, "status": status, "success": False}
+
+@app.route('/mcp/devtalk/reply-bulk', methods=['POST'])
+def post_reply_bulk():
+	"""
+	여러 토픽에 답변 일괄 등록
+
+	예시 body:
+	{
+	  "replies": [
+	    {"topic_id": 123, "raw": "답변 본문"},
+	    {"topic_id": 456, "raw": "답변 본문", "idempotency_key": "faq-login-456"}
+	  ],
+	  "target_recipients": "tambot",   // 선택 (항목 공통)
+	  "archetype": "regular",          // 선택 (항목 공통)
+	  "wait": false                    // 선택, true면 큐를 거치지 않고 등록 결과까지 대기
+	}
+
+	기본은 토픽별 작업을 큐에 넣고 202와 토픽별 job_id를 즉시 돌려줍니다. (레이트 리밋상 100건이면 수십 초 걸리므로
+	클라이언트 타임아웃 안에 끝나지 않음) 결과는 GET /mcp/devtalk/reply-jobs?job_ids=...로 확인합니다.
+	이미 등록한 멱등성 키는 Discourse 호출 없이 이전 결과(status: duplicate)가 됩니다.
+	항목별 status: queued | running | posted | duplicate | failed | pending | invalid
+	"""
+	if not DEVTALK_REPLY_API_KEY or not DEVTALK_REPLY_API_USERNAME:
+		return jsonify({"success": False, "error": "DEVTALK_REPLY_API_KEY/DEVTALK_REPLY_API_USERNAME가 설정되지 않았습니다."}), 400
+	try:
+		body = request.get_json(silent=True) or {}
+		items = body.get('replies')
+		if not isinstance(items, list) or not items:
+			return jsonify({"success": False, "error": "replies 목록은 필수입니다."}), 400
+		if len(items) > REPLY_BULK_MAX:
+			return jsonify({"success": False, "error": f"한 번에 최대 {REPLY_BULK_MAX}개까지 등록할 수 있습니다."}), 400
+		if not all(isinstance(item, dict) for item in items):
+			return jsonify({"success": False, "error": "replies 항목은 객체여야 합니다."}), 400
+		target_recipients = body.get('target_recipients') or 'tambot'
+		archetype = body.get('archetype') or 'regular'
+
+		t0 = time.perf_counter()
+		if not body.get('wait'):
+			results = []
+			for index, item in enumerate(items):
+				if not item.get('topic_id') or not item.get('raw'):
+					results.append({"index": index, "topic_id": item.get('topic_id'), "status": "invalid", "success": False,
+						"error": "topic_id와 raw는 필수입니다."})
+					continue
+				job = reply_jobs.enqueue('reply', {"index": index, "item": item,
+					"target_recipients": target_recipients, "archetype": archetype})
+				results.append({"index": index, "topic_id": item.get('topic_id'), "status": "queued", "job_id": job["job_id"]})
+			job_ids = [r["job_id"] for r in results if r.get("job_id")]
+			return jsonify({
+				"success": bool(job_ids),
+				"status": "queued",
+				"total": len(results),
+				"queued": len(job_ids),
+				"invalid": len(results) - len(job_ids),
+				"status_url": f"/mcp/devtalk/reply-jobs?job_ids={','.join(job_ids)}",
+				"results": results
+			}), 202
+
+		with ThreadPoolExecutor(max_workers=max(1, min(REPLY_BULK_WORKERS, len(items)))) as pool:
+			results = list(pool.map(
+				lambda pair: _post_bulk_reply(pair[0], pair[1], target_recipients, archetype),
+				enumerate(items)
+			))
+
+		counts = {}
+		for r in results:
+			counts[r["status"]] = counts.get(r["status"], 0) + 1
+		failed = sum(1 for r in results if not r.get("success"))
+		if failed:
+			print(f"[devtalk_mcp_server] reply-bulk: {failed}/{len(results)} failed")
+		return jsonify({
+			"success": failed == 0,
+			"total": len(results),
+			"posted": counts.get("posted", 0),
+			"duplicates": counts.get("duplicate", 0),
+			"failed": failed,
+			"elapsed_ms": round((time.perf_counter() - t0) * 1000),
+			"results": results
+		}), 200
+	except Exception as e:
+		return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/mcp/devtalk/reply-jobs', methods=['GET'])
+def get_reply_jobs():
+	"""일괄 답변 작업 상태 조회 (job_ids: 쉼표 구분)"""
+	try:
+		job_ids = [j.strip() for j in (request.args.get('job_ids') or '').split(',') if j.strip()]
+		if not job_ids:
+			return jsonify({"success": False, "error": "job_ids는 필수입니다."}), 400
+		results = []
+		for job_id in job_ids:
+			job = reply_jobs.get(job_id)
+			if job is None:
+				results.append({"job_id": job_id, "status": "not_found", "success": False})
+			else:
+				results.append(_reply_job_status(job))
+		counts = {}
+		for r in results:
+			counts[r["status"]] = counts.get(r["status"], 0) + 1
+		done = all(r["status"] not in ('queued', 'running') for r in results)
+		return jsonify({
+			"success": True,
+			"done": done,
+			"total": len(results),
+			"counts": counts,
+			"results": sorted(results, key=lambda r: r.get("index") if r.get("index") is not None else len(results))
+		}), 200
+	except Exception as e:
+		return jsonify({"success": False, "error": str(e)}), 500
+
+def start_background_workers():
+	"""미답변 토픽 증분 동기화 폴러(API 키가 있을 때만, 웹훅 모드에서는 보정 주기로), 일괄 답변 큐 워커 기동"""
+	if DEVTALK_REPLY_API_KEY and DEVTALK_REPLY_API_USERNAME:
+		reply_jobs.start()
+	if DEVTALK_API_KEY and DEVTALK_API_USERNAME:
+		if DEVTALK_WEBHOOK_SECRET:
+			topic_store.start(int(os.getenv('DEVTALK_WEBHOOK_RECONCILE_INTERVAL', 3600)))
+		else:
+			topic_store.start(int(os.getenv('DEVTALK_SYNC_INTERVAL', 300)))
+
 if __name__ == '__main__':
 	port = int(os.getenv('DEVTALK_MCP_SERVER_PORT', 5006))
-	app.run(debug=True, host='0.0.0.0', port=port)
+	run_server(app, port, uds_env='DEVTALK_MCP_UDS', on_start=start_background_workers)
@@ -0,0 +1,542 @@
+"""
+Devtalk 미답변 토픽 로컬 저장소 (증분 동기화 + 답변 시각 추적)
+
+- sync(): 미답변 목록(Explorer 쿼리 12 결과)을 topic_id 기준으로 기존 저장분과 비교해
+  새 토픽/내용이 바뀐 토픽만 기록하고, 목록에서 빠진 토픽은 답변된 것으로 표시합니다.
+  답변 시각은 토픽의 첫 답글 작성 시각(fetch_first_reply)을 우선 사용하고, 조회할 수 없으면 감지 시각을 씁니다.
+  답글 없이 목록에서 빠진 토픽(쿼리 기간 밖으로 밀려남 등)은 answered_source='dropped'로 열린 목록에서만 제외합니다.
+- new_since() / aging() / answer_times(): Discourse 호출 없이 로컬 DB만으로 응답
+- record_topic() / record_reply(): 웹훅(devtalk_webhooks)으로 받은 새 토픽/첫 답변을 즉시 반영
+- open_count() / open_list(): 열린 토픽을 메모리 인덱스로 응답 (변경 시에만 목록 재구성, since로 최근 작성분만)
+  columns에는 마지막 동기화의 Explorer 컬럼을 보관해 open_rows()가 같은 모양의 행을 만들 수 있게 합니다.
+
+저장소: SQLite (data/devtalk_topics.sqlite3)
+"""
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS topics (
+    topic_id INTEGER PRIMARY KEY,
+    title TEXT,
+    created_at REAL,
+    first_seen_at REAL NOT NULL,
+    last_seen_at REAL NOT NULL,
+    answered_at REAL,
+    answered_source TEXT,
+    row_hash TEXT NOT NULL,
+    row TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_topics_open ON topics (answered_at, created_at);
+"""
+
+TOPIC_ID_COLUMNS = ('topic_id', 'id', 'topic')
+TITLE_COLUMNS = ('title', 'topic_title', 'fancy_title')
+CREATED_COLUMNS = ('created_at', 'topic_created_at', 'created')
+AUTHOR_COLUMNS = ('username', 'author', 'created_by', 'user')
+
+# 미답변 경과 시간 구간 (라벨, 상한 초)
+AGING_BUCKETS = [
+    ("<1h", 3600),
+    ("1-4h", 4 * 3600),
+    ("4-24h", 24 * 3600),
+    ("1-3d", 3 * 24 * 3600),
+    ("3-7d", 7 * 24 * 3600),
+    (">7d", None),
+]
+# 첫 답변까지 걸린 시간 구간
+ANSWER_TIME_BUCKETS = [
+    ("<30m", 1800),
+    ("30m-2h", 2 * 3600),
+    ("2-8h", 8 * 3600),
+    ("8-24h", 24 * 3600),
+    ("1-3d", 3 * 24 * 3600),
+    (">3d", None),
+]
+
+
+def parse_time(value):
+    """ISO8601 문자열 -> epoch 초 (해석 불가면 None)"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return dt.timestamp()
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+
+def rows_to_topics(data):
+    """
+    Explorer 결과(columns, rows) -> {topic_id: {"title", "created_at", "row"}}
+
+    컬럼 이름으로 토픽 ID/제목/작성 시각을 찾습니다. (없으면 해당 값은 None)
+    """
+    columns = [c.get('name') if isinstance(c, dict) else c for c in (data or {}).get('columns') or []]
+    index = {name: i for i, name in enumerate(columns)}
+
+    def pick(row, names):
+        for name in names:
+            if name in index and index[name] < len(row):
+                return row[index[name]]
+        return None
+
+    topics = {}
+    for row in (data or {}).get('rows') or []:
+        if isinstance(row, dict):
+            record = row
+            topic_id = next((row.get(n) for n in TOPIC_ID_COLUMNS if row.get(n) is not None), None)
+            title = next((row.get(n) for n in TITLE_COLUMNS if row.get(n)), None)
+            created = next((row.get(n) for n in CREATED_COLUMNS if row.get(n)), None)
+        else:
+            values = list(row)
+            record = dict(zip(columns, values))
+            topic_id = pick(values, TOPIC_ID_COLUMNS)
+            title = pick(values, TITLE_COLUMNS)
+            created = pick(values, CREATED_COLUMNS)
+        try:
+            topic_id = int(topic_id)
+        except (TypeError, ValueError):
+            continue
+        topics[topic_id] = {"title": title, "created_at": parse_time(created), "row": record}
+    return topics
+
+
+def row_for_columns(topic, columns, extra=None):
+    """
+    열린 토픽 -> Explorer 컬럼 순서의 행
+
+    동기화로 들어온 토픽은 저장된 원본 행 값을 그대로 쓰고, 웹훅으로만 알게 된 토픽은
+    컬럼 이름(토픽 ID/제목/작성 시각/작성자 별칭, extra)으로 채우며 알 수 없는 값은 None입니다.
+    """
+    row = topic.get("row") if isinstance(topic.get("row"), dict) else {}
+    extra = extra or {}
+    values = []
+    for column in columns:
+        name = column.get('name') if isinstance(column, dict) else column
+        if name in row:
+            values.append(row[name])
+        elif name in TOPIC_ID_COLUMNS:
+            values.append(topic["topic_id"])
+        elif name in TITLE_COLUMNS:
+            values.append(topic["title"])
+        elif name in CREATED_COLUMNS:
+            values.append(_iso(topic["opened_at"]))
+        elif name in AUTHOR_COLUMNS:
+            values.append(topic["author"])
+        else:
+            values.append(extra.get(name))
+    return values
+
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _bucketize(values, buckets):
+    counts = {label: 0 for label, _ in buckets}
+    for value in values:
+        for label, upper in buckets:
+            if upper is None or value < upper:
+                counts[label] += 1
+                break
+    return [{"bucket": label, "count": counts[label]} for label, _ in buckets]
+
+
+class TopicStore:
+    """topic_id별 미답변 토픽 이력 저장소"""
+
+    def __init__(self, db_path, fetch_unanswered, fetch_first_reply=None):
+        """
+        Args:
+            db_path (str): SQLite 파일 경로
+            fetch_unanswered (callable): fn() -> Explorer 결과 dict (columns, rows), 실패 시 예외
+            fetch_first_reply (callable|None): fn(topic_id) -> 첫 답글 작성 epoch 초 또는 None
+        """
+        self.db_path = db_path
+        self.fetch_unanswered = fetch_unanswered
+        self.fetch_first_reply = fetch_first_reply
+        self.synced_at = None
+        self.last_error = None
+        self.last_result = None
+        self._conn = None
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        self._open = None        # topic_id -> 열린 토픽 (메모리 인덱스, 처음 사용할 때 DB에서 적재)
+        self._open_list = None   # 열린 토픽 최신순 정렬 캐시 (열린 토픽이 바뀌면 무효화)
+        self.last_event_at = None
+        self.events_applied = 0
+        self.columns = None      # 마지막 동기화의 Explorer 컬럼 (open_rows 행 모양)
+
+    def _db(self):
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+                    conn.row_factory = sqlite3.Row
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    conn.executescript(SCHEMA)
+                    self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _to_dict(row, now=None):
+        now = now or time.time()
+        opened = row["created_at"] or row["first_seen_at"]
+        out = {
+            "topic_id": row["topic_id"],
+            "title": row["title"],
+            "created_at": _iso(row["created_at"]),
+            "first_seen_at": _iso(row["first_seen_at"]),
+            "answered_at": _iso(row["answered_at"]),
+            "answered_source": row["answered_source"],
+        }
+        if row["answered_at"]:
+            out["time_to_first_answer_seconds"] = round(max(0.0, row["answered_at"] - opened))
+        else:
+            out["age_seconds"] = round(max(0.0, now - opened))
+        return out
+
+    def sync(self):
+        """
+        미답변 목록을 받아 변경분만 반영
+
+        Returns:
+            dict: {"success", "new", "changed", "answered", "reopened", "open"}
+        """
+        with self._sync_lock:
+            started = time.time()
+            data = self.fetch_unanswered()
+            fetched = rows_to_topics(data)
+            self.columns = list((data or {}).get('columns') or []) or self.columns
+            now = time.time()
+            db = self._db()
+            with self._lock:
+                existing = {
+                    row["topic_id"]: row
+                    for row in db.execute("SELECT topic_id, row_hash, answered_at, answered_source, last_seen_at FROM topics").fetchall()
+                }
+            new, changed, reopened, unchanged = [], [], [], []
+            for topic_id, topic in fetched.items():
+                row_json = json.dumps(topic["row"], ensure_ascii=False, sort_keys=True, default=str)
+                row_hash = hashlib.sha1(row_json.encode('utf-8')).hexdigest()
+                known = existing.get(topic_id)
+                if known is None:
+                    new.append((topic_id, topic, row_json, row_hash))
+                elif known["answered_source"] == 'webhook' and known["last_seen_at"] >= started:
+                    # 조회 도중 웹훅으로 답변된 토픽은 다시 열지 않음
+                    unchanged.append(topic_id)
+                elif known["answered_at"] is not None or known["answered_source"] is not None:
+                    reopened.append((topic_id, topic, row_json, row_hash))
+                elif known["row_hash"] != row_hash:
+                    changed.append((topic_id, topic, row_json, row_hash))
+                else:
+                    unchanged.append(topic_id)
+            gone = [
+                tid for tid, row in existing.items()
+                if row["answered_at"] is None and row["answered_source"] is None and tid not in fetched
+            ]
+
+            # 목록에서 빠진 토픽: 첫 답글 시각 조회 (조회 실패면 감지 시각, 답글이 없으면 dropped)
+            answered = []
+            dropped = []
+            for topic_id in gone:
+                answered_at, source = now, "detected"
+                if self.fetch_first_reply is not None:
+                    try:
+                        reply_at = self.fetch_first_reply(topic_id)
+                        if reply_at:
+                            answered_at, source = reply_at, "first_reply"
+                        else:
+                            dropped.append(topic_id)
+                            continue
+                    except Exception as e:
+                        print(f"[devtalk_topics] first reply lookup failed for {topic_id}:", e)
+                answered.append((answered_at, source, topic_id))
+
+            with self._lock:
+                db.execute("BEGIN")
+                try:
+                    for topic_id, topic, row_json, row_hash in new:
+                        db.execute(
+                            "INSERT OR IGNORE INTO topics (topic_id, title, created_at, first_seen_at, last_seen_at, row_hash, row)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (topic_id, topic["title"], topic["created_at"], now, now, row_hash, row_json)
+                        )
+                    # 스냅샷 이후(조회 도중) 웹훅으로 답변된 토픽은 답변 상태를 지우지 않고 내용만 갱신
+                    webhook_answered = "answered_source = 'webhook' AND last_seen_at >= ?"
+                    for topic_id, topic, row_json, row_hash in changed + reopened:
+                        db.execute(
+                            "UPDATE topics SET title = ?, created_at = COALESCE(?, created_at), last_seen_at = ?,"
+                            " answered_at = NULL, answered_source = NULL, row_hash = ?, row = ?"
+                            f" WHERE topic_id = ? AND NOT ({webhook_answered})",
+                            (topic["title"], topic["created_at"], now, row_hash, row_json, topic_id, started)
+                        )
+                        db.execute(
+                            "UPDATE topics SET title = ?, created_at = COALESCE(?, created_at), row_hash = ?, row = ?"
+                            f" WHERE topic_id = ? AND {webhook_answered}",
+                            (topic["title"], topic["created_at"], row_hash, row_json, topic_id, started)
+                        )
+                    if unchanged:
+                        db.executemany("UPDATE topics SET last_seen_at = ? WHERE topic_id = ?",
+                                       [(now, tid) for tid in unchanged])
+                    # 목록에서 빠진 토픽도 그사이 웹훅이 기록한 답변 시각은 유지
+                    db.executemany("UPDATE topics SET answered_at = ?, answered_source = ?"
+                                   " WHERE topic_id = ? AND answered_source IS NULL", answered)
+                    db.executemany("UPDATE topics SET answered_source = 'dropped' WHERE topic_id = ? AND answered_source IS NULL",
+                                   [(tid,) for tid in dropped])
+                    db.execute("COMMIT")
+                except Exception:
+                    db.execute("ROLLBACK")
+                    raise
+                self.synced_at = datetime.now().isoformat()
+                self.last_error = None
+                self._open = None
+            result = {
+                "success": True,
+                "new": len(new),
+                "changed": len(changed),
+                "answered": len(answered),
+                "dropped": len(dropped),
+                "reopened": len(reopened),
+                "open": len(fetched),
+                "synced_at": self.synced_at
+            }
+            self.last_result = result
+            if new or changed or answered or dropped or reopened:
+                print(f"[devtalk_topics] synced: +{len(new)} ~{len(changed)} answered {len(answered)} "
+                      f"dropped {len(dropped)} reopened {len(reopened)} (open {len(fetched)})")
+            return result
+
+    def new_since(self, since, limit=100):
+        """since(epoch 초) 이후 작성된(작성 시각을 모르면 처음 본) 토픽, 최신순"""
+        db = self._db()
+        with self._lock:
+            rows = db.execute(
+                "SELECT * FROM topics WHERE COALESCE(created_at, first_seen_at) >= ?"
+                " ORDER BY COALESCE(created_at, first_seen_at) DESC LIMIT ?",
+                (since, limit)
+            ).fetchall()
+            total = db.execute(
+                "SELECT COUNT(*) FROM topics WHERE COALESCE(created_at, first_seen_at) >= ?", (since,)
+            ).fetchone()[0]
+        now = time.time()
+        return {"total": total, "topics": [self._to_dict(row, now) for row in rows]}
+
+    def open_topics(self, topic_ids=None, limit=None):
+        """현재 미답변 토픽 (오래된 순, 원본 행 포함)"""
+        db = self._db()
+        sql = "SELECT * FROM topics WHERE answered_at IS NULL AND answered_source IS NULL"
+        params = []
+        if topic_ids:
+            sql += f" AND topic_id IN ({','.join('?' * len(topic_ids))})"
+            params.extend(int(t) for t in topic_ids)
+        sql += " ORDER BY COALESCE(created_at, first_seen_at)"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = db.execute(sql, params).fetchall()
+        now = time.time()
+        return [{**self._to_dict(row, now), "row": json.loads(row["row"])} for row in rows]
+
+    def _open_index(self):
+        """열린 토픽 메모리 인덱스 (호출 측에서 _lock 보유)"""
+        if self._open is None:
+            rows = self._db().execute(
+                "SELECT topic_id, title, created_at, first_seen_at, row FROM topics"
+                " WHERE answered_at IS NULL AND answered_source IS NULL"
+            ).fetchall()
+            self._open = {}
+            for row in rows:
+                record = json.loads(row["row"])
+                author = next((record.get(n) for n in AUTHOR_COLUMNS if isinstance(record, dict) and record.get(n)), None)
+                self._open[row["topic_id"]] = {
+                    "topic_id": row["topic_id"],
+                    "title": row["title"],
+                    "opened_at": row["created_at"] or row["first_seen_at"],
+                    "author": author if isinstance(author, str) else None,
+                    "row": record
+                }
+            self._open_list = None
+        return self._open
+
+    def _sorted_open(self, since=None):
+        """열린 토픽 최신순 (since epoch 초 이후 작성분만, 호출 측에서 _lock 보유)"""
+        index = self._open_index()
+        if self._open_list is None:
+            self._open_list = sorted(index.values(), key=lambda t: t["opened_at"], reverse=True)
+        if since is None:
+            return self._open_list
+        return list(itertools.takewhile(lambda t: t["opened_at"] >= since, self._open_list))
+
+    def open_count(self, since=None):
+        with self._lock:
+            return len(self._sorted_open(since))
+
+    def open_list(self, since=None):
+        """열린 토픽 목록 (최신순, 변경이 없으면 이전 정렬 재사용)"""
+        with self._lock:
+            return [
+                {"topic_id": t["topic_id"], "title": t["title"], "created_at": _iso(t["opened_at"]), "author": t["author"]}
+                for t in self._sorted_open(since)
+            ]
+
+    def open_rows(self, since=None, extra=None, default_columns=None):
+        """
+        열린 토픽을 마지막 동기화의 Explorer 컬럼 모양으로 -> {"columns", "rows"}
+
+        Args:
+            since (float|None): 이 시각(epoch 초) 이후 작성분만
+            extra (callable|None): fn(topic) -> {컬럼 이름: 값}, 저장된 행에 없는 컬럼(url 등) 채우기
+            default_columns (list|None): 아직 동기화 전이라 컬럼을 모를 때 쓸 컬럼
+        """
+        with self._lock:
+            topics = list(self._sorted_open(since))
+            columns = list(self.columns or default_columns or [])
+        return {
+            "columns": columns,
+            "rows": [row_for_columns(t, columns, extra(t) if extra else None) for t in topics]
+        }
+
+    def record_topic(self, topic_id, title, created_at, row, author=None):
+        """
+        웹훅으로 받은 새 토픽 추가
+
+        Returns:
+            bool: 새로 열린 목록에 추가했으면 True (이미 알고 있거나 답변된 토픽이면 False)
+        """
+        now = time.time()
+        row_json = json.dumps(row, ensure_ascii=False, sort_keys=True, default=str)
+        row_hash = hashlib.sha1(row_json.encode('utf-8')).hexdigest()
+        db = self._db()
+        with self._lock:
+            self.last_event_at = datetime.now().isoformat()
+            index = self._open_index()
+            if db.execute("SELECT 1 FROM topics WHERE topic_id = ?", (topic_id,)).fetchone():
+                return False
+            db.execute(
+                "INSERT INTO topics (topic_id, title, created_at, first_seen_at, last_seen_at, row_hash, row)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (topic_id, title, created_at, now, now, row_hash, row_json)
+            )
+            index[topic_id] = {"topic_id": topic_id, "title": title, "opened_at": created_at or now, "author": author, "row": row}
+            self._open_list = None
+            self.events_applied += 1
+            return True
+
+    def record_reply(self, topic_id, answered_at, username=None):
+        """
+        웹훅으로 받은 답글 반영 (토픽 작성자 본인의 답글은 답변으로 보지 않음)
+
+        Returns:
+            bool: 열린 토픽을 답변됨으로 바꿨으면 True
+        """
+        db = self._db()
+        with self._lock:
+            self.last_event_at = datetime.now().isoformat()
+            index = self._open_index()
+            topic = index.get(topic_id)
+            if topic is None or (username and username == topic["author"]):
+                return False
+            db.execute(
+                "UPDATE topics SET answered_at = ?, answered_source = 'webhook', last_seen_at = ? WHERE topic_id = ?",
+                (answered_at or time.time(), time.time(), topic_id)
+            )
+            del index[topic_id]
+            self._open_list = None
+            self.events_applied += 1
+            return True
+
+    def aging(self):
+        """현재 미답변 토픽의 경과 시간 구간별 분포"""
+        db = self._db()
+        with self._lock:
+            rows = db.execute(
+                "SELECT * FROM topics WHERE answered_at IS NULL AND answered_source IS NULL"
+                " ORDER BY COALESCE(created_at, first_seen_at)"
+            ).fetchall()
+        now = time.time()
+        ages = [now - (row["created_at"] or row["first_seen_at"]) for row in rows]
+        oldest = self._to_dict(rows[0], now) if rows else None
+        return {
+            "open": len(rows),
+            "buckets": _bucketize(ages, AGING_BUCKETS),
+            "median_age_seconds": round(_percentile(sorted(ages), 50)) if ages else None,
+            "oldest": oldest
+        }
+
+    def answer_times(self, since=None):
+        """답변된 토픽의 첫 답변까지 걸린 시간 분포 (since 이후 답변된 것만)"""
+        db = self._db()
+        with self._lock:
+            rows = db.execute(
+                "SELECT answered_at - COALESCE(created_at, first_seen_at) AS took, answered_source FROM topics"
+                " WHERE answered_at IS NOT NULL AND answered_at >= ?",
+                (since or 0,)
+            ).fetchall()
+        values = sorted(max(0.0, row["took"]) for row in rows)
+        detected = sum(1 for row in rows if row["answered_source"] == "detected")
+        summary = {
+            "answered": len(values),
+            "buckets": _bucketize(values, ANSWER_TIME_BUCKETS),
+            "detected_only": detected
+        }
+        if values:
+            summary.update({
+                "p50_seconds": round(_percentile(values, 50)),
+                "p90_seconds": round(_percentile(values, 90)),
+                "mean_seconds": round(sum(values) / len(values)),
+                "max_seconds": round(values[-1])
+            })
+        return summary
+
+    def snapshot(self):
+        db = self._db()
+        with self._lock:
+            total, open_count = db.execute(
+                "SELECT COUNT(*), SUM(CASE WHEN answered_at IS NULL AND answered_source IS NULL THEN 1 ELSE 0 END)"
+                " FROM topics"
+            ).fetchone()
+        return {
+            "topics": total,
+            "open": open_count or 0,
+            "synced_at": self.synced_at,
+            "last_event_at": self.last_event_at,
+            "events_applied": self.events_applied,
+            "last_result": self.last_result,
+            "last_error": self.last_error
+        }
+
+    def _sync_loop(self, interval):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                self.last_error = str(e)
+                print("[devtalk_topics] sync error:", e)
+            time.sleep(interval)
+
+    def start(self, interval):
+        """interval초마다 백그라운드 동기화 (중복 호출 무시)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._sync_loop, args=(interval,), name='devtalk-topic-sync', daemon=True)
+        self._thread.start()
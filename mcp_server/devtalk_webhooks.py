@@ -0,0 +1,118 @@
+"""
+Devtalk(Discourse) 웹훅 처리 - 서명 검증 + 미답변 목록 증분 반영
+
+Discourse 웹훅 요청:
+- 헤더 X-Discourse-Event: topic_created, post_created, ... (그 외 이벤트는 무시)
+- 헤더 X-Discourse-Event-Signature: "sha256=" + HMAC-SHA256(웹훅 secret, 본문 원문) hex
+- 본문: {"topic": {...}} 또는 {"post": {...}}
+
+반영 규칙 (TopicStore 메모리 목록 + SQLite):
+- topic_created: 미답변 목록에 추가 (개인 메시지 제외)
+- post_created:
+  - post_number == 1: topic_created를 못 받은 경우를 위해 토픽 추가로 처리
+  - post_number > 1 이고 작성자가 토픽 작성자가 아니면: 첫 답변으로 보고 목록에서 제거
+같은 이벤트가 다시 전달되어도 결과는 같습니다. (추가/제거 모두 멱등)
+"""
+import hashlib
+import hmac
+
+from devtalk_topics import parse_time
+
+EVENT_HEADER = 'X-Discourse-Event'
+SIGNATURE_HEADER = 'X-Discourse-Event-Signature'
+HANDLED_EVENTS = ('topic_created', 'post_created')
+
+
+def sign(secret, body):
+    """본문(bytes) 서명 헤더 값"""
+    return "sha256=" + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret, body, header):
+    if not secret or not header:
+        return False
+    return hmac.compare_digest(sign(secret, body), header.strip())
+
+
+def _username(value):
+    if isinstance(value, dict):
+        return value.get('username')
+    return value
+
+
+def topic_from_payload(payload):
+    """topic_created 본문 -> {"topic_id", "title", "created_at", "author", "row"} (개인 메시지/형식 오류는 None)"""
+    topic = (payload or {}).get('topic')
+    if not isinstance(topic, dict) or topic.get('archetype') == 'private_message':
+        return None
+    try:
+        topic_id = int(topic.get('id'))
+    except (TypeError, ValueError):
+        return None
+    author = _username(topic.get('created_by')) or _username((topic.get('details') or {}).get('created_by'))
+    row = {
+        "topic_id": topic_id,
+        "title": topic.get('title') or topic.get('fancy_title'),
+        "created_at": topic.get('created_at'),
+        "username": author,
+        "category_id": topic.get('category_id'),
+        "slug": topic.get('slug')
+    }
+    return {"topic_id": topic_id, "title": row["title"], "created_at": parse_time(topic.get('created_at')),
+            "author": author, "row": row}
+
+
+def post_from_payload(payload):
+    """post_created 본문 -> {"topic_id", "post_number", "username", "created_at", "title"} (형식 오류는 None)"""
+    post = (payload or {}).get('post')
+    if not isinstance(post, dict) or post.get('topic_archetype') == 'private_message':
+        return None
+    try:
+        return {
+            "topic_id": int(post.get('topic_id')),
+            "post_number": int(post.get('post_number') or 0),
+            "username": post.get('username'),
+            "created_at": parse_time(post.get('created_at')),
+            "title": post.get('topic_title')
+        }
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_event(store, event, payload):
+    """
+    웹훅 이벤트 하나를 TopicStore에 반영
+
+    Returns:
+        dict: {"event", "topic_id", "applied", "reason"}
+    """
+    result = {"event": event, "topic_id": None, "applied": False, "reason": None}
+    if event not in HANDLED_EVENTS:
+        result["reason"] = "ignored_event"
+        return result
+
+    if event == 'topic_created':
+        topic = topic_from_payload(payload)
+        if topic is None:
+            result["reason"] = "invalid_or_private"
+            return result
+        result["topic_id"] = topic["topic_id"]
+        result["applied"] = store.record_topic(topic["topic_id"], topic["title"], topic["created_at"],
+                                               topic["row"], author=topic["author"])
+        result["reason"] = "opened" if result["applied"] else "known"
+        return result
+
+    post = post_from_payload(payload)
+    if post is None:
+        result["reason"] = "invalid_or_private"
+        return result
+    result["topic_id"] = post["topic_id"]
+    if post["post_number"] <= 1:
+        row = {"topic_id": post["topic_id"], "title": post["title"], "username": post["username"]}
+        result["applied"] = store.record_topic(post["topic_id"], post["title"], post["created_at"], row,
+                                               author=post["username"])
+        result["reason"] = "opened" if result["applied"] else "known"
+        return result
+    result["applied"] = store.record_reply(post["topic_id"], post["created_at"], post["username"])
+    result["reason"] = "answered" if result["applied"] else "not_open_or_author_reply"
+    return result
@@ -0,0 +1,109 @@
+"""
+조건부 요청(ETag/Last-Modified) 응답 캐시
+
+- ttl초 안의 응답은 업스트림 호출 없이 그대로 사용 (source: cache)
+- ttl이 지나면 저장된 ETag/Last-Modified로 조건부 요청을 보내고, 304면 저장된 본문을 재사용 (source: not_modified)
+  GitHub는 304 응답을 레이트 리밋에서 차감하지 않습니다.
+- 200 응답만 저장하며, 그 외 응답은 그대로 돌려줍니다. (source: fetched)
+- 항목 수가 max_entries를 넘으면 가장 오래 쓰지 않은 항목부터 버립니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class ETagCache:
+    """키 -> (검증자, 본문, Link) LRU 캐시"""
+
+    def __init__(self, ttl=60, max_entries=256):
+        """
+        Args:
+            ttl (float): 조건부 요청 없이 재사용할 시간(초), 0이면 항상 재검증
+            max_entries (int): 최대 항목 수
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> {"etag", "last_modified", "data", "links", "stored_at"}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "not_modified": 0, "fetched": 0}
+
+    def fetch(self, key, request_fn, force=False):
+        """
+        캐시 조회 후 필요하면 (조건부) 요청
+
+        Args:
+            key: 캐시 키 (URL + 파라미터 + 인증 주체 등)
+            request_fn (callable): fn(conditional_headers) -> requests.Response
+            force (bool): True면 ttl과 관계없이 재검증
+        Returns:
+            dict: {"status_code", "data", "links", "source", "text", "age_seconds", "response"}
+                  (response는 업스트림을 호출했을 때의 requests.Response, 캐시 적중이면 None)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and not force and now - entry["stored_at"] < self.ttl:
+            self.stats["hits"] += 1
+            return self._result(200, entry, "cache", now)
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        resp = request_fn(headers)
+        if resp.status_code == 304 and entry is not None:
+            self.stats["not_modified"] += 1
+            with self._lock:
+                entry["stored_at"] = time.time()
+            return {**self._result(200, entry, "not_modified", now), "response": resp}
+
+        self.stats["fetched"] += 1
+        if resp.status_code != 200:
+            return {"status_code": resp.status_code, "data": None, "links": {}, "source": "fetched",
+                    "text": resp.text, "age_seconds": 0.0, "response": resp}
+        entry = {
+            "etag": resp.headers.get('ETag'),
+            "last_modified": resp.headers.get('Last-Modified'),
+            "data": resp.json(),
+            "links": {rel: link.get('url') for rel, link in resp.links.items()},
+            "stored_at": time.time()
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return {**self._result(200, entry, "fetched", entry["stored_at"]), "response": resp}
+
+    @staticmethod
+    def _result(status_code, entry, source, now):
+        return {
+            "status_code": status_code,
+            "data": entry["data"],
+            "links": entry["links"],
+            "source": source,
+            "text": None,
+            "age_seconds": round(max(0.0, now - entry["stored_at"]), 1),
+            "response": None
+        }
+
+    def peek(self, key):
+        """저장된 응답을 재검증 없이 반환 (없으면 None, 예산 소진 시 오래된 응답 제공용)"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return self._result(200, entry, "stale", time.time())
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self):
+        with self._lock:
+            entries = len(self._entries)
+        return {"ttl_seconds": self.ttl, "entries": entries, **self.stats}
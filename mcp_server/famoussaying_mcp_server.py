@@ -3,6 +3,8 @@
 Model Context Protocol을 통해 GPT 에이전트가 오늘의 명언을 조회할 수 있도록 지원
 """
 from flask import Flask, request, jsonify
+from server_runner import run_server
+from mcp_jsonrpc import register_mcp_endpoint
 import os
 import requests
 from datetime import datetime
@@ -56,6 +58,19 @@ class FamousSayingClient:
 # 전역 인스턴스
 famous_saying_client = FamousSayingClient()
 
+# MCP 도구 목록 (parameters: OpenAI/JSON Schema, endpoint: 호출 라우트)
+TOOLS = [
+    {
+        "name": "get_famous_saying",
+        "description": "랜덤 명언 조회 - 오늘의 명언, 명언 알려줘 등의 요청 시 사용",
+        "parameters": {"type": "object", "properties": {}, "required": []},
+        "endpoint": {"method": "GET", "path": "/mcp/famoussaying/get"}
+    }
+]
+
+# 표준 MCP JSON-RPC 엔드포인트 (POST /mcp: initialize, tools/list, tools/call)
+register_mcp_endpoint(app, 'famoussaying_mcp_server', TOOLS)
+
 @app.route('/mcp/famoussaying/get', methods=['GET'])
 def get_famous_saying():
     """
@@ -88,17 +103,9 @@ def health_check():
 @app.route('/mcp/famoussaying/capabilities', methods=['GET'])
 def get_capabilities():
     """MCP 서버가 제공하는 기능 목록"""
-    return jsonify({
-        "tools": [
-            {
-                "name": "get_famous_saying",
-                "description": "랜덤 명언 조회",
-                "method": "GET"
-            }
-        ]
-    }), 200
+    return jsonify({"tools": TOOLS}), 200
 
 if __name__ == '__main__':
     port = int(os.getenv('FAMOUSSAYING_MCP_SERVER_PORT', 5004))
-    app.run(debug=True, host='0.0.0.0', port=port)
+    run_server(app, port, uds_env='FAMOUSSAYING_MCP_UDS')
 
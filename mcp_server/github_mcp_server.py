@@ -5,10 +5,29 @@ GitHub 로컬 MCP 서버 (리포지토리 등 GitHub REST API 기능 래핑)
 - GITHUB_TOKEN: GitHub Personal Access Token (classic or fine-grained)
 - GITHUB_API_BASE: 기본 https://api.github.com
 - GITHUB_MCP_PORT: 기본 5011
+- GITHUB_CACHE_TTL: 같은 요청을 조건부 요청 없이 재사용할 시간(초, 기본 60). 이후에는 If-None-Match로 재검증(304는 레이트 리밋 미차감)
+- GITHUB_FETCH_WORKERS: all_pages 동시 페이지 조회 수 (기본 4)
+- GITHUB_INTERACTIVE_RESERVE: 백그라운드 호출이 쓰지 않고 채팅 호출용으로 남겨 둘 레이트 리밋 (기본 100)
+- GITHUB_REPOS_PATH: 리포 검색 인덱스 저장 파일 (기본 data/github_repos.json)
+- GITHUB_REPO_SYNC_INTERVAL: 리포 검색 인덱스 백그라운드 동기화 주기(초, 기본 900)
+
+레이트 리밋: 모든 GitHub 호출은 rate_budget.RateBudget을 거칩니다. 응답의 X-RateLimit-Remaining/Reset으로 예산을 추적해
+채팅 중 호출(interactive)을 백그라운드 선조회(background)보다 먼저 보내고, 예산이 줄면 백그라운드 호출을 늦추거나 리셋까지 미룹니다.
+예산이 소진되면 캐시된 응답이 있으면 그것을(source: stale), 없으면 429와 재시도 시각을 돌려줍니다.
 """
 import os
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
 from dotenv import load_dotenv
 from flask import Flask, request, jsonify
+from server_runner import run_server
+from mcp_jsonrpc import register_mcp_endpoint
+from etag_cache import ETagCache
+from rate_budget import RateBudget, RateLimitExhausted, INTERACTIVE, BACKGROUND
+from github_repo_index import RepoStore, SORT_KEYS
 import requests
 
 # 프로젝트 루트의 .env 명시 로드
@@ -18,6 +37,73 @@ app = Flask(__name__)
 
 GITHUB_API_BASE = os.getenv('GITHUB_API_BASE', 'https://api.github.com')
 GITHUB_DEFAULT_USER = os.getenv('GITHUB_DEFAULT_USER', '')
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GITHUB_REPOS_PATH = os.getenv('GITHUB_REPOS_PATH', os.path.join(PROJECT_ROOT, 'data', 'github_repos.json'))
+GITHUB_REPO_SYNC_INTERVAL = int(os.getenv('GITHUB_REPO_SYNC_INTERVAL', 900))
+FETCH_WORKERS = int(os.getenv('GITHUB_FETCH_WORKERS', 4))
+MAX_PAGES = 50
+
+# 리포지토리 응답 필드 (simplified) / compact=true일 때 필드
+REPO_FIELDS = ('id', 'name', 'full_name', 'private', 'html_url', 'description', 'language', 'archived', 'pushed_at', 'visibility')
+COMPACT_FIELDS = ('full_name', 'language', 'visibility', 'archived', 'pushed_at')
+
+# GitHub 연결 풀 + 조건부 요청 응답 캐시
+http = requests.Session()
+http.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=max(10, FETCH_WORKERS)))
+http.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=max(10, FETCH_WORKERS)))
+response_cache = ETagCache(ttl=float(os.getenv('GITHUB_CACHE_TTL', 60)), max_entries=512)
+# X-RateLimit-* 기반 호출 예산 (interactive 우선, background 지연)
+rate_budget = RateBudget(
+    reserve=int(os.getenv('GITHUB_INTERACTIVE_RESERVE', 100)),
+    pace_below=float(os.getenv('GITHUB_PACE_BELOW', 0.5))
+)
+
+# MCP 도구 목록 (parameters: OpenAI/JSON Schema, endpoint: 호출 라우트)
+TOOLS = [
+    {
+        "name": "get_github_repos",
+        "description": "GitHub 리포지토리 목록 조회 (인증 사용자 또는 특정 사용자)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "user": {"type": "string", "description": "특정 사용자명 (선택)"},
+                "visibility": {"type": "string", "description": "all|public|private (선택)"},
+                "affiliation": {"type": "string", "description": "owner,collaborator,organization_member (선택)"},
+                "per_page": {"type": "integer", "description": "페이지당 개수 (선택)"},
+                "page": {"type": "integer", "description": "페이지 번호 (선택)"},
+                "all_pages": {"type": "boolean", "description": "true면 모든 페이지를 모아서 반환"},
+                "compact": {"type": "boolean", "description": "true면 full_name, language, visibility, archived, pushed_at만 반환"}
+            },
+            "required": []
+        },
+        "endpoint": {"method": "GET", "path": "/mcp/github/repos"}
+    },
+    {
+        "name": "search_github_repos",
+        "description": "내 GitHub 리포지토리 검색 (로컬 인덱스, 이름/언어/보관/공개 여부/최근 push 기간 필터 + 정렬 + 페이지)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "리포 이름(full_name) 부분 일치 (선택)"},
+                "language": {"type": "string", "description": "주 언어, 대소문자 무시 (예: Python) (선택)"},
+                "archived": {"type": "boolean", "description": "true면 보관된 리포만, false면 보관되지 않은 리포만 (선택)"},
+                "visibility": {"type": "string", "description": "public|private|internal (선택)"},
+                "pushed_after": {"type": "string", "description": "이 시각 이후 push (YYYY-MM-DD 또는 ISO 8601) (선택)"},
+                "pushed_before": {"type": "string", "description": "이 시각 이전 push (YYYY-MM-DD 또는 ISO 8601) (선택)"},
+                "pushed_within_days": {"type": "integer", "description": "최근 N일 안에 push된 리포 (선택)"},
+                "sort": {"type": "string", "description": "pushed_at|updated_at|name|stars (기본 pushed_at)"},
+                "order": {"type": "string", "description": "asc|desc (기본: name은 asc, 나머지는 desc)"},
+                "page": {"type": "integer", "description": "페이지 번호 (기본 1)"},
+                "per_page": {"type": "integer", "description": "페이지당 개수 (기본 20, 최대 100)"}
+            },
+            "required": []
+        },
+        "endpoint": {"method": "GET", "path": "/mcp/github/repos/search"}
+    }
+]
+
+# 표준 MCP JSON-RPC 엔드포인트 (POST /mcp: initialize, tools/list, tools/call)
+register_mcp_endpoint(app, 'github_mcp_server', TOOLS)
 
 # GitHub 인증 헤더 생성 (로컬 MCP 서버 내부용)
 def auth_headers():
@@ -41,6 +127,10 @@ def auth_headers():
 def health():
     return jsonify({"status": "healthy", "service": "github_mcp_server"}), 200
 
+@app.route('/mcp/github/capabilities', methods=['GET'])
+def capabilities():
+    return jsonify({"tools": TOOLS}), 200
+
 @app.route('/mcp/github/token-status', methods=['GET'])
 def token_status():
     token = os.getenv('GITHUB_TOKEN', '')
@@ -51,12 +141,98 @@ def token_status():
             kind = 'classic'
         else:
             kind = 'fine_grained_or_other'
+    # refresh=true면 /rate_limit로 예산 갱신 (이 호출은 레이트 리밋에서 차감되지 않음)
+    if (request.args.get('refresh') or '').lower() in ('1', 'true', 'yes') or rate_budget.remaining is None:
+        try:
+            resp = http.get(f"{GITHUB_API_BASE}/rate_limit", headers=auth_headers(), timeout=10)
+            rate_budget.update(resp.headers, resp.status_code)
+        except requests.RequestException as e:
+            print("[github_mcp_server] rate_limit lookup failed:", e)
     return jsonify({
         "has_token": bool(token),
         "token_kind": kind,
-        "masked": f"{token[:4]}...{token[-4:]}" if token and len(token) >= 8 else None
+        "masked": f"{token[:4]}...{token[-4:]}" if token and len(token) >= 8 else None,
+        "rate_limit": rate_budget.snapshot()
     }), 200
 
+def simplify_repo(repo, fields=REPO_FIELDS):
+    """GitHub 리포지토리 객체 -> 필요한 필드만"""
+    out = {}
+    for field in fields:
+        if field == 'visibility':
+            out[field] = repo.get('visibility') or ('private' if repo.get('private') else 'public')
+        else:
+            out[field] = repo.get(field)
+    return out
+
+def github_get(url, params, headers, force=False, priority=INTERACTIVE):
+    """
+    GitHub GET (조건부 요청 캐시 + 레이트 리밋 예산 경유) -> ETagCache.fetch 결과 dict
+
+    예산 소진(RateLimitExhausted) 시 캐시된 응답이 있으면 source='stale'로 반환, 없으면 예외를 그대로 올립니다.
+    """
+    identity = hashlib.sha256(headers.get('Authorization', '').encode('utf-8')).hexdigest()[:12]
+    key = (url, tuple(sorted((k, str(v)) for k, v in params.items())), identity)
+    try:
+        result = response_cache.fetch(
+            key,
+            lambda conditional: rate_budget.run(
+                lambda: http.get(url, headers={**headers, **conditional}, params=params, timeout=15),
+                priority=priority
+            ),
+            force=force
+        )
+        # 이번 호출로 소진이 확인된 경우(403/429 + 차단)도 캐시된 응답으로 대체
+        if result["status_code"] in (403, 429) and rate_budget.blocked_until > time.time():
+            raise RateLimitExhausted(rate_budget.blocked_until)
+        return result
+    except RateLimitExhausted:
+        stale = response_cache.peek(key)
+        if stale is None:
+            raise
+        return stale
+
+def rate_limited_response(e):
+    """예산 소진 응답 (429 + 재시도 시각)"""
+    return jsonify({
+        "success": False,
+        "error": "GitHub 레이트 리밋 예산이 소진되었습니다.",
+        "retry_after_seconds": round(e.retry_after) if e.retry_after is not None else None,
+        "rate_limit": rate_budget.snapshot()
+    }), 429
+
+def _page_number(link_url):
+    """Link 헤더 URL의 page 값"""
+    try:
+        return int(parse_qs(urlparse(link_url).query).get('page', [''])[0])
+    except ValueError:
+        return None
+
+def fetch_repo_pages(url, params, headers, all_pages=False, force=False, priority=INTERACTIVE):
+    """
+    리포지토리 목록 조회 (all_pages면 Link 헤더의 last 페이지까지 나머지를 동시에 조회)
+
+    Returns:
+        tuple: (첫 페이지 결과 dict, 리포 목록, 페이지별 source 목록)
+               첫 페이지가 200이 아니면 리포 목록은 None
+    """
+    first = github_get(url, params, headers, force=force, priority=priority)
+    if first["status_code"] != 200:
+        return first, None, [first["source"]]
+    repos = list(first["data"] or [])
+    sources = [first["source"]]
+    last_page = _page_number(first["links"].get('last') or '') if all_pages else None
+    if last_page and last_page > params['page']:
+        pages = range(params['page'] + 1, min(last_page, params['page'] + MAX_PAGES - 1) + 1)
+        with ThreadPoolExecutor(max_workers=max(1, FETCH_WORKERS)) as pool:
+            results = list(pool.map(lambda p: github_get(url, {**params, 'page': p}, headers, force=force, priority=priority), pages))
+        for result in results:
+            if result["status_code"] != 200:
+                return result, None, sources + [result["source"]]
+            repos.extend(result["data"] or [])
+            sources.append(result["source"])
+    return first, repos, sources
+
 # GitHub 리포지토리 목록 엔드포인트 (로컬 MCP 서버)
 @app.route('/mcp/github/repos', methods=['GET'])
 def list_repos():
@@ -66,14 +242,21 @@ def list_repos():
     - user: 특정 사용자 리포 (기본: 인증 사용자 me)
     - visibility: all|public|private (기본 all, 인증 필요 시 private 포함)
     - affiliation: owner,collaborator,organization_member 복합 지정 가능 (쉼표)
-    - per_page: 기본 50
+    - per_page: 기본 50 (all_pages면 기본 100)
     - page: 기본 1
+    - all_pages: true면 Link 헤더를 따라 나머지 페이지를 동시에 조회해 합침
+    - compact: true면 COMPACT_FIELDS만 반환
+    - refresh: true면 캐시 TTL과 관계없이 재검증
     """
     user = request.args.get('user')
     visibility = request.args.get('visibility', 'all')
     affiliation = request.args.get('affiliation')
-    per_page = int(request.args.get('per_page', 50))
+    all_pages = (request.args.get('all_pages') or '').lower() in ('1', 'true', 'yes')
+    compact = (request.args.get('compact') or '').lower() in ('1', 'true', 'yes')
+    force = (request.args.get('refresh') or '').lower() in ('1', 'true', 'yes')
+    per_page = int(request.args.get('per_page', 100 if all_pages else 50))
     page = int(request.args.get('page', 1))
+    fields = COMPACT_FIELDS if compact else REPO_FIELDS
 
     headers = auth_headers()
 
@@ -96,70 +279,168 @@ def list_repos():
             params['affiliation'] = affiliation
 
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=15)
-        if r.status_code == 200:
-            repos = r.json()
-            simplified = [
-                {
-                    'id': repo.get('id'),
-                    'name': repo.get('name'),
-                    'full_name': repo.get('full_name'),
-                    'private': repo.get('private'),
-                    'html_url': repo.get('html_url'),
-                    'description': repo.get('description'),
-                    'language': repo.get('language'),
-                    'archived': repo.get('archived'),
-                    'pushed_at': repo.get('pushed_at'),
-                    'visibility': repo.get('visibility') or ('private' if repo.get('private') else 'public')
-                }
-                for repo in repos
-            ]
-            return jsonify({"success": True, "repos": simplified, "count": len(simplified)}), 200
-        else:
-            # 401 처리: 토큰 문제이거나 미인증. 공개 조회인 경우 기본 사용자로 폴백 시도
-            if r.status_code == 401 and not user and visibility == 'public' and GITHUB_DEFAULT_USER:
-                fallback_url = f"{GITHUB_API_BASE}/users/{GITHUB_DEFAULT_USER}/repos"
-                fb_params = {
-                    'per_page': per_page,
-                    'page': page,
-                    'type': 'public'
-                }
-                fb = requests.get(fallback_url, params=fb_params, timeout=15)
-                if fb.status_code == 200:
-                    repos = fb.json()
-                    simplified = [
-                        {
-                            'id': repo.get('id'),
-                            'name': repo.get('name'),
-                            'full_name': repo.get('full_name'),
-                            'private': repo.get('private'),
-                            'html_url': repo.get('html_url'),
-                            'description': repo.get('description'),
-                            'language': repo.get('language'),
-                            'archived': repo.get('archived'),
-                            'pushed_at': repo.get('pushed_at'),
-                            'visibility': repo.get('visibility') or ('private' if repo.get('private') else 'public')
-                        }
-                        for repo in repos
-                    ]
-                    return jsonify({
-                        "success": True,
-                        "repos": simplified,
-                        "count": len(simplified),
-                        "note": f"no token/auth; fell back to GITHUB_DEFAULT_USER={GITHUB_DEFAULT_USER}"
-                    }), 200
+        first, repos, sources = fetch_repo_pages(url, params, headers, all_pages=all_pages, force=force)
+        note = None
+        # 401 처리: 토큰 문제이거나 미인증. 공개 조회인 경우 기본 사용자로 폴백 시도
+        if repos is None and first["status_code"] == 401 and not user and visibility == 'public' and GITHUB_DEFAULT_USER:
+            fallback_url = f"{GITHUB_API_BASE}/users/{GITHUB_DEFAULT_USER}/repos"
+            fb_params = {
+                'per_page': per_page,
+                'page': page,
+                'type': 'public'
+            }
+            fb_headers = {k: v for k, v in headers.items() if k != 'Authorization'}
+            fb_first, fb_repos, fb_sources = fetch_repo_pages(fallback_url, fb_params, fb_headers, all_pages=all_pages, force=force)
+            if fb_repos is not None:
+                first, repos, sources = fb_first, fb_repos, fb_sources
+                note = f"no token/auth; fell back to GITHUB_DEFAULT_USER={GITHUB_DEFAULT_USER}"
+        if repos is None:
             return jsonify({
                 "success": False,
-                "status_code": r.status_code,
-                "error": r.text
-            }), r.status_code
+                "status_code": first["status_code"],
+                "error": first["text"]
+            }), first["status_code"]
+
+        # 동시 조회 중 페이지 경계가 밀리면 같은 리포가 두 번 올 수 있으므로 id로 중복 제거
+        seen = set()
+        simplified = []
+        for repo in repos:
+            if repo.get('id') in seen:
+                continue
+            seen.add(repo.get('id'))
+            simplified.append(simplify_repo(repo, fields))
+        response = {
+            "success": True,
+            "repos": simplified,
+            "count": len(simplified),
+            "pages": len(sources),
+            "cache": {
+                "sources": {source: sources.count(source) for source in set(sources)},
+                "age_seconds": first["age_seconds"]
+            }
+        }
+        if note:
+            response["note"] = note
+        return jsonify(response), 200
+    except RateLimitExhausted as e:
+        return rate_limited_response(e)
+    except requests.Timeout:
+        return jsonify({"success": False, "error": "GitHub API 호출 시간 초과"}), 504
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/mcp/github/cache', methods=['GET'])
+def cache_status():
+    """조건부 요청 응답 캐시 상태"""
+    return jsonify({"success": True, **response_cache.snapshot(), "repo_index": repo_store.snapshot()}), 200
+
+def fetch_all_repos(priority=BACKGROUND):
+    """
+    검색 인덱스용 전체 리포 조회 (토큰이 있으면 인증 사용자, 없으면 GITHUB_DEFAULT_USER의 공개 리포)
+
+    조건부 요청 캐시를 거치므로 변경이 없으면 페이지마다 304로 끝납니다.
+    """
+    headers = auth_headers()
+    if 'Authorization' in headers:
+        url = f"{GITHUB_API_BASE}/user/repos"
+        params = {'per_page': 100, 'page': 1, 'visibility': 'all'}
+    elif GITHUB_DEFAULT_USER:
+        url = f"{GITHUB_API_BASE}/users/{GITHUB_DEFAULT_USER}/repos"
+        params = {'per_page': 100, 'page': 1, 'type': 'public'}
+    else:
+        raise RuntimeError("GITHUB_TOKEN 또는 GITHUB_DEFAULT_USER가 설정되지 않았습니다.")
+    first, repos, _ = fetch_repo_pages(url, params, headers, all_pages=True, force=True, priority=priority)
+    if repos is None:
+        raise RuntimeError(f"GitHub repo sync failed: {first['status_code']} {(first['text'] or '')[:200]}")
+    return repos
+
+# 리포 검색 인덱스: 백그라운드(background 우선순위)로 전체 목록을 동기화해 로컬에서 검색
+repo_store = RepoStore(GITHUB_REPOS_PATH, fetch_all=fetch_all_repos)
+
+def _pushed_bound(value):
+    """YYYY-MM-DD / ISO 8601 -> pushed_at과 문자열 비교 가능한 UTC 'YYYY-MM-DDTHH:MM:SSZ' (빈 값이면 None)"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+@app.route('/mcp/github/repos/search', methods=['GET'])
+def search_repos():
+    """로컬 리포 인덱스 검색 (GitHub 호출 없음, 인덱스가 비어 있으면 처음 한 번만 동기화)
+
+    Query params:
+    - name: full_name 부분 일치 (대소문자 무시)
+    - language: 주 언어 (대소문자 무시)
+    - archived: true|false
+    - visibility: public|private|internal
+    - pushed_after / pushed_before: YYYY-MM-DD 또는 ISO 8601
+    - pushed_within_days: 최근 N일 (pushed_after 대신)
+    - sort: pushed_at|updated_at|name|stars (기본 pushed_at)
+    - order: asc|desc
+    - page: 기본 1
+    - per_page: 기본 20 (최대 100)
+    """
+    archived = request.args.get('archived')
+    sort = request.args.get('sort', 'pushed_at')
+    order = request.args.get('order')
+    if sort not in SORT_KEYS:
+        return jsonify({"success": False, "error": f"sort는 {', '.join(SORT_KEYS)} 중 하나여야 합니다."}), 400
+    if order not in (None, 'asc', 'desc'):
+        return jsonify({"success": False, "error": "order는 asc 또는 desc여야 합니다."}), 400
+    try:
+        pushed_after = _pushed_bound(request.args.get('pushed_after'))
+        pushed_before = _pushed_bound(request.args.get('pushed_before'))
+        within_days = request.args.get('pushed_within_days')
+        if within_days:
+            pushed_after = (datetime.now(timezone.utc) - timedelta(days=int(within_days))).strftime('%Y-%m-%dT%H:%M:%SZ')
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 20))
+    except ValueError as e:
+        return jsonify({"success": False, "error": f"잘못된 파라미터: {e}"}), 400
+
+    try:
+        if repo_store.synced_at is None:
+            repo_store.sync(fetch_all=lambda: fetch_all_repos(priority=INTERACTIVE))
+        result = repo_store.search(
+            name=request.args.get('name'),
+            language=request.args.get('language'),
+            archived=None if archived is None else archived.lower() in ('1', 'true', 'yes'),
+            visibility=request.args.get('visibility'),
+            pushed_after=pushed_after,
+            pushed_before=pushed_before,
+            sort=sort,
+            order=order,
+            page=page,
+            per_page=per_page
+        )
+        return jsonify({"success": True, **result, "synced_at": repo_store.synced_at}), 200
+    except RateLimitExhausted as e:
+        return rate_limited_response(e)
     except requests.Timeout:
         return jsonify({"success": False, "error": "GitHub API 호출 시간 초과"}), 504
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/mcp/github/repos/sync', methods=['POST'])
+def sync_repos():
+    """리포 검색 인덱스 즉시 동기화 (interactive 우선순위)"""
+    try:
+        return jsonify(repo_store.sync(fetch_all=lambda: fetch_all_repos(priority=INTERACTIVE))), 200
+    except RateLimitExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        repo_store.last_error = str(e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def start_background_workers():
+    """리포 검색 인덱스 동기화 기동 (토큰 또는 기본 사용자가 있을 때만)"""
+    if os.getenv('GITHUB_TOKEN') or GITHUB_DEFAULT_USER:
+        repo_store.start(GITHUB_REPO_SYNC_INTERVAL)
+
 if __name__ == '__main__':
     port = int(os.getenv('GITHUB_MCP_PORT', 5011))
-    app.run(debug=True, host='0.0.0.0', port=port)
+    run_server(app, port, uds_env='GITHUB_MCP_UDS', on_start=start_background_workers)
 
 
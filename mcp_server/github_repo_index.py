@@ -0,0 +1,218 @@
+"""
+GitHub 리포지토리 로컬 동기화 + 검색 인덱스
+
+- RepoStore.sync(): 사용자 리포 전체(all_pages)를 받아 data/github_repos.json에 저장하고 인덱스를 다시 만듭니다.
+  (id 기준으로 이전 목록과 비교해 추가/변경/삭제 건수를 기록, 변경이 없으면 파일을 다시 쓰지 않음)
+- RepoStore.search(): 이름 부분 일치, 언어, archived/visibility, pushed_at 범위 필터 + 정렬 + 페이지
+  · 언어는 소문자 키 인덱스로 후보를 좁히고, pushed_at 범위는 pushed_at 정렬 배열에서 bisect로 자릅니다.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+# 인덱스에 보관할 필드 / 검색 결과(compact) 필드
+INDEX_FIELDS = ('id', 'name', 'full_name', 'private', 'html_url', 'description', 'language', 'archived', 'fork',
+                'visibility', 'pushed_at', 'updated_at', 'stargazers_count')
+RESULT_FIELDS = ('full_name', 'language', 'visibility', 'archived', 'pushed_at', 'stargazers_count')
+
+# sort 파라미터 -> (정렬 키, 기본 순서 desc 여부)
+SORT_KEYS = {
+    'pushed_at': (lambda r: r.get('pushed_at') or '', True),
+    'updated_at': (lambda r: r.get('updated_at') or '', True),
+    'name': (lambda r: (r.get('name') or '').lower(), False),
+    'stars': (lambda r: r.get('stargazers_count') or 0, True),
+}
+
+
+def to_record(repo):
+    """GitHub 리포 객체 -> 인덱스 레코드"""
+    record = {field: repo.get(field) for field in INDEX_FIELDS}
+    record['visibility'] = repo.get('visibility') or ('private' if repo.get('private') else 'public')
+    return record
+
+
+class RepoIndex:
+    """pushed_at 정렬 배열 + 언어별 후보 목록"""
+
+    def __init__(self, records):
+        self.records = sorted(records, key=lambda r: r.get('pushed_at') or '')
+        self._pushed = [r.get('pushed_at') or '' for r in self.records]
+        self._by_language = {}
+        for record in self.records:
+            self._by_language.setdefault((record.get('language') or '').lower(), []).append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def languages(self):
+        return sorted({r.get('language') for r in self.records if r.get('language')})
+
+    def query(self, name=None, language=None, archived=None, visibility=None, pushed_after=None, pushed_before=None):
+        """필터에 맞는 레코드 (pushed_at 오름차순)"""
+        if language is not None:
+            candidates = self._by_language.get(language.lower(), [])
+        else:
+            lo = bisect_left(self._pushed, pushed_after) if pushed_after else 0
+            hi = bisect_right(self._pushed, pushed_before) if pushed_before else len(self.records)
+            candidates = self.records[lo:hi]
+        needle = (name or '').lower()
+        out = []
+        for record in candidates:
+            pushed = record.get('pushed_at') or ''
+            if pushed_after and pushed < pushed_after:
+                continue
+            if pushed_before and pushed > pushed_before:
+                continue
+            if archived is not None and bool(record.get('archived')) != archived:
+                continue
+            if visibility and record.get('visibility') != visibility:
+                continue
+            if needle and needle not in (record.get('full_name') or record.get('name') or '').lower():
+                continue
+            out.append(record)
+        return out
+
+
+class RepoStore:
+    """리포 목록 로컬 저장소 (파일 영속 + 메모리 인덱스)"""
+
+    def __init__(self, path, fetch_all):
+        """
+        Args:
+            path (str): 저장 파일 경로 (data/github_repos.json)
+            fetch_all (callable): fn() -> GitHub 리포 객체 목록 (실패 시 예외)
+        """
+        self.path = path
+        self.fetch_all = fetch_all
+        self.index = RepoIndex([])
+        self.synced_at = None
+        self.last_error = None
+        self.last_result = None
+        self._lock = threading.Lock()
+        self._sync_seq = 0  # 시작한 동기화 순번
+        self._applied_seq = 0  # 인덱스에 반영된 동기화 순번
+        self._thread = None
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.index = RepoIndex(data.get('repos', []))
+                self.synced_at = data.get('synced_at')
+        except Exception as e:
+            print("[github_repo_index] load error:", e)
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"synced_at": self.synced_at, "repos": self.index.records}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print("[github_repo_index] save error:", e)
+
+    def __len__(self):
+        return len(self.index)
+
+    def sync(self, fetch_all=None):
+        """
+        전체 리포를 받아 인덱스 교체
+
+        Args:
+            fetch_all (callable|None): 이번 동기화에만 쓸 조회 함수 (기본 self.fetch_all)
+        Returns:
+            dict: {"success", "added", "updated", "removed", "total", "synced_at"}
+
+        조회는 락 없이 수행하고 인덱스 교체만 락 안에서 합니다. (백그라운드 동기화가 RateBudget에서 오래 대기해도
+        대화형 동기화/첫 검색이 그 뒤에 막히지 않음) 나중에 시작한 동기화가 먼저 반영됐으면 이 결과는 버립니다.
+        """
+        with self._lock:
+            self._sync_seq += 1
+            seq = self._sync_seq
+        fetched = {}
+        for repo in (fetch_all or self.fetch_all)():
+            if repo.get('id') is not None:
+                fetched[repo['id']] = to_record(repo)
+        with self._lock:
+            if seq < self._applied_seq:
+                return self.last_result
+            self._applied_seq = seq
+            previous = {r['id']: r for r in self.index.records}
+            added = [i for i in fetched if i not in previous]
+            removed = [i for i in previous if i not in fetched]
+            updated = [i for i in fetched if i in previous and fetched[i] != previous[i]]
+            if added or removed or updated:
+                self.index = RepoIndex(list(fetched.values()))
+            self.synced_at = datetime.now().isoformat()
+            self.last_error = None
+            if added or removed or updated or not os.path.exists(self.path):
+                self._save()
+            self.last_result = {"success": True, "added": len(added), "updated": len(updated),
+                                "removed": len(removed), "total": len(fetched), "synced_at": self.synced_at}
+            result = self.last_result
+        if added or removed or updated:
+            print(f"[github_repo_index] synced: +{len(added)} ~{len(updated)} -{len(removed)} (total {len(fetched)})")
+        return result
+
+    def search(self, name=None, language=None, archived=None, visibility=None, pushed_after=None,
+               pushed_before=None, sort='pushed_at', order=None, page=1, per_page=20):
+        """
+        필터 + 정렬 + 페이지
+
+        Returns:
+            dict: {"total", "page", "per_page", "pages", "repos": [RESULT_FIELDS]}
+        """
+        key, default_desc = SORT_KEYS.get(sort, SORT_KEYS['pushed_at'])
+        descending = default_desc if order is None else order == 'desc'
+        with self._lock:
+            index = self.index
+        matched = index.query(name=name, language=language, archived=archived, visibility=visibility,
+                              pushed_after=pushed_after, pushed_before=pushed_before)
+        if sort == 'pushed_at' or sort not in SORT_KEYS:
+            # 이미 pushed_at 오름차순
+            ordered = matched[::-1] if descending else matched
+        else:
+            ordered = sorted(matched, key=key, reverse=descending)
+        page = max(1, page)
+        per_page = max(1, min(100, per_page))
+        start = (page - 1) * per_page
+        return {
+            "total": len(ordered),
+            "page": page,
+            "per_page": per_page,
+            "pages": (len(ordered) + per_page - 1) // per_page,
+            "repos": [{field: r.get(field) for field in RESULT_FIELDS} for r in ordered[start:start + per_page]]
+        }
+
+    def snapshot(self):
+        with self._lock:
+            index = self.index
+        return {
+            "repos": len(index),
+            "languages": index.languages(),
+            "synced_at": self.synced_at,
+            "last_result": self.last_result,
+            "last_error": self.last_error
+        }
+
+    def _sync_loop(self, interval):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                self.last_error = str(e)
+                print("[github_repo_index] sync error:", e)
+            time.sleep(interval)
+
+    def start(self, interval):
+        """interval초마다 백그라운드 동기화 (중복 호출 무시)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._sync_loop, args=(interval,), name='github-repo-sync', daemon=True)
+        self._thread.start()
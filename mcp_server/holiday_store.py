@@ -0,0 +1,221 @@
+"""
+공휴일 로컬 저장소 (여러 해 선조회 + 파일 영속 + 이진 탐색 범위 조회)
+
+- refresh(years): 연도별로 카카오 공휴일 API를 월 단위 창으로 조회해 data/kakao_holidays.json에 저장
+  (대체공휴일, 설날/추석 등 음력 기반 공휴일도 업스트림 공휴일 표 그대로 포함)
+  연도 조회에 실패하면 그 해는 기존 데이터를 유지하고, 백그라운드 갱신은 실패한 연도만 짧은 백오프로 다시 조회합니다.
+- query(start, end): 시작 시각 정렬 배열에서 bisect로 범위 조회
+- covers(start, end): 요청 구간의 모든 연도(KST)가 저장소에 있으면 True
+  (호출 측은 저장소 밖 연도만 업스트림으로 조회)
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+
+def _epoch(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def _utc(dt):
+    return dt.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def kst_year(ts):
+    return datetime.fromtimestamp(ts, KST).year
+
+
+def year_windows(year):
+    """연도(KST)를 월 단위 (from, to) UTC ISO 창으로 분할"""
+    windows = []
+    for month in range(1, 13):
+        first = datetime(year, month, 1, tzinfo=KST)
+        following = datetime(year + (month == 12), month % 12 + 1, 1, tzinfo=KST)
+        windows.append((_utc(first), _utc(following)))
+    return windows
+
+
+class HolidayStore:
+    """연도별 공휴일 표 + 정렬 인덱스"""
+
+    def __init__(self, path, fetch_window):
+        """
+        Args:
+            path (str): 저장 파일 경로 (data/kakao_holidays.json)
+            fetch_window (callable): fn(from_iso, to_iso) -> list[event] (실패 시 예외)
+        """
+        self.path = path
+        self.fetch_window = fetch_window
+        self._by_year = {}
+        self._starts = []
+        self._events = []
+        self._max_span = 0.0
+        self.refreshed_at = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._by_year = {int(y): events for y, events in (data.get('years') or {}).items()}
+                self.refreshed_at = data.get('refreshed_at')
+                self._reindex()
+        except Exception as e:
+            print("[holiday_store] load error:", e)
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"refreshed_at": self.refreshed_at,
+                           "years": {str(y): events for y, events in sorted(self._by_year.items())}},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print("[holiday_store] save error:", e)
+
+    def _reindex(self):
+        """연도별 표를 시작 시각 정렬 배열로 재구성 (호출 측에서 _lock 보유 또는 초기화 중)"""
+        rows = []
+        max_span = 0.0
+        for events in self._by_year.values():
+            for event in events:
+                t = event.get('time') or {}
+                try:
+                    start = _epoch(t['start_at'])
+                    end = _epoch(t.get('end_at') or t['start_at'])
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    continue
+                max_span = max(max_span, end - start)
+                rows.append((start, end, event))
+        rows.sort(key=lambda row: row[0])
+        self._starts = [row[0] for row in rows]
+        self._events = rows
+        self._max_span = max_span
+
+    def years(self):
+        with self._lock:
+            return sorted(self._by_year)
+
+    def covers(self, start, end):
+        with self._lock:
+            years = self._by_year
+            return all(year in years for year in range(kst_year(start), kst_year(max(start, end - 1)) + 1))
+
+    def query(self, start, end):
+        """[start, end)와 겹치는 공휴일/기념일 (시작순)"""
+        with self._lock:
+            # 여러 날에 걸친 항목을 놓치지 않도록 최대 길이만큼 앞에서부터 탐색
+            i = bisect_left(self._starts, start - self._max_span)
+            out = []
+            while i < len(self._events) and self._events[i][0] < end:
+                s, e, event = self._events[i]
+                if e > start or s >= start:
+                    out.append(event)
+                i += 1
+            return out
+
+    def refresh(self, years):
+        """
+        연도별 공휴일 표 갱신
+
+        Returns:
+            dict: {"success", "refreshed": [연도], "failed": {연도: 오류}, "events"}
+        """
+        with self._refresh_lock:
+            refreshed, failed = [], {}
+            fetched = {}
+            for year in years:
+                try:
+                    seen = set()
+                    events = []
+                    for q_from, q_to in year_windows(year):
+                        for event in self.fetch_window(q_from, q_to) or []:
+                            key = (event.get('title'), (event.get('time') or {}).get('start_at'))
+                            if key not in seen:
+                                seen.add(key)
+                                events.append(event)
+                    fetched[year] = events
+                    refreshed.append(year)
+                except Exception as e:
+                    failed[year] = str(e)
+            with self._lock:
+                self._by_year.update(fetched)
+                self._reindex()
+                if refreshed:
+                    self.refreshed_at = datetime.now().isoformat()
+                self.last_error = "; ".join(f"{y}: {err}" for y, err in failed.items()) or None
+                if refreshed:
+                    self._save()
+                total = len(self._events)
+            if refreshed:
+                print(f"[holiday_store] refreshed years {refreshed} ({total} entries)")
+            if failed:
+                print(f"[holiday_store] refresh failed: {self.last_error}")
+            return {"success": not failed, "refreshed": refreshed, "failed": failed, "events": total}
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "years": sorted(self._by_year),
+                "events": len(self._events),
+                "refreshed_at": self.refreshed_at,
+                "last_error": self.last_error
+            }
+
+    def is_fresh(self, years, max_age):
+        """대상 연도가 모두 있고 마지막 갱신이 max_age초 이내면 True"""
+        with self._lock:
+            if not self.refreshed_at or any(year not in self._by_year for year in years):
+                return False
+            refreshed_at = self.refreshed_at
+        try:
+            return (datetime.now() - datetime.fromisoformat(refreshed_at)).total_seconds() < max_age
+        except ValueError:
+            return False
+
+    def _refresh_loop(self, interval, years_fn, retry_delay=60.0, max_retry_delay=3600.0):
+        pending = None  # 실패해 다시 조회할 연도 (None이면 전체 연도 주기 갱신)
+        delay = retry_delay
+        while True:
+            failed = False
+            try:
+                if pending:
+                    pending = sorted(self.refresh(pending)["failed"])
+                else:
+                    years = years_fn()
+                    # 재기동 직후에는 저장된 표가 충분히 새로우면 업스트림 호출 생략
+                    if not self.is_fresh(years, interval):
+                        pending = sorted(self.refresh(years)["failed"])
+                failed = bool(pending)
+            except Exception as e:
+                self.last_error = str(e)
+                print("[holiday_store] refresh error:", e)
+                failed = True
+            if failed:
+                # 실패한 연도(콜드 스타트 포함)는 짧은 백오프로 재시도, 성공 후에만 긴 주기로 대기
+                print(f"[holiday_store] retry in {delay:.0f}s: {pending or 'all years'}")
+                time.sleep(delay)
+                delay = min(delay * 2, max_retry_delay, interval)
+            else:
+                delay = retry_delay
+                time.sleep(interval)
+
+    def start(self, interval, years_fn):
+        """interval초마다 years_fn()이 돌려주는 연도를 백그라운드 갱신 (중복 호출 무시)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._refresh_loop, args=(interval, years_fn),
+                                        name='holiday-refresh', daemon=True)
+        self._thread.start()
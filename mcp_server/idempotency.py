@@ -0,0 +1,91 @@
+"""
+SQLite 기반 멱등성 키 저장소 (일괄 생성/발송 재시도 시 중복 방지)
+
+- begin(key): 처음 보는 키면 'pending'으로 선점하고 ("new", None),
+  이미 성공한 키면 ("done", 저장된 결과), 다른 요청이 처리 중이면 ("pending", None)
+- complete(key, result): 성공 결과 저장 (이후 같은 키는 업스트림 호출 없이 이 결과를 반환)
+- release(key): 실패 시 선점 해제 (재시도가 다시 처리할 수 있게)
+
+키는 ttl초가 지나면 만료됩니다. 처리 중(pending) 상태로 pending_timeout초 넘게 남은 키는
+프로세스 중단으로 버려진 것으로 보고 다시 선점할 수 있습니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    result TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class IdempotencyStore:
+    """멱등성 키 -> 성공 결과 영속 저장소"""
+
+    def __init__(self, db_path, ttl=7 * 24 * 3600, pending_timeout=120):
+        """
+        Args:
+            db_path (str): SQLite 파일 경로
+            ttl (int): 완료된 키 보관 기간(초)
+            pending_timeout (int): 처리 중 키를 버려진 것으로 볼 시간(초)
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.pending_timeout = pending_timeout
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _db(self):
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+                    conn.row_factory = sqlite3.Row
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    conn.executescript(SCHEMA)
+                    conn.execute("DELETE FROM idempotency_keys WHERE updated_at < ?", (time.time() - self.ttl,))
+                    self._conn = conn
+        return self._conn
+
+    def begin(self, key):
+        """
+        키 선점 시도
+
+        Returns:
+            tuple: ("new", None) | ("done", result dict) | ("pending", None)
+        """
+        db = self._db()
+        now = time.time()
+        with self._lock:
+            row = db.execute("SELECT * FROM idempotency_keys WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                if row["status"] == 'done' and row["updated_at"] >= now - self.ttl:
+                    return "done", json.loads(row["result"])
+                if row["status"] == 'pending' and row["updated_at"] >= now - self.pending_timeout:
+                    return "pending", None
+            db.execute(
+                "INSERT OR REPLACE INTO idempotency_keys (key, status, result, created_at, updated_at)"
+                " VALUES (?, 'pending', NULL, ?, ?)",
+                (key, now, now)
+            )
+        return "new", None
+
+    def complete(self, key, result):
+        now = time.time()
+        with self._lock:
+            self._db().execute(
+                "UPDATE idempotency_keys SET status = 'done', result = ?, updated_at = ? WHERE key = ?",
+                (json.dumps(result, ensure_ascii=False), now, key)
+            )
+
+    def release(self, key):
+        with self._lock:
+            self._db().execute("DELETE FROM idempotency_keys WHERE key = ? AND status = 'pending'", (key,))
@@ -0,0 +1,222 @@
+"""
+SQLite 기반 영속 작업 큐 (MCP 서버 비동기 발송용)
+
+- enqueue(): 작업을 디스크에 기록하고 즉시 job dict(job_id 포함)를 반환
+- 워커 스레드 풀이 작업을 하나씩 가져가 kind별 핸들러를 실행
+- 실패 결과가 재시도 대상이면 지수 백오프 후 다시 queued로, 최대 시도 초과 시 failed
+- 작업은 조건부 UPDATE(status = 'queued')로 가져가므로 같은 DB를 여러 프로세스가 써도 한 워커만 실행
+- 프로세스가 중단돼 lease_timeout초 넘게 running으로 남은 작업은 queued로 되돌려 재처리
+  (lease_timeout은 핸들러 최장 실행 시간보다 길게 잡아야 실행 중인 작업을 다른 워커가 가져가지 않음)
+
+작업 상태: queued -> running -> succeeded | failed
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs (status, next_attempt_at);
+"""
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+
+class DurableJobQueue:
+    """kind별 핸들러를 워커 풀에서 실행하는 영속 큐"""
+
+    def __init__(self, db_path, handlers, workers=2, max_attempts=5, backoff=2.0, is_retryable=None, name='job_queue',
+                 lease_timeout=300):
+        """
+        Args:
+            db_path (str): SQLite 파일 경로
+            handlers (dict): kind -> fn(payload) -> dict (결과의 success로 성공 판단)
+            workers (int): 워커 스레드 수
+            max_attempts (int): 최대 시도 횟수
+            backoff (float): 첫 재시도 대기(초), 시도마다 2배
+            is_retryable (callable|None): fn(result) -> bool, 실패 결과의 재시도 여부 (기본: 항상 재시도)
+            name (str): 로그/스레드 이름
+            lease_timeout (float): running 작업을 중단된 것으로 보고 되돌리기까지의 시간(초)
+        """
+        self.db_path = db_path
+        self.handlers = handlers
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.is_retryable = is_retryable or (lambda result: True)
+        self.name = name
+        self.lease_timeout = lease_timeout
+        self._conn = None
+        self._db_lock = threading.RLock()
+        self._wakeup = threading.Condition()
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    # ===== 저장소 =====
+    def _db(self):
+        if self._conn is None:
+            with self._db_lock:
+                if self._conn is None:
+                    os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+                    conn.row_factory = sqlite3.Row
+                    conn.execute('PRAGMA journal_mode=WAL')
+                    conn.executescript(SCHEMA)
+                    self._conn = conn
+                    self._recover_expired()
+        return self._conn
+
+    @staticmethod
+    def _to_dict(row):
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "payload": json.loads(row["payload"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "next_attempt_at": _iso(row["next_attempt_at"]) if row["status"] == 'queued' else None,
+            "created_at": _iso(row["created_at"]),
+            "updated_at": _iso(row["updated_at"]),
+        }
+
+    def enqueue(self, kind, payload):
+        """작업 등록 후 job dict 반환 (워커가 없으면 기동)"""
+        if kind not in self.handlers:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        self.start()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db_lock:
+            self._db().execute(
+                "INSERT INTO jobs (id, kind, payload, status, attempts, next_attempt_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, 'queued', 0, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), now, now, now)
+            )
+        with self._wakeup:
+            self._wakeup.notify()
+        return self.get(job_id)
+
+    def get(self, job_id):
+        """작업 상태 조회 (없으면 None)"""
+        db = self._db()
+        with self._db_lock:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def stats(self):
+        """상태별 작업 수"""
+        db = self._db()
+        with self._db_lock:
+            rows = db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def _recover_expired(self):
+        """lease_timeout이 지난 running 작업(중단된 프로세스가 남긴 작업)을 queued로 되돌림"""
+        with self._db_lock:
+            cursor = self._db().execute(
+                "UPDATE jobs SET status = 'queued', updated_at = ? WHERE status = 'running' AND updated_at < ?",
+                (time.time(), time.time() - self.lease_timeout)
+            )
+        if cursor.rowcount:
+            print(f"[{self.name}] recovered {cursor.rowcount} stale running job(s)")
+
+    def _claim(self):
+        """실행 시각이 된 queued 작업 하나를 running으로 전환해 반환"""
+        db = self._db()
+        self._recover_expired()
+        while True:
+            now = time.time()
+            with self._db_lock:
+                row = db.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' AND next_attempt_at <= ?"
+                    " ORDER BY next_attempt_at, created_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    due = db.execute("SELECT MIN(next_attempt_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+                    return None, (due - now if due else None)
+                # 다른 프로세스가 먼저 가져갔으면 rowcount 0 -> 다음 후보
+                claimed = db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ?"
+                    " WHERE id = ? AND status = 'queued'",
+                    (now, row["id"])
+                ).rowcount
+            if claimed:
+                return row, None
+
+    def _finish(self, job_id, status, result=None, error=None, next_attempt_at=None):
+        now = time.time()
+        with self._db_lock:
+            self._db().execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, next_attempt_at = COALESCE(?, next_attempt_at),"
+                " updated_at = ? WHERE id = ?",
+                (status, json.dumps(result, ensure_ascii=False) if result is not None else None,
+                 error, next_attempt_at, now, job_id)
+            )
+
+    # ===== 워커 =====
+    def _run(self, row):
+        attempts = row["attempts"] + 1
+        try:
+            result = self.handlers[row["kind"]](json.loads(row["payload"]))
+        except Exception as e:
+            result = {"success": False, "error": f"알 수 없는 오류: {str(e)}"}
+        if isinstance(result, dict) and result.get("success"):
+            self._finish(row["id"], 'succeeded', result=result)
+            return
+        error = (result or {}).get("error") if isinstance(result, dict) else str(result)
+        if attempts < self.max_attempts and self.is_retryable(result or {}):
+            delay = self.backoff * (2 ** (attempts - 1))
+            self._finish(row["id"], 'queued', result=result, error=error, next_attempt_at=time.time() + delay)
+            print(f"[{self.name}] job {row['id']} retry in {delay:.1f}s (attempt {attempts}): {error}")
+        else:
+            self._finish(row["id"], 'failed', result=result, error=error)
+            print(f"[{self.name}] job {row['id']} failed after {attempts} attempt(s): {error}")
+
+    def _worker_loop(self):
+        while True:
+            # 조회와 대기를 같은 Condition 안에서 수행해 enqueue 알림 유실 방지
+            with self._wakeup:
+                try:
+                    row, wait = self._claim()
+                except Exception as e:
+                    print(f"[{self.name}] claim error:", e)
+                    row, wait = None, 1.0
+                if row is None:
+                    self._wakeup.wait(timeout=min(wait, 5.0) if wait is not None else 5.0)
+                    continue
+            self._run(row)
+
+    def start(self):
+        """워커 스레드 기동 (중복 호출 무시)"""
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            self._db()
+            for i in range(max(1, self.workers)):
+                t = threading.Thread(target=self._worker_loop, name=f"{self.name}-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
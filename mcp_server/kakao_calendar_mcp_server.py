@@ -4,7 +4,12 @@
 제공 기능:
 - POST /mcp/kakao-calendar/create/calendar  (사용자 서브 캘린더 생성)
 - POST /mcp/kakao-calendar/create/event     (사용자 일정 생성)
-- GET  /mcp/kakao-calendar/holidays         (공휴일/기념일 조회 - Admin Key 사용)
+- POST /mcp/kakao-calendar/create/events-bulk (간단 일정 일괄 생성 - 동시 처리, 멱등성 키)
+- GET  /mcp/kakao-calendar/holidays         (공휴일/기념일 조회 - 로컬 공휴일 표, 범위 밖 연도만 Admin Key로 업스트림)
+- POST /mcp/kakao-calendar/holidays/refresh (공휴일 표 즉시 갱신)
+- GET  /mcp/kakao-calendar/events           (일정 조회 - calendar_id별 구간 캐시)
+- GET  /mcp/kakao-calendar/cache            (일정 캐시 상태)
+- GET  /mcp/kakao-calendar/free-slots       (여러 캘린더 빈 시간 후보 - 근무 시간/공휴일 반영)
 - GET  /mcp/kakao-calendar/health
 - GET  /mcp/kakao-calendar/capabilities
 
@@ -13,11 +18,29 @@
 - KAKAO_ACCESS_TOKEN (사용자 API용 Bearer 액세스 토큰)
 - KAKAO_ADMIN_KEY    (공휴일 API용 KakaoAK {ADMIN_KEY})
 - KAKAO_CAL_MCP_PORT (기본 5012)
+- KAKAO_CAL_EVENT_CACHE_TTL (기본 300초, 0이면 캐시 사용 안 함)
+- KAKAO_CAL_WORK_START / KAKAO_CAL_WORK_END (빈 시간 계산 기본 근무 시간, 기본 09:00 / 18:00 KST)
+- KAKAO_CAL_BULK_WORKERS / KAKAO_CAL_BULK_RATE (일괄 생성 동시 호출 수 4, 초당 호출 수 5)
+- KAKAO_CAL_BULK_MAX_EVENTS (일괄 생성 한 요청의 최대 항목 수, 기본 40)
+- KAKAO_CAL_IDEMPOTENCY_PATH / KAKAO_CAL_IDEMPOTENCY_TTL (기본 data/kakao_calendar_idempotency.sqlite3, 7일)
+- KAKAO_HOLIDAYS_PATH (기본 data/kakao_holidays.json)
+- KAKAO_HOLIDAY_YEARS_BEHIND / KAKAO_HOLIDAY_YEARS_AHEAD (공휴일 표 연도 범위: 올해 기준 1년 전 ~ 2년 후)
+- KAKAO_HOLIDAY_REFRESH_INTERVAL (공휴일 표 갱신 주기, 기본 604800초)
 """
 import os
 import json
+import hashlib
 from flask import Flask, request, jsonify
+from server_runner import run_server
+from mcp_jsonrpc import register_mcp_endpoint
+from kakao_token_store import token_broker, token_store
+from calendar_cache import EventCache, format_utc, parse_utc
+import calendar_slots
+from idempotency import IdempotencyStore
+from holiday_store import HolidayStore
+from rate_limit import TokenBucket
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -31,27 +54,237 @@ KAKAO_API_BASE_URL = os.getenv('KAKAO_API_BASE_URL', 'https://kapi.kakao.com')
 KAKAO_ACCESS_TOKEN = os.getenv('KAKAO_ACCESS_TOKEN', '')
 KAKAO_ADMIN_KEY = os.getenv('KAKAO_ADMIN_KEY', '')
 
-# kakao_mcp_server와 동일한 토큰 저장소 사용
+# 일정 조회 캐시: 이미 조회한 구간은 TTL 동안 재사용하고 빠진 부분 구간만 업스트림 조회
+event_cache = EventCache(ttl=int(os.getenv('KAKAO_CAL_EVENT_CACHE_TTL', 300)))
+EVENTS_MAX_RANGE_SECONDS = 31 * 24 * 3600  # 카카오 일정 조회 API의 최대 기간
+EVENTS_PAGE_LIMIT = 100
+FREE_SLOTS_MAX_RANGE_DAYS = 92
+
+# kakao_mcp_server와 동일한 토큰 저장소 사용 (kakao_token_store 메모리 캐시)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-TOKEN_STORE_PATH = os.path.join(PROJECT_ROOT, 'data', 'kakao_tokens.json')
+
+# 일정 일괄 생성: 동시 호출 수/초당 호출 수 제한 + 재시도 중복 방지 키 저장소
+# 한 요청의 최대 항목 수: 기본 40건은 초당 5건 기준 약 8초로 클라이언트 타임아웃(15초) 안에 끝남
+BULK_MAX_EVENTS = int(os.getenv('KAKAO_CAL_BULK_MAX_EVENTS', 40))
+BULK_WORKERS = int(os.getenv('KAKAO_CAL_BULK_WORKERS', 4))
+bulk_limiter = TokenBucket(float(os.getenv('KAKAO_CAL_BULK_RATE', 5)))
+bulk_idempotency = IdempotencyStore(
+    os.getenv('KAKAO_CAL_IDEMPOTENCY_PATH') or os.path.join(PROJECT_ROOT, 'data', 'kakao_calendar_idempotency.sqlite3'),
+    ttl=int(os.getenv('KAKAO_CAL_IDEMPOTENCY_TTL', 7 * 24 * 3600))
+)
+
+# MCP 도구 목록 (parameters: OpenAI/JSON Schema, endpoint: 호출 라우트)
+TOOLS = [
+    {
+        "name": "create_kakao_calendar",
+        "description": "카카오 캘린더 - 서브 캘린더 생성",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "color": {"type": "string"},
+                "reminder": {"type": "integer"},
+                "reminder_all_day": {"type": "integer"}
+            },
+            "required": ["name"]
+        },
+        "endpoint": {"method": "POST", "path": "/mcp/kakao-calendar/create/calendar"}
+    },
+    {
+        "name": "create_kakao_calendar_event",
+        "description": "카카오 캘린더 - 일정 생성",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "calendar_id": {"type": "string"},
+                "event": {"type": "object"}
+            },
+            "required": ["calendar_id", "event"]
+        },
+        "endpoint": {"method": "POST", "path": "/mcp/kakao-calendar/create/event"}
+    },
+    {
+        "name": "create_kakao_calendar_event_simple",
+        "description": "카카오 캘린더 - 간단 일정 생성(로컬시간)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "calendar_id": {"type": "string"},
+                "title": {"type": "string"},
+                "start_local": {"type": "string", "description": "YYYY-MM-DD HH:MM (Asia/Seoul)"},
+                "duration_minutes": {"type": "integer"},
+                "description": {"type": "string"},
+                "color": {"type": "string"}
+            },
+            "required": ["calendar_id", "title", "start_local"]
+        },
+        "endpoint": {"method": "POST", "path": "/mcp/kakao-calendar/create/event-simple"}
+    },
+    {
+        "name": "create_kakao_calendar_events_bulk",
+        "description": "카카오 캘린더 - 여러 일정을 한 번에 생성(로컬시간, 항목별 결과 반환). 재시도 시 같은 idempotency_key를 쓰면 중복 생성되지 않음",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "calendar_id": {"type": "string", "description": "항목에 calendar_id가 없을 때 사용할 기본 캘린더"},
+                "idempotency_key": {"type": "string", "description": "일괄 요청 키 (항목 키는 '<키>:<순번>')"},
+                "events": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "calendar_id": {"type": "string"},
+                            "title": {"type": "string"},
+                            "start_local": {"type": "string", "description": "YYYY-MM-DD HH:MM (Asia/Seoul)"},
+                            "duration_minutes": {"type": "integer"},
+                            "description": {"type": "string"},
+                            "color": {"type": "string"},
+                            "idempotency_key": {"type": "string"}
+                        },
+                        "required": ["title", "start_local"]
+                    }
+                }
+            },
+            "required": ["events"]
+        },
+        "endpoint": {"method": "POST", "path": "/mcp/kakao-calendar/create/events-bulk"}
+    },
+    {
+        "name": "get_kakao_calendar_holidays",
+        "description": "카카오 캘린더 - 공휴일/기념일 조회",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "date_from": {"type": "string", "description": "예: 2025-01-01T00:00:00Z"},
+                "date_to": {"type": "string", "description": "예: 2025-01-31T00:00:00Z"}
+            },
+            "required": ["date_from", "date_to"]
+        },
+        "endpoint": {
+            "method": "GET",
+            "path": "/mcp/kakao-calendar/holidays",
+            "param_map": {"date_from": "from", "date_to": "to"}
+        }
+    },
+    {
+        "name": "get_kakao_calendars",
+        "description": "카카오 캘린더 - 사용자/구독 캘린더 목록 조회",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "filter": {"type": "string", "description": "USER|SUBSCRIBE|ALL"}
+            },
+            "required": []
+        },
+        "endpoint": {"method": "GET", "path": "/mcp/kakao-calendar/calendars"}
+    },
+    {
+        "name": "get_kakao_calendar_events",
+        "description": "카카오 캘린더 - 일정 목록 조회",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "calendar_id": {"type": "string"},
+                "date_from": {"type": "string", "description": "ISO8601 UTC e.g. 2025-11-01T00:00:00Z"},
+                "date_to": {"type": "string", "description": "ISO8601 UTC"},
+                "limit": {"type": "integer"}
+            },
+            "required": ["calendar_id"]
+        },
+        "endpoint": {
+            "method": "GET",
+            "path": "/mcp/kakao-calendar/events",
+            "param_map": {"date_from": "from", "date_to": "to"}
+        }
+    },
+    {
+        "name": "find_kakao_calendar_free_slots",
+        "description": "카카오 캘린더 - 여러 캘린더의 일정을 합쳐 근무 시간/공휴일을 고려한 빈 시간 후보 계산 (예: 다음 주 1시간 비는 시간)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "calendar_ids": {"type": "array", "items": {"type": "string"}, "description": "바쁜 시간을 합칠 캘린더 ID 목록"},
+                "date_from": {"type": "string", "description": "ISO8601 UTC (기본: 지금)"},
+                "date_to": {"type": "string", "description": "ISO8601 UTC (기본: 7일 후)"},
+                "duration_minutes": {"type": "integer", "description": "필요한 시간(분), 기본 60"},
+                "work_start": {"type": "string", "description": "근무 시작 HH:MM (KST), 기본 09:00"},
+                "work_end": {"type": "string", "description": "근무 종료 HH:MM (KST), 기본 18:00"},
+                "weekdays": {"type": "string", "description": "허용 요일(월=0), 기본 0-4"},
+                "skip_holidays": {"type": "boolean", "description": "공휴일 제외, 기본 true"},
+                "include_all_day": {"type": "boolean", "description": "종일 일정을 바쁜 시간으로 볼지, 기본 true"},
+                "step_minutes": {"type": "integer", "description": "후보 시작 시각 단위(분), 기본 30"},
+                "limit": {"type": "integer", "description": "후보 최대 개수, 기본 10"}
+            },
+            "required": ["calendar_ids"]
+        },
+        "endpoint": {
+            "method": "GET",
+            "path": "/mcp/kakao-calendar/free-slots",
+            "param_map": {"calendar_ids": "calendar_id", "date_from": "from", "date_to": "to"}
+        }
+    }
+]
+
+# 표준 MCP JSON-RPC 엔드포인트 (POST /mcp: initialize, tools/list, tools/call)
+register_mcp_endpoint(app, 'kakao_calendar_mcp_server', TOOLS)
 
 def load_tokens():
-    try:
-        if os.path.exists(TOKEN_STORE_PATH):
-            with open(TOKEN_STORE_PATH, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {}
+    return token_store.load()
 
 def bearer_headers():
-    tokens = load_tokens()
-    token = tokens.get('access_token') or os.getenv('KAKAO_ACCESS_TOKEN', '')
+    token = token_store.access_token(default=os.getenv('KAKAO_ACCESS_TOKEN', ''))
     return {
         'Authorization': f'Bearer {token}',
         'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8'
     }
 
+def kakao_request(method, url, **kwargs):
+    """
+    사용자 토큰으로 카카오 API 호출. 401이면 공용 토큰 브로커로 갱신 후 1회 재시도
+    (여러 요청이 동시에 401을 받아도 kauth 갱신은 한 번만 수행)
+    """
+    headers = bearer_headers()
+    res = requests.request(method, url, headers=headers, **kwargs)
+    if res.status_code == 401:
+        stale_token = headers['Authorization'][len('Bearer '):]
+        if token_broker.refresh(stale_token=stale_token):
+            res = requests.request(method, url, headers=bearer_headers(), **kwargs)
+    return res
+
+class CalendarUpstreamError(Exception):
+    """카카오 캘린더 API 오류 응답"""
+
+    def __init__(self, status_code, body):
+        super().__init__(f"{status_code} {body}")
+        self.status_code = status_code
+        self.body = body
+
+def fetch_events_range(calendar_id, start, end):
+    """[start, end) 구간 일정을 31일 단위 창과 페이지를 따라 모두 조회 (event_cache의 fetch 함수)"""
+    url = f"{KAKAO_API_BASE_URL}/v2/api/calendar/events"
+    events = []
+    window_start = start
+    while window_start < end:
+        window_end = min(end, window_start + EVENTS_MAX_RANGE_SECONDS)
+        params = {
+            'calendar_id': calendar_id,
+            'from': format_utc(window_start),
+            'to': format_utc(window_end),
+            'limit': EVENTS_PAGE_LIMIT
+        }
+        page_url = url
+        while page_url:
+            res = kakao_request('GET', page_url, params=params, timeout=12)
+            if res.status_code != 200:
+                raise CalendarUpstreamError(res.status_code, res.text)
+            data = res.json()
+            events.extend(data.get('events') or [])
+            # 다음 페이지 URL에는 조회 조건이 포함됨
+            page_url = data.get('next') if data.get('has_next') else None
+            params = None
+        window_start = window_end
+    return events
+
 def admin_headers():
     admin = os.getenv('KAKAO_ADMIN_KEY', '')
     return {
@@ -64,13 +297,7 @@ def health():
 
 @app.route('/mcp/kakao-calendar/capabilities', methods=['GET'])
 def capabilities():
-    return jsonify({
-        "tools": [
-            {"name": "create_kakao_calendar", "description": "사용자 서브 캘린더 생성", "parameters": {"name": "string", "color": "string", "reminder": "number", "reminder_all_day": "number"}},
-            {"name": "create_kakao_calendar_event", "description": "사용자 일정 생성", "parameters": {"calendar_id": "string", "event": "object(JSON)"}},
-            {"name": "get_kakao_calendar_holidays", "description": "공휴일/기념일 조회", "parameters": {"from": "ISO8601", "to": "ISO8601"}}
-        ]
-    }), 200
+    return jsonify({"tools": TOOLS}), 200
 
 @app.route('/mcp/kakao-calendar/create/calendar', methods=['POST'])
 def create_calendar():
@@ -86,7 +313,7 @@ def create_calendar():
         if reminder_all_day is not None: form['reminder_all_day'] = str(reminder_all_day)
 
         url = f"{KAKAO_API_BASE_URL}/v2/api/calendar/create/calendar"
-        res = requests.post(url, headers=bearer_headers(), data=form, timeout=10)
+        res = kakao_request('POST', url, data=form, timeout=10)
         if res.status_code == 200:
             return jsonify({"success": True, **res.json()}), 200
         elif res.status_code == 401:
@@ -158,8 +385,9 @@ def create_event():
             'event': json.dumps(event, ensure_ascii=False)
         }
         url = f"{KAKAO_API_BASE_URL}/v2/api/calendar/create/event"
-        res = requests.post(url, headers=bearer_headers(), data=form, timeout=10)
+        res = kakao_request('POST', url, data=form, timeout=10)
         if res.status_code == 200:
+            event_cache.invalidate_event(calendar_id, event)
             return jsonify({"success": True, **res.json()}), 200
         elif res.status_code == 401:
             try:
@@ -175,6 +403,73 @@ def create_event():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+def normalize_simple_event(body):
+    """간단 일정 입력(title, start_local KST, duration_minutes 등) -> 카카오 event dict
+
+    Returns:
+        tuple: (event, None) 또는 입력 오류 시 (None, 오류 메시지)
+    """
+    from datetime import datetime, timedelta, timezone
+    title = body.get('title')
+    start_local = body.get('start_local')  # Asia/Seoul 기준
+    try:
+        duration_minutes = int(body.get('duration_minutes') or 60)
+    except (TypeError, ValueError):
+        return None, "duration_minutes는 숫자여야 합니다."
+    description = body.get('description')
+    color = body.get('color')
+    if not title or not start_local:
+        return None, "title, start_local은 필수입니다."
+
+    try:
+        # 우선 완전한 형식 시도
+        dt_local = datetime.strptime(start_local, '%Y-%m-%d %H:%M')
+    except ValueError:
+        # 연도 생략 형식 보정: 기본 연도는 올해로
+        try:
+            from datetime import date
+            this_year = date.today().year
+            # 지원: MM-DD HH:MM, M-D HH:MM, MM/DD HH:MM
+            try:
+                dt_partial = datetime.strptime(start_local, '%m-%d %H:%M')
+            except ValueError:
+                dt_partial = datetime.strptime(start_local, '%m/%d %H:%M')
+            dt_local = dt_partial.replace(year=this_year)
+        except Exception:
+            return None, "start_local 형식은 YYYY-MM-DD HH:MM 또는 MM-DD HH:MM 이어야 합니다."
+    KST = timezone(timedelta(hours=9))
+    dt_local_kst = dt_local.replace(tzinfo=KST)
+    dt_utc_start = dt_local_kst.astimezone(timezone.utc)
+    dt_utc_end = dt_utc_start + timedelta(minutes=duration_minutes)
+
+    event = {
+        "title": title,
+        "time": {
+            "start_at": dt_utc_start.isoformat().replace('+00:00', 'Z'),
+            "end_at": dt_utc_end.isoformat().replace('+00:00', 'Z'),
+            "time_zone": "Asia/Seoul",
+            "all_day": False,
+            "lunar": False
+        }
+    }
+    if description:
+        event["description"] = description
+    if color:
+        event["color"] = color
+    return event, None
+
+def submit_event(calendar_id, event):
+    """일정 생성 API 호출 (성공 시 해당 구간 캐시 무효화)"""
+    form = {
+        'calendar_id': calendar_id,
+        'event': json.dumps(event, ensure_ascii=False)
+    }
+    url = f"{KAKAO_API_BASE_URL}/v2/api/calendar/create/event"
+    res = kakao_request('POST', url, data=form, timeout=10)
+    if res.status_code == 200:
+        event_cache.invalidate_event(calendar_id, event)
+    return res
+
 @app.route('/mcp/kakao-calendar/create/event-simple', methods=['POST'])
 def create_event_simple():
     """간단 일정 생성: calendar_id, title, start_local(YYYY-MM-DD HH:MM), duration_minutes(기본 60)
@@ -192,57 +487,13 @@ def create_event_simple():
     try:
         body = request.get_json(silent=True) or {}
         calendar_id = body.get('calendar_id')
-        title = body.get('title')
-        start_local = body.get('start_local')  # Asia/Seoul 기준
-        duration_minutes = int(body.get('duration_minutes') or 60)
-        description = body.get('description')
-        color = body.get('color')
-        if not calendar_id or not title or not start_local:
+        if not calendar_id or not body.get('title') or not body.get('start_local'):
             return jsonify({"success": False, "error": "calendar_id, title, start_local은 필수입니다."}), 400
+        event, error = normalize_simple_event(body)
+        if error:
+            return jsonify({"success": False, "error": error}), 400
 
-        from datetime import datetime, timedelta, timezone
-        try:
-            # 우선 완전한 형식 시도
-            dt_local = datetime.strptime(start_local, '%Y-%m-%d %H:%M')
-        except ValueError:
-            # 연도 생략 형식 보정: 기본 연도는 올해로
-            try:
-                from datetime import date
-                this_year = date.today().year
-                # 지원: MM-DD HH:MM, M-D HH:MM, MM/DD HH:MM
-                try:
-                    dt_partial = datetime.strptime(start_local, '%m-%d %H:%M')
-                except ValueError:
-                    dt_partial = datetime.strptime(start_local, '%m/%d %H:%M')
-                dt_local = dt_partial.replace(year=this_year)
-            except Exception:
-                return jsonify({"success": False, "error": "start_local 형식은 YYYY-MM-DD HH:MM 또는 MM-DD HH:MM 이어야 합니다."}), 400
-        KST = timezone(timedelta(hours=9))
-        dt_local_kst = dt_local.replace(tzinfo=KST)
-        dt_utc_start = dt_local_kst.astimezone(timezone.utc)
-        dt_utc_end = dt_utc_start + timedelta(minutes=duration_minutes)
-
-        event = {
-            "title": title,
-            "time": {
-                "start_at": dt_utc_start.isoformat().replace('+00:00', 'Z'),
-                "end_at": dt_utc_end.isoformat().replace('+00:00', 'Z'),
-                "time_zone": "Asia/Seoul",
-                "all_day": False,
-                "lunar": False
-            }
-        }
-        if description:
-            event["description"] = description
-        if color:
-            event["color"] = color
-
-        form = {
-            'calendar_id': calendar_id,
-            'event': json.dumps(event, ensure_ascii=False)
-        }
-        url = f"{KAKAO_API_BASE_URL}/v2/api/calendar/create/event"
-        res = requests.post(url, headers=bearer_headers(), data=form, timeout=10)
+        res = submit_event(calendar_id, event)
         if res.status_code == 200:
             return jsonify({"success": True, **res.json(), "normalized_event": event}), 200
         elif res.status_code == 401:
@@ -259,6 +510,163 @@ def create_event_simple():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+def _create_bulk_item(index, item, default_calendar_id, batch_key):
+    """일괄 생성 항목 하나 처리 -> 항목 결과 dict (멱등성 키가 있으면 중복 생성 방지)"""
+    result = {"index": index, "title": item.get('title')}
+    calendar_id = item.get('calendar_id') or default_calendar_id
+    if not calendar_id:
+        return {**result, "success": False, "error": "calendar_id는 필수입니다."}
+    event, error = normalize_simple_event(item)
+    if error:
+        return {**result, "success": False, "error": error}
+    result["normalized_event"] = event
+
+    key = item.get('idempotency_key') or (f"{batch_key}:{index}" if batch_key else None)
+    # 같은 키로 다른 일정이 오면(배치 키 재사용, 순서 변경) 중복으로 건너뛰지 않도록 정규화된 일정 해시를 함께 저장
+    event_hash = hashlib.sha256(json.dumps(event, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:24]
+    if key:
+        key = f"{calendar_id}:{key}"
+        result["idempotency_key"] = key
+        state, stored = bulk_idempotency.begin(key)
+        if state == "done":
+            stored = dict(stored)
+            if stored.pop("event_hash", event_hash) != event_hash:
+                return {
+                    **result,
+                    "success": False,
+                    "status_code": 409,
+                    "conflict": True,
+                    "error": "같은 idempotency_key로 다른 일정이 이미 생성되었습니다. 새 키를 사용하세요."
+                }
+            return {**result, **stored, "duplicate": True}
+        if state == "pending":
+            return {**result, "success": False, "error": "같은 idempotency_key 요청이 처리 중입니다.", "retryable": True}
+
+    try:
+        bulk_limiter.acquire()
+        res = submit_event(calendar_id, event)
+        if res.status_code == 200:
+            created = {"success": True, "calendar_id": calendar_id, **res.json()}
+            if key:
+                bulk_idempotency.complete(key, {**created, "event_hash": event_hash})
+            return {**result, **created, "duplicate": False}
+        item_result = {**result, "success": False, "status_code": res.status_code, "error": res.text}
+        if res.status_code == 401:
+            item_result["auth_required"] = True
+        item_result["retryable"] = res.status_code == 429 or res.status_code >= 500
+    except requests.exceptions.RequestException as e:
+        item_result = {**result, "success": False, "error": f"카카오 API 호출 오류: {str(e)}", "retryable": True}
+    except Exception as e:
+        # 응답 파싱 실패 등: 키를 pending으로 남기면 재시도가 pending_timeout 동안 막힘
+        item_result = {**result, "success": False, "error": f"알 수 없는 오류: {str(e)}"}
+    if key:
+        bulk_idempotency.release(key)
+    return item_result
+
+@app.route('/mcp/kakao-calendar/create/events-bulk', methods=['POST'])
+def create_events_bulk():
+    """간단 일정 일괄 생성
+
+    예시 body:
+    {
+      "calendar_id": "user_xxx",            // 항목별 calendar_id가 없을 때 기본값
+      "idempotency_key": "sprint-42",       // 선택: 항목 키는 "sprint-42:<index>"
+      "events": [
+        {"title": "스프린트 계획", "start_local": "2025-11-03 10:00", "duration_minutes": 60},
+        {"title": "회고", "start_local": "2025-11-14 16:00", "idempotency_key": "retro"}
+      ]
+    }
+
+    각 항목은 create_event_simple과 같은 KST -> UTC 변환을 거쳐 레이트 리미터 아래에서 동시에 생성되며,
+    이미 성공한 멱등성 키는 업스트림 호출 없이 이전 결과(duplicate: true)를 돌려줍니다.
+    같은 키로 내용이 다른 일정이 오면 생성하지 않고 항목 오류(status_code: 409, conflict: true)로 돌려줍니다.
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        items = body.get('events')
+        if not isinstance(items, list) or not items:
+            return jsonify({"success": False, "error": "events 목록은 필수입니다."}), 400
+        if len(items) > BULK_MAX_EVENTS:
+            return jsonify({"success": False, "error": f"한 번에 최대 {BULK_MAX_EVENTS}개까지 생성할 수 있습니다."}), 400
+        if not all(isinstance(item, dict) for item in items):
+            return jsonify({"success": False, "error": "events 항목은 객체여야 합니다."}), 400
+        calendar_id = body.get('calendar_id')
+        batch_key = body.get('idempotency_key')
+
+        with ThreadPoolExecutor(max_workers=max(1, min(BULK_WORKERS, len(items)))) as pool:
+            results = list(pool.map(
+                lambda pair: _create_bulk_item(pair[0], pair[1], calendar_id, batch_key),
+                enumerate(items)
+            ))
+
+        created = sum(1 for r in results if r.get("success") and not r.get("duplicate"))
+        duplicates = sum(1 for r in results if r.get("duplicate"))
+        conflicts = sum(1 for r in results if r.get("conflict"))
+        failed = sum(1 for r in results if not r.get("success"))
+        response = {
+            "success": failed == 0,
+            "total": len(results),
+            "created": created,
+            "duplicates": duplicates,
+            "conflicts": conflicts,
+            "failed": failed,
+            "results": results
+        }
+        if any(r.get("auth_required") for r in results):
+            response.update({"auth_required": True, "provider": "kakao"})
+        if failed:
+            print(f"[kakao_calendar_mcp] events-bulk: {failed}/{len(results)} failed")
+        return jsonify(response), 200
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def fetch_holidays(q_from, q_to):
+    """공휴일/기념일 API 호출 (Admin Key)"""
+    params = { 'from': q_from, 'to': q_to }
+    url = f"{KAKAO_API_BASE_URL}/v2/api/calendar/holidays"
+    return requests.get(url, headers=admin_headers(), params=params, timeout=10)
+
+def fetch_holiday_window(q_from, q_to):
+    """holiday_store 갱신용: 구간 공휴일 events (실패 시 CalendarUpstreamError)"""
+    res = fetch_holidays(q_from, q_to)
+    if res.status_code != 200:
+        raise CalendarUpstreamError(res.status_code, res.text)
+    return res.json().get('events') or []
+
+def holiday_years():
+    """공휴일 표에 유지할 연도 목록 (올해 기준)"""
+    this_year = datetime.now().year
+    behind = int(os.getenv('KAKAO_HOLIDAY_YEARS_BEHIND', 1))
+    ahead = int(os.getenv('KAKAO_HOLIDAY_YEARS_AHEAD', 2))
+    return list(range(this_year - behind, this_year + ahead + 1))
+
+def lookup_holidays(q_from, q_to):
+    """
+    공휴일 조회: 요청 구간의 연도가 모두 로컬 표에 있으면 이진 탐색으로 응답, 아니면 업스트림
+
+    Returns:
+        tuple: (status_code, 응답 dict)
+    """
+    try:
+        start, end = parse_utc(q_from), parse_utc(q_to)
+    except (TypeError, ValueError):
+        start = end = None
+    if start is not None and end > start and holiday_store.covers(start, end):
+        return 200, {"success": True, "events": holiday_store.query(start, end), "source": "local"}
+    res = fetch_holidays(q_from, q_to)
+    if res.status_code == 200:
+        return 200, {"success": True, **res.json(), "source": "upstream"}
+    try:
+        print("[kakao_calendar_mcp] holidays error:", res.status_code, res.text)
+    except Exception:
+        pass
+    return res.status_code, {"success": False, "status_code": res.status_code, "error": res.text}
+
+holiday_store = HolidayStore(
+    os.getenv('KAKAO_HOLIDAYS_PATH') or os.path.join(PROJECT_ROOT, 'data', 'kakao_holidays.json'),
+    fetch_window=fetch_holiday_window
+)
+
 @app.route('/mcp/kakao-calendar/holidays', methods=['GET'])
 def get_holidays():
     try:
@@ -266,16 +674,19 @@ def get_holidays():
         q_to = request.args.get('to')
         if not q_from or not q_to:
             return jsonify({"success": False, "error": "from, to 파라미터는 필수입니다."}), 400
-        params = { 'from': q_from, 'to': q_to }
-        url = f"{KAKAO_API_BASE_URL}/v2/api/calendar/holidays"
-        res = requests.get(url, headers=admin_headers(), params=params, timeout=10)
-        if res.status_code == 200:
-            return jsonify({"success": True, **res.json()}), 200
-        try:
-            print("[kakao_calendar_mcp] holidays error:", res.status_code, res.text)
-        except Exception:
-            pass
-        return jsonify({"success": False, "status_code": res.status_code, "error": res.text}), res.status_code
+        status, body = lookup_holidays(q_from, q_to)
+        return jsonify(body), status
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/mcp/kakao-calendar/holidays/refresh', methods=['POST'])
+def refresh_holidays():
+    """공휴일 표 즉시 갱신 (body의 years가 없으면 설정된 연도 범위)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        years = data.get('years') or holiday_years()
+        result = holiday_store.refresh([int(y) for y in years])
+        return jsonify({**result, **holiday_store.snapshot()}), 200 if result["success"] else 502
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -292,7 +703,7 @@ def list_calendars():
         if flt:
             params['filter'] = flt
         url = f"{KAKAO_API_BASE_URL}/v2/api/calendar/calendars"
-        res = requests.get(url, headers=bearer_headers(), params=params, timeout=10)
+        res = kakao_request('GET', url, params=params, timeout=10)
         if res.status_code == 200:
             data = res.json()
             return jsonify({"success": True, **data}), 200
@@ -319,6 +730,10 @@ def list_events():
       - from: ISO8601 (UTC, e.g., 2025-11-01T00:00:00Z)
       - to:   ISO8601 (UTC)
       - limit: 숫자(선택)
+      - refresh: true면 캐시를 무시하고 업스트림 재조회(선택)
+
+    이미 조회한 구간은 event_cache에서 응답하고, 빠진 부분 구간만 업스트림에서 가져옵니다.
+    업스트림이 원본만 돌려준 반복 일정은 로컬에서 전개한 발생(recurring_instance: true)으로 채워집니다.
     """
     try:
         calendar_id = request.args.get('calendar_id')
@@ -327,7 +742,6 @@ def list_events():
         q_limit = request.args.get('limit')
         if not calendar_id:
             return jsonify({"success": False, "error": "calendar_id는 필수입니다."}), 400
-        params = { 'calendar_id': calendar_id }
         # 기본 기간: 현재 달 1일 00:00 KST ~ 다음 달 1일 00:00 KST (UTC Z로 변환)
         if not q_from or not q_to:
             try:
@@ -348,29 +762,163 @@ def list_events():
                     q_to = to_utc
             except Exception:
                 pass
-        if q_from: params['from'] = q_from
-        if q_to: params['to'] = q_to
-        if q_limit: params['limit'] = q_limit
-        url = f"{KAKAO_API_BASE_URL}/v2/api/calendar/events"
-        res = requests.get(url, headers=bearer_headers(), params=params, timeout=12)
-        if res.status_code == 200:
-            return jsonify({"success": True, **res.json()}), 200
-        elif res.status_code == 401:
+        try:
+            start, end = parse_utc(q_from), parse_utc(q_to)
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "from, to는 ISO8601 형식이어야 합니다. (예: 2025-11-01T00:00:00Z)"}), 400
+        if end <= start:
+            return jsonify({"success": False, "error": "to는 from보다 이후여야 합니다."}), 400
+        refresh = (request.args.get('refresh') or '').lower() in ('1', 'true', 'yes')
+        try:
+            events, fetched = event_cache.get_events(calendar_id, start, end, fetch_events_range, refresh=refresh)
+        except CalendarUpstreamError as e:
+            if e.status_code == 401:
+                try:
+                    print("[kakao_calendar_mcp] events 401 body:", e.body)
+                except Exception:
+                    pass
+                return jsonify({"success": False, "error": "카카오톡 API 오류: 401", "auth_required": True, "provider": "kakao", "error_body": e.body}), 401
             try:
-                print("[kakao_calendar_mcp] events 401 body:", res.text)
+                print("[kakao_calendar_mcp] events error:", e.status_code, e.body)
             except Exception:
                 pass
-            return jsonify({"success": False, "error": "카카오톡 API 오류: 401", "auth_required": True, "provider": "kakao", "error_body": res.text}), 401
+            return jsonify({"success": False, "status_code": e.status_code, "error": e.body}), e.status_code
+        has_next = False
+        if q_limit:
+            limit = int(q_limit)
+            has_next = len(events) > limit
+            events = events[:limit]
+        return jsonify({
+            "success": True,
+            "events": events,
+            "has_next": has_next,
+            "cache": {
+                "hit": not fetched,
+                "fetched_ranges": [[format_utc(a), format_utc(b)] for a, b in fetched]
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/mcp/kakao-calendar/free-slots', methods=['GET'])
+def free_slots():
+    """빈 시간 후보 계산
+
+    Query:
+      - calendar_id: 필수, 여러 개면 반복하거나 콤마로 구분
+      - from, to: ISO8601 UTC (기본: 지금 ~ 7일 후, 최대 92일)
+      - duration_minutes: 필요한 시간(분, 기본 60)
+      - work_start, work_end: 근무 시간 HH:MM KST (기본 KAKAO_CAL_WORK_START/END)
+      - weekdays: 허용 요일, 월=0 (기본 0-4)
+      - skip_holidays: 공휴일 제외 (기본 true)
+      - include_all_day: 종일 일정을 바쁜 시간으로 볼지 (기본 true)
+      - step_minutes: 후보 시작 시각 단위 (기본 30)
+      - limit: 후보 최대 개수 (기본 10)
+
+    일정은 event_cache로 가져오고, 겹침 병합과 빈 구간 계산은 로컬에서 수행합니다.
+    """
+    def flag(name, default):
+        value = request.args.get(name)
+        if value is None or value == '':
+            return default
+        return value.lower() in ('1', 'true', 'yes')
+
+    try:
+        calendar_ids = []
+        for value in request.args.getlist('calendar_id'):
+            calendar_ids.extend(c.strip() for c in value.split(',') if c.strip())
+        calendar_ids = list(dict.fromkeys(calendar_ids))
+        if not calendar_ids:
+            return jsonify({"success": False, "error": "calendar_id는 필수입니다."}), 400
         try:
-            print("[kakao_calendar_mcp] events error:", res.status_code, res.text)
-        except Exception:
-            pass
-        return jsonify({"success": False, "status_code": res.status_code, "error": res.text}), res.status_code
+            now = datetime.now().timestamp()
+            start = parse_utc(request.args['from']) if request.args.get('from') else now
+            end = parse_utc(request.args['to']) if request.args.get('to') else start + 7 * 24 * 3600
+            duration = int(request.args.get('duration_minutes') or 60) * 60
+            work_start = calendar_slots.parse_hhmm(request.args.get('work_start') or os.getenv('KAKAO_CAL_WORK_START', '09:00'))
+            work_end = calendar_slots.parse_hhmm(request.args.get('work_end') or os.getenv('KAKAO_CAL_WORK_END', '18:00'))
+            weekdays = calendar_slots.parse_weekdays(request.args.get('weekdays') or '0-4')
+            step = int(request.args.get('step_minutes') or 30) * 60
+            limit = int(request.args.get('limit') or 10)
+        except (TypeError, ValueError) as e:
+            return jsonify({"success": False, "error": f"잘못된 파라미터: {str(e)}"}), 400
+        if end <= start:
+            return jsonify({"success": False, "error": "to는 from보다 이후여야 합니다."}), 400
+        if end - start > FREE_SLOTS_MAX_RANGE_DAYS * 24 * 3600:
+            return jsonify({"success": False, "error": f"조회 기간은 최대 {FREE_SLOTS_MAX_RANGE_DAYS}일입니다."}), 400
+        if duration <= 0 or work_end <= work_start:
+            return jsonify({"success": False, "error": "duration_minutes는 양수, work_end는 work_start 이후여야 합니다."}), 400
+        include_all_day = flag('include_all_day', True)
+
+        # 캘린더별 일정 조회 (캐시에 없는 구간만 업스트림)
+        def load(calendar_id):
+            events, _ = event_cache.get_events(calendar_id, start, end, fetch_events_range)
+            return events
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(4, len(calendar_ids))) as pool:
+                per_calendar = list(pool.map(load, calendar_ids))
+        except CalendarUpstreamError as e:
+            if e.status_code == 401:
+                return jsonify({"success": False, "error": "카카오톡 API 오류: 401", "auth_required": True, "provider": "kakao", "error_body": e.body}), 401
+            return jsonify({"success": False, "status_code": e.status_code, "error": e.body}), e.status_code
+
+        intervals = []
+        for events in per_calendar:
+            for ev in events:
+                span = calendar_slots.event_busy_interval(ev, include_all_day=include_all_day)
+                if span is not None:
+                    intervals.append(span)
+        busy = calendar_slots.merge_busy(intervals)
+
+        holidays = set()
+        warnings = []
+        if flag('skip_holidays', True):
+            status, holiday_body = lookup_holidays(format_utc(start), format_utc(end))
+            if status == 200:
+                holidays = calendar_slots.holiday_dates(holiday_body.get('events'))
+            else:
+                warnings.append(f"공휴일 조회 실패({status}) - 공휴일 미반영")
+
+        windows = calendar_slots.working_windows(start, end, work_start, work_end, weekdays, holidays)
+        blocks = calendar_slots.free_blocks(windows, busy, duration)
+        slots = calendar_slots.candidate_slots(blocks, duration, step, limit)
+
+        to_kst = calendar_slots.to_kst_iso
+        body = {
+            "success": True,
+            "calendar_ids": calendar_ids,
+            "range": {"from": format_utc(start), "to": format_utc(end)},
+            "duration_minutes": duration // 60,
+            "slots": [{"start": to_kst(a), "end": to_kst(b)} for a, b in slots],
+            "free_blocks": [
+                {"start": to_kst(a), "end": to_kst(b), "minutes": int((b - a) // 60)} for a, b in blocks
+            ],
+            "busy_blocks": len(busy),
+            "holidays_excluded": sorted(d.isoformat() for d in holidays if start <= calendar_slots.kst_day_start(d) < end)
+        }
+        if warnings:
+            body["warnings"] = warnings
+        return jsonify(body), 200
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/mcp/kakao-calendar/cache', methods=['GET'])
+def cache_status():
+    """일정 캐시 상태 (캘린더별 coverage 구간, 적중 통계, 공휴일 표)"""
+    return jsonify({"success": True, **event_cache.snapshot(), "holidays": holiday_store.snapshot()}), 200
+
+def start_background_workers():
+    """
+    백그라운드 작업 기동
+    - 만료 전 액세스 토큰 선제 갱신 스케줄러 (kakao_mcp_server와 공용 브로커)
+    - 공휴일 표 선조회/주기 갱신
+    """
+    token_broker.start_scheduler()
+    holiday_store.start(int(os.getenv('KAKAO_HOLIDAY_REFRESH_INTERVAL', 7 * 24 * 3600)), holiday_years)
+
 if __name__ == '__main__':
     port = int(os.getenv('KAKAO_CAL_MCP_PORT', 5012))
-    app.run(debug=True, host='0.0.0.0', port=port)
+    run_server(app, port, uds_env='KAKAO_CAL_MCP_UDS', on_start=start_background_workers)
 
 
@@ -0,0 +1,278 @@
+"""
+카카오톡 친구 목록 로컬 동기화 + 이름 -> UUID 퍼지 인덱스
+
+- FriendStore.sync(): /v1/api/talk/friends를 끝까지 페이지 순회해 data/kakao_friends.json에 저장
+  (이전 목록과 uuid 기준으로 비교해 추가/변경/삭제된 친구만 인덱스에 반영)
+- FriendIndex.search(): 한글 자모 단위 매칭
+  · 완전 일치 / 부분 일치 ("길동" -> "홍길동")
+  · 초성 검색 ("ㅎㄱㄷ" -> "홍길동")
+  · 입력 중인 글자 ("홍길ㄷ" -> "홍길동")
+  · 오타 허용 (자모 편집 거리, "홍길둥" -> "홍길동")
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# 한글 음절 분해 테이블 (호환 자모)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+             'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+HANGUL_BASE, HANGUL_END = 0xAC00, 0xD7A3
+
+FRIENDS_PAGE_LIMIT = 100  # 카카오 친구 목록 API 최대 limit
+
+
+def normalize(text):
+    """소문자 + 공백 제거"""
+    return ''.join((text or '').lower().split())
+
+
+def to_jamo(text):
+    """한글 음절을 초/중/종성 자모열로 분해 (그 외 문자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            offset = code - HANGUL_BASE
+            out.append(CHOSEONG[offset // 588])
+            out.append(JUNGSEONG[(offset % 588) // 28])
+            out.append(JONGSEONG[offset % 28])
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+
+def to_choseong(text):
+    """한글 음절의 초성만 추출 (그 외 문자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+
+def is_choseong_query(text):
+    return bool(text) and all(ch in CHOSEONG for ch in text)
+
+
+def edit_distance(a, b):
+    """Levenshtein 거리"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def _bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)} or ({text} if text else set())
+
+
+class FriendIndex:
+    """닉네임 자모 bigram 역색인 + 점수 계산"""
+
+    def __init__(self):
+        self._entries = {}   # uuid -> {"friend", "name", "jamo", "choseong"}
+        self._postings = {}  # 자모 bigram -> {uuid}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def upsert(self, friend):
+        uuid = friend.get('uuid')
+        if not uuid:
+            return
+        self.remove(uuid)
+        name = normalize(friend.get('profile_nickname'))
+        entry = {"friend": friend, "name": name, "jamo": to_jamo(name), "choseong": to_choseong(name)}
+        self._entries[uuid] = entry
+        for gram in _bigrams(entry["jamo"]) | _bigrams(entry["choseong"]):
+            self._postings.setdefault(gram, set()).add(uuid)
+
+    def remove(self, uuid):
+        entry = self._entries.pop(uuid, None)
+        if entry is None:
+            return
+        for gram in _bigrams(entry["jamo"]) | _bigrams(entry["choseong"]):
+            bucket = self._postings.get(gram)
+            if bucket is not None:
+                bucket.discard(uuid)
+                if not bucket:
+                    del self._postings[gram]
+
+    @staticmethod
+    def _score(query, q_jamo, entry):
+        """(점수, 매칭 방식) - 점수가 0이면 불일치"""
+        name = entry["name"]
+        if not name:
+            return 0.0, None
+        if query == name:
+            return 1.0, "exact"
+        if query in name:
+            return 0.9 + 0.05 * len(query) / len(name), "substring"
+        if is_choseong_query(query) and query in entry["choseong"]:
+            return 0.85, "choseong"
+        if q_jamo in entry["jamo"]:
+            return 0.8, "jamo_prefix"
+        # 자모 편집 거리: 이름 전체와 이름 안의 같은 길이 구간 중 가까운 쪽
+        jamo = entry["jamo"]
+        best = edit_distance(q_jamo, jamo)
+        width = len(q_jamo)
+        for i in range(1, max(1, len(jamo) - width + 1)):
+            best = min(best, edit_distance(q_jamo, jamo[i:i + width]) + 1)
+        similarity = 1.0 - best / max(len(q_jamo), 1)
+        if similarity >= 0.6:
+            return round(0.75 * similarity, 4), "fuzzy"
+        return 0.0, None
+
+    def search(self, query, limit=5):
+        """이름으로 친구 검색 -> 점수 내림차순 [(friend, score, match)]"""
+        query = normalize(query)
+        if not query:
+            return []
+        q_jamo = to_jamo(query)
+        candidates = set()
+        for gram in _bigrams(q_jamo) | _bigrams(query):
+            candidates |= self._postings.get(gram, set())
+        if not candidates:
+            # 한 글자 검색 등 bigram이 없는 경우 전체 대상
+            candidates = set(self._entries)
+        results = []
+        for uuid in candidates:
+            entry = self._entries[uuid]
+            score, match = self._score(query, q_jamo, entry)
+            if score > 0:
+                results.append((entry["friend"], score, match))
+        results.sort(key=lambda r: (-r[1], r[0].get('profile_nickname') or ''))
+        return results[:limit]
+
+
+class FriendStore:
+    """친구 목록 로컬 저장소 (파일 영속 + 메모리 인덱스)"""
+
+    def __init__(self, path, fetch_page):
+        """
+        Args:
+            path (str): 저장 파일 경로 (data/kakao_friends.json)
+            fetch_page (callable): fn(offset, limit) -> get_friends 결과 dict
+        """
+        self.path = path
+        self.fetch_page = fetch_page
+        self.index = FriendIndex()
+        self._friends = {}
+        self.synced_at = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for friend in data.get('friends', []):
+                    self._friends[friend['uuid']] = friend
+                    self.index.upsert(friend)
+                self.synced_at = data.get('synced_at')
+        except Exception as e:
+            print("[kakao_friends] load error:", e)
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"synced_at": self.synced_at, "friends": list(self._friends.values())},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print("[kakao_friends] save error:", e)
+
+    def __len__(self):
+        return len(self._friends)
+
+    def sync(self):
+        """
+        전체 친구 목록을 페이지 순회로 가져와 변경분만 반영
+
+        Returns:
+            dict: {"success", "added", "updated", "removed", "total"} 또는 실패 시 get_friends 오류 dict
+        """
+        with self._sync_lock:
+            fetched = {}
+            offset = 0
+            while True:
+                page = self.fetch_page(offset, FRIENDS_PAGE_LIMIT)
+                if not page.get("success"):
+                    self.last_error = page.get("error")
+                    return page
+                elements = (page.get("data") or {}).get("elements") or []
+                for friend in elements:
+                    if friend.get('uuid'):
+                        fetched[friend['uuid']] = friend
+                total_count = (page.get("data") or {}).get("total_count")
+                offset += len(elements)
+                if not elements or len(elements) < FRIENDS_PAGE_LIMIT or (total_count is not None and offset >= total_count):
+                    break
+
+            with self._lock:
+                added = [u for u in fetched if u not in self._friends]
+                removed = [u for u in self._friends if u not in fetched]
+                updated = [u for u in fetched if u in self._friends and fetched[u] != self._friends[u]]
+                for uuid in removed:
+                    self.index.remove(uuid)
+                    del self._friends[uuid]
+                for uuid in added + updated:
+                    self._friends[uuid] = fetched[uuid]
+                    self.index.upsert(fetched[uuid])
+                self.synced_at = datetime.now().isoformat()
+                self.last_error = None
+                if added or removed or updated or not os.path.exists(self.path):
+                    self._save()
+            if added or removed or updated:
+                print(f"[kakao_friends] synced: +{len(added)} ~{len(updated)} -{len(removed)} (total {len(fetched)})")
+            return {"success": True, "added": len(added), "updated": len(updated),
+                    "removed": len(removed), "total": len(fetched), "synced_at": self.synced_at}
+
+    def find(self, name, limit=5):
+        with self._lock:
+            results = self.index.search(name, limit=limit)
+        return [
+            {
+                "uuid": friend.get('uuid'),
+                "profile_nickname": friend.get('profile_nickname'),
+                "profile_thumbnail_image": friend.get('profile_thumbnail_image'),
+                "favorite": friend.get('favorite', False),
+                "score": round(score, 3),
+                "match": match
+            }
+            for friend, score, match in results
+        ]
+
+    def _sync_loop(self, interval):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                self.last_error = str(e)
+                print("[kakao_friends] sync error:", e)
+            time.sleep(interval)
+
+    def start(self, interval):
+        """interval초마다 백그라운드 동기화 (중복 호출 무시)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._sync_loop, args=(interval,), name='kakao-friends-sync', daemon=True)
+        self._thread.start()
@@ -3,9 +3,17 @@
 Model Context Protocol을 통해 GPT 에이전트가 카카오톡 메시지를 발송할 수 있도록 지원
 """
 from flask import Flask, request, jsonify, redirect
+from server_runner import run_server
+from mcp_jsonrpc import register_mcp_endpoint
+from kakao_token_store import request_token_refresh, token_broker, token_store
+from rate_limit import TokenBucket
+from job_queue import DurableJobQueue
+from kakao_friends import FriendStore
 import os
 import json
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
 from datetime import datetime
 from dotenv import load_dotenv
@@ -29,26 +37,33 @@ KAKAO_REDIRECT_URI = os.getenv('KAKAO_REDIRECT_URI', DEFAULT_REDIRECT_URI)
 KAKAO_SCOPES = os.getenv('KAKAO_SCOPES', 'talk_calendar')
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-TOKEN_STORE_PATH = os.path.join(PROJECT_ROOT, 'data', 'kakao_tokens.json')
+
+# 친구에게 보내기 fan-out 설정 (카카오 API는 호출당 수신자 5명 제한)
+KAKAO_FRIENDS_CHUNK_SIZE = int(os.getenv('KAKAO_FRIENDS_CHUNK_SIZE', 5))
+KAKAO_SEND_WORKERS = int(os.getenv('KAKAO_SEND_WORKERS', 4))
+KAKAO_SEND_RATE = float(os.getenv('KAKAO_SEND_RATE', 10))          # 초당 업스트림 호출 수
+KAKAO_SEND_BURST = float(os.getenv('KAKAO_SEND_BURST', KAKAO_SEND_RATE))
+KAKAO_SEND_MAX_ATTEMPTS = int(os.getenv('KAKAO_SEND_MAX_ATTEMPTS', 3))
+KAKAO_SEND_BACKOFF = float(os.getenv('KAKAO_SEND_BACKOFF', 0.5))    # 재시도 대기(초), 라운드마다 2배
+
+# 비동기 발송 큐 (SQLite): 발송 요청은 job_id로 즉시 응답하고 워커가 전달
+KAKAO_SEND_ASYNC = os.getenv('KAKAO_SEND_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+KAKAO_OUTBOX_PATH = os.getenv('KAKAO_OUTBOX_PATH', os.path.join(PROJECT_ROOT, 'data', 'kakao_outbox.sqlite3'))
+KAKAO_OUTBOX_WORKERS = int(os.getenv('KAKAO_OUTBOX_WORKERS', 2))
+KAKAO_OUTBOX_MAX_ATTEMPTS = int(os.getenv('KAKAO_OUTBOX_MAX_ATTEMPTS', 5))
+KAKAO_OUTBOX_BACKOFF = float(os.getenv('KAKAO_OUTBOX_BACKOFF', 2.0))
+KAKAO_OUTBOX_LEASE_SECONDS = float(os.getenv('KAKAO_OUTBOX_LEASE_SECONDS', 300))  # 이보다 오래 running이면 중단된 작업으로 복구
+
+# 친구 목록 로컬 동기화 (이름 -> UUID 검색용)
+KAKAO_FRIENDS_PATH = os.getenv('KAKAO_FRIENDS_PATH', os.path.join(PROJECT_ROOT, 'data', 'kakao_friends.json'))
+KAKAO_FRIENDS_SYNC_INTERVAL = int(os.getenv('KAKAO_FRIENDS_SYNC_INTERVAL', 1800))
 
 def load_tokens():
-    try:
-        if os.path.exists(TOKEN_STORE_PATH):
-            with open(TOKEN_STORE_PATH, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {}
+    # 메모리 캐시 (data/kakao_tokens.json 파일이 바뀐 경우에만 다시 읽음)
+    return token_store.load()
 
 def save_tokens(tokens):
-    try:
-        os.makedirs(os.path.dirname(TOKEN_STORE_PATH), exist_ok=True)
-        tokens['updated_at'] = datetime.now().isoformat()
-        with open(TOKEN_STORE_PATH, 'w', encoding='utf-8') as f:
-            json.dump(tokens, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception:
-        return False
+    return token_store.save(tokens)
 
 def build_kakao_authorize_url(state=None):
     params = {
@@ -74,50 +89,50 @@ def exchange_code_for_tokens(code):
     raise Exception(f"토큰 교환 실패: {resp.status_code} {resp.text}")
 
 def refresh_access_token(refresh_token):
-    data = {
-        'grant_type': 'refresh_token',
-        'client_id': KAKAO_REST_API_KEY,
-        'refresh_token': refresh_token,
-    }
-    resp = requests.post('https://kauth.kakao.com/oauth/token', data=data, timeout=10)
-    if resp.status_code == 200:
-        return resp.json()
-    raise Exception(f"토큰 갱신 실패: {resp.status_code} {resp.text}")
+    return request_token_refresh(refresh_token)
 
 class KakaoMessenger:
     """카카오톡 메시지 발송 클래스"""
     
     def __init__(self, access_token=None):
-        tokens = load_tokens()
-        self.access_token = access_token or tokens.get('access_token') or KAKAO_ACCESS_TOKEN
+        self._access_token_override = access_token
         self.api_endpoint = KAKAO_API_ENDPOINT
         self._last_auth_error = None
+        # 친구 메시지 fan-out: 청크 크기/동시성/재시도와 업스트림 공용 레이트 리미터
+        self.friends_chunk_size = KAKAO_FRIENDS_CHUNK_SIZE
+        self.send_workers = KAKAO_SEND_WORKERS
+        self.send_max_attempts = KAKAO_SEND_MAX_ATTEMPTS
+        self.send_backoff = KAKAO_SEND_BACKOFF
+        self.send_limiter = TokenBucket(KAKAO_SEND_RATE, KAKAO_SEND_BURST)
+        self._http = requests.Session()
+        self._http.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=max(10, KAKAO_SEND_WORKERS)))
+        self._http.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=max(10, KAKAO_SEND_WORKERS)))
+
+    @property
+    def access_token(self):
+        # 토큰 저장소 캐시에서 매 호출 조회 (로그인/선제 갱신 결과가 즉시 반영됨)
+        return self._access_token_override or token_store.access_token(default=KAKAO_ACCESS_TOKEN)
 
     def _update_access_token_from_store(self):
-        tokens = load_tokens()
-        new_token = tokens.get('access_token')
-        if new_token:
-            self.access_token = new_token
-
-    def _attempt_refresh_and_update(self):
-        tokens = load_tokens()
-        refresh_token_value = tokens.get('refresh_token')
-        if not (KAKAO_REST_API_KEY and refresh_token_value):
-            return False
-        try:
-            refreshed = refresh_access_token(refresh_token_value)
-            merged = {
-                'access_token': refreshed.get('access_token', tokens.get('access_token')),
-                'refresh_token': refreshed.get('refresh_token', tokens.get('refresh_token')),
-                'token_type': refreshed.get('token_type', tokens.get('token_type')),
-                'expires_in': refreshed.get('expires_in', tokens.get('expires_in')),
-                'scope': refreshed.get('scope', tokens.get('scope')),
-            }
-            if save_tokens(merged):
-                self._update_access_token_from_store()
-                return True
-        except Exception as e:
-            self._last_auth_error = str(e)
+        self._access_token_override = None
+        return load_tokens().get('access_token')
+
+    def _attempt_refresh_and_update(self, failed_headers=None):
+        """
+        401 이후 토큰 갱신 (kakao/kakao_calendar 공용 브로커, 만료 1회당 kauth 호출 1회)
+
+        Args:
+            failed_headers (dict, optional): 401을 받은 요청 헤더 (이미 다른 요청이 갱신했으면 재사용)
+        """
+        stale_token = None
+        if failed_headers and failed_headers.get('Authorization', '').startswith('Bearer '):
+            stale_token = failed_headers['Authorization'][len('Bearer '):]
+        if self._access_token_override and self._access_token_override == stale_token:
+            self._update_access_token_from_store()
+        if token_broker.refresh(stale_token=stale_token):
+            self._update_access_token_from_store()
+            return True
+        self._last_auth_error = token_broker.last_error
         return False
     
     def send_message(self, message, web_url=None, mobile_web_url=None, button_title=None):
@@ -136,7 +151,8 @@ class KakaoMessenger:
         if not self.access_token:
             return {
                 "success": False,
-                "error": "KAKAO_ACCESS_TOKEN이 설정되지 않았습니다."
+                "error": "KAKAO_ACCESS_TOKEN이 설정되지 않았습니다.",
+                "retryable": False
             }
         
         # 메시지가 200자 초과 시 잘라내기
@@ -195,7 +211,7 @@ class KakaoMessenger:
                     "api_response": result
                 }
             elif response.status_code == 401:
-                if self._attempt_refresh_and_update():
+                if self._attempt_refresh_and_update(headers):
                     headers['Authorization'] = f'Bearer {self.access_token}'
                     retry_resp = requests.post(
                         self.api_endpoint,
@@ -232,12 +248,14 @@ class KakaoMessenger:
         except requests.exceptions.Timeout:
             return {
                 "success": False,
-                "error": "카카오톡 API 호출 시간 초과"
+                "error": "카카오톡 API 호출 시간 초과",
+                "retryable": True
             }
         except requests.exceptions.RequestException as e:
             return {
                 "success": False,
-                "error": f"카카오톡 API 호출 실패: {str(e)}"
+                "error": f"카카오톡 API 호출 실패: {str(e)}",
+                "retryable": True
             }
         except Exception as e:
             return {
@@ -280,7 +298,7 @@ class KakaoMessenger:
             if response.status_code == 200:
                 return {"success": True, "data": response.json()}
             elif response.status_code == 401:
-                if self._attempt_refresh_and_update():
+                if self._attempt_refresh_and_update(headers):
                     headers['Authorization'] = f'Bearer {self.access_token}'
                     retry_resp = requests.get(me_url, headers=headers, timeout=10)
                     if retry_resp.status_code == 200:
@@ -329,7 +347,7 @@ class KakaoMessenger:
                     "data": data
                 }
             elif response.status_code == 401:
-                if self._attempt_refresh_and_update():
+                if self._attempt_refresh_and_update(headers):
                     headers['Authorization'] = f'Bearer {self.access_token}'
                     retry_resp = requests.get(friends_url, headers=headers, params=params, timeout=10)
                     if retry_resp.status_code == 200:
@@ -349,10 +367,46 @@ class KakaoMessenger:
         except Exception as e:
             return {"success": False, "error": f"알 수 없는 오류: {str(e)}"}
     
+    def _send_friends_chunk(self, url, receiver_uuids, template_object_json):
+        """
+        친구 메시지 API 1회 호출 (레이트 리미터 통과 후, 401이면 토큰 갱신 후 1회 재시도)
+
+        Returns:
+            dict: {"status_code", "result"(200일 때 응답 JSON), "error", "refreshed"}
+        """
+        data = {
+            'receiver_uuids': json.dumps(receiver_uuids, ensure_ascii=False),
+            'template_object': template_object_json
+        }
+        headers = {
+            'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8',
+            'Authorization': f'Bearer {self.access_token}'
+        }
+        refreshed = False
+        try:
+            self.send_limiter.acquire()
+            response = self._http.post(url, headers=headers, data=data, timeout=10)
+            if response.status_code == 401 and self._attempt_refresh_and_update(headers):
+                refreshed = True
+                headers['Authorization'] = f'Bearer {self.access_token}'
+                self.send_limiter.acquire()
+                response = self._http.post(url, headers=headers, data=data, timeout=10)
+            if response.status_code == 200:
+                return {"status_code": 200, "result": response.json(), "refreshed": refreshed}
+            return {"status_code": response.status_code, "error": response.text, "refreshed": refreshed}
+        except requests.exceptions.Timeout:
+            return {"status_code": None, "error": "카카오톡 API 호출 시간 초과"}
+        except requests.exceptions.RequestException as e:
+            return {"status_code": None, "error": f"카카오톡 API 호출 실패: {str(e)}"}
+
     def send_message_to_friends(self, receiver_uuids, message, web_url=None, mobile_web_url=None, button_title=None):
         """
         카카오톡 친구에게 메시지 발송
         
+        수신자가 API 제한(호출당 friends_chunk_size명)보다 많으면 청크로 나누어
+        send_workers개 스레드가 레이트 리미터(send_limiter) 아래에서 동시에 발송하고,
+        실패한 UUID만 백오프 후 재시도합니다 (최대 send_max_attempts 라운드).
+        
         Args:
             receiver_uuids (list): 친구 UUID 리스트
             message (str): 발송할 메시지 내용 (최대 200자)
@@ -361,18 +415,20 @@ class KakaoMessenger:
             button_title (str, optional): 버튼 제목
         
         Returns:
-            dict: 발송 결과
+            dict: 발송 결과 (청크별 successful_receiver_uuids/failure_info 병합)
         """
         if not self.access_token:
             return {
                 "success": False,
-                "error": "KAKAO_ACCESS_TOKEN이 설정되지 않았습니다."
+                "error": "KAKAO_ACCESS_TOKEN이 설정되지 않았습니다.",
+                "retryable": False
             }
         
         if not receiver_uuids or not isinstance(receiver_uuids, list) or len(receiver_uuids) == 0:
             return {
                 "success": False,
-                "error": "receiver_uuids는 최소 1개 이상의 UUID 배열이어야 합니다."
+                "error": "receiver_uuids는 최소 1개 이상의 UUID 배열이어야 합니다.",
+                "retryable": False
             }
         
         # 메시지가 200자 초과 시 잘라내기
@@ -395,100 +451,269 @@ class KakaoMessenger:
         # 버튼 제목 추가
         if button_title:
             template_object["button_title"] = button_title
+        template_object_json = json.dumps(template_object, ensure_ascii=False)
         
         # API 엔드포인트
         friends_message_url = f"{os.getenv('KAKAO_API_BASE_URL', 'https://kapi.kakao.com')}/v1/api/talk/friends/message/default/send"
         
-        # 헤더 설정
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8',
-            'Authorization': f'Bearer {self.access_token}'
-        }
-        
-        # 데이터 준비
-        data = {
-            'receiver_uuids': json.dumps(receiver_uuids, ensure_ascii=False),
-            'template_object': json.dumps(template_object, ensure_ascii=False)
-        }
+        # 중복 제거(순서 유지) 후 청크 분할
+        pending = list(dict.fromkeys(receiver_uuids))
+        chunk_size = max(1, self.friends_chunk_size)
+        print("[kakao_mcp_server] Messenger.send_message_to_friends -> endpoint", friends_message_url,
+              f"receivers={len(pending)} chunk_size={chunk_size}")
+        
+        successful = []
+        failures = {}          # uuid -> {"code", "msg"} (마지막 실패 사유)
+        api_responses = []
+        refreshed = False
+        chunk_count = 0
+        rounds = 0
+        retried = 0
+        last_error = None
         
         try:
-            print("[kakao_mcp_server] Messenger.send_message_to_friends -> endpoint", friends_message_url, "payload:", data)
-            # 카카오톡 API 호출
-            response = requests.post(
-                friends_message_url,
-                headers=headers,
-                data=data,
-                timeout=10
-            )
-            
-            # 응답 확인
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "receiver_uuids": receiver_uuids,
-                    "message": message,
-                    "sent_at": datetime.now().isoformat(),
-                    "successful_receiver_uuids": result.get("successful_receiver_uuids", []),
-                    "failure_info": result.get("failure_info", []),
-                    "api_response": result
-                }
-            elif response.status_code == 401:
-                if self._attempt_refresh_and_update():
-                    headers['Authorization'] = f'Bearer {self.access_token}'
-                    retry_resp = requests.post(
-                        friends_message_url,
-                        headers=headers,
-                        data=data,
-                        timeout=10
-                    )
-                    if retry_resp.status_code == 200:
-                        result = retry_resp.json()
-                        return {
-                            "success": True,
-                            "receiver_uuids": receiver_uuids,
-                            "message": message,
-                            "sent_at": datetime.now().isoformat(),
-                            "successful_receiver_uuids": result.get("successful_receiver_uuids", []),
-                            "failure_info": result.get("failure_info", []),
-                            "api_response": result,
-                            "refreshed": True
-                        }
-                auth_url = build_kakao_authorize_url()
-                return {
-                    "success": False,
-                    "error": "카카오톡 API 오류: 401",
-                    "auth_required": True,
-                    "auth_url": auth_url,
-                    "provider": "kakao"
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"카카오톡 API 오류: {response.status_code}",
-                    "error_message": response.text,
-                    "status_code": response.status_code
-                }
-                
-        except requests.exceptions.Timeout:
+            with ThreadPoolExecutor(max_workers=max(1, self.send_workers)) as pool:
+                while pending and rounds < max(1, self.send_max_attempts):
+                    if rounds > 0:
+                        retried += len(pending)
+                        time.sleep(self.send_backoff * (2 ** (rounds - 1)))
+                    rounds += 1
+                    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+                    chunk_count += len(chunks)
+                    outcomes = list(pool.map(
+                        lambda chunk: self._send_friends_chunk(friends_message_url, chunk, template_object_json),
+                        chunks
+                    ))
+                    
+                    retry = []
+                    for chunk, outcome in zip(chunks, outcomes):
+                        refreshed = refreshed or outcome.get("refreshed", False)
+                        status_code = outcome.get("status_code")
+                        if status_code == 200:
+                            result = outcome["result"]
+                            api_responses.append(result)
+                            ok = result.get("successful_receiver_uuids", [])
+                            successful.extend(ok)
+                            for uuid in ok:
+                                failures.pop(uuid, None)
+                            # 응답의 failure_info에 있는 UUID만 재시도 대상
+                            for info in result.get("failure_info", []) or []:
+                                for uuid in info.get("receiver_uuids", []) or []:
+                                    failures[uuid] = {"code": info.get("code"), "msg": info.get("msg")}
+                                    retry.append(uuid)
+                            continue
+                        if status_code == 401:
+                            # 토큰 갱신까지 실패 -> 재로그인 필요 (재시도 무의미)
+                            return {
+                                "success": False,
+                                "error": "카카오톡 API 오류: 401",
+                                "auth_required": True,
+                                "auth_url": build_kakao_authorize_url(),
+                                "provider": "kakao",
+                                "successful_receiver_uuids": successful
+                            }
+                        last_error = outcome.get("error")
+                        for uuid in chunk:
+                            failures[uuid] = {"code": status_code, "msg": last_error}
+                        # 네트워크 오류/429/5xx만 재시도, 그 외 4xx는 요청 자체 오류
+                        if status_code is None or status_code == 429 or status_code >= 500:
+                            retry.extend(chunk)
+                    pending = retry
+        except Exception as e:
             return {
                 "success": False,
-                "error": "카카오톡 API 호출 시간 초과"
+                "error": f"알 수 없는 오류: {str(e)}"
             }
-        except requests.exceptions.RequestException as e:
+        
+        # 최종 실패를 사유(code, msg)별로 묶어 카카오 응답과 같은 형식으로 반환
+        grouped = {}
+        for uuid, info in failures.items():
+            grouped.setdefault((info["code"], info["msg"]), []).append(uuid)
+        failure_info = [
+            {"code": code, "msg": msg, "receiver_uuids": uuids}
+            for (code, msg), uuids in grouped.items()
+        ]
+        
+        if not api_responses:
+            # 모든 청크 실패: 네트워크 오류/429/5xx가 하나라도 있으면 나중에 다시 시도할 가치가 있음
             return {
                 "success": False,
-                "error": f"카카오톡 API 호출 실패: {str(e)}"
+                "error": f"카카오톡 API 오류: {last_error}",
+                "failure_info": failure_info,
+                "retryable": any(
+                    info["code"] is None or (isinstance(info["code"], int) and (info["code"] == 429 or info["code"] >= 500))
+                    for info in failures.values()
+                )
             }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"알 수 없는 오류: {str(e)}"
+        result = {
+            "success": True,
+            "receiver_uuids": receiver_uuids,
+            "message": message,
+            "sent_at": datetime.now().isoformat(),
+            "successful_receiver_uuids": successful,
+            "failure_info": failure_info,
+            "api_response": api_responses[0] if len(api_responses) == 1 else api_responses,
+            "fan_out": {
+                "chunks": chunk_count,
+                "chunk_size": chunk_size,
+                "rounds": rounds,
+                "retried_receivers": retried
             }
+        }
+        if refreshed:
+            result["refreshed"] = True
+        return result
 
 # 전역 인스턴스
 messenger = KakaoMessenger()
 
+def _deliver_memo(payload):
+    """발송 큐 핸들러: 나에게 보내기 (공용 레이트 리미터 적용)"""
+    messenger.send_limiter.acquire()
+    return messenger.send_message(**payload)
+
+def _deliver_friends(payload):
+    """발송 큐 핸들러: 친구에게 보내기 (청크별로 레이트 리미터 적용)"""
+    return messenger.send_message_to_friends(**payload)
+
+def _is_retryable_send_failure(result):
+    """
+    네트워크 오류(retryable: True), 429, 5xx만 재시도
+
+    재로그인 필요, 토큰 미설정, 잘못된 수신자, 4xx, 원인을 알 수 없는 오류는 다시 실행해도 같은 결과이므로 재시도하지 않음
+    """
+    if result.get('auth_required'):
+        return False
+    if 'retryable' in result:
+        return bool(result['retryable'])
+    status_code = result.get('status_code')
+    return isinstance(status_code, int) and (status_code == 429 or status_code >= 500)
+
+outbox = DurableJobQueue(
+    KAKAO_OUTBOX_PATH,
+    handlers={'memo': _deliver_memo, 'friends': _deliver_friends},
+    workers=KAKAO_OUTBOX_WORKERS,
+    max_attempts=KAKAO_OUTBOX_MAX_ATTEMPTS,
+    backoff=KAKAO_OUTBOX_BACKOFF,
+    is_retryable=_is_retryable_send_failure,
+    name='kakao_outbox',
+    lease_timeout=KAKAO_OUTBOX_LEASE_SECONDS
+)
+
+# 친구 목록 저장소: 전체 페이지 순회 동기화 + 자모 단위 이름 인덱스
+friend_store = FriendStore(
+    KAKAO_FRIENDS_PATH,
+    fetch_page=lambda offset, limit: messenger.get_friends(offset=offset, limit=limit, order='asc')
+)
+
+def enqueue_send(kind, payload):
+    """발송 작업 등록 후 즉시 응답할 본문 (토큰이 없으면 등록하지 않고 인증 필요 응답)"""
+    if not messenger.access_token:
+        return {
+            "success": False,
+            "error": "KAKAO_ACCESS_TOKEN이 설정되지 않았습니다.",
+            "auth_required": True,
+            "auth_url": build_kakao_authorize_url(),
+            "provider": "kakao"
+        }, 200
+    job = outbox.enqueue(kind, payload)
+    return {
+        "success": True,
+        "status": "queued",
+        "job_id": job["job_id"],
+        "status_url": f"/mcp/kakao/jobs/{job['job_id']}",
+        "message": payload.get("message"),
+        "queued_at": job["created_at"]
+    }, 202
+
+# MCP 도구 목록 (parameters: OpenAI/JSON Schema, endpoint: 호출 라우트)
+TOOLS = [
+    {
+        "name": "send_kakao_message",
+        "description": "카카오톡 메시지 발송 - 자기 자신에게 메시지 보내기 (발송 큐에 등록되어 job_id를 즉시 반환, 전달은 백그라운드)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "message": {"type": "string", "description": "발송할 메시지 내용 (필수)"},
+                "template_id": {"type": "string", "description": "템플릿 ID (선택사항, 템플릿 메시지 사용 시)"},
+                "web_url": {"type": "string", "description": "웹 URL 링크 (선택)"},
+                "mobile_web_url": {"type": "string", "description": "모바일 웹 URL 링크 (선택)"},
+                "button_title": {"type": "string", "description": "버튼 제목 (선택)"}
+            },
+            "required": ["message"]
+        },
+        "endpoint": {"method": "POST", "path": "/mcp/kakao/send"}
+    },
+    {
+        "name": "get_kakao_friends",
+        "description": "카카오톡 친구 목록 조회",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "offset": {"type": "integer", "description": "시작 위치 (선택)"},
+                "limit": {"type": "integer", "description": "조회 개수 (선택)"},
+                "order": {"type": "string", "description": "정렬 (asc/desc) (선택)"}
+            },
+            "required": []
+        },
+        "endpoint": {"method": "GET", "path": "/mcp/kakao/friends"}
+    },
+    {
+        "name": "get_kakao_me",
+        "description": "카카오 사용자 정보(내정보) 조회",
+        "parameters": {"type": "object", "properties": {}, "required": []},
+        "endpoint": {"method": "GET", "path": "/mcp/kakao/me"}
+    },
+    {
+        "name": "send_kakao_message_to_friends",
+        "description": "카카오톡 친구에게 메시지 발송 - 친구 UUID 배열을 받아 여러 친구에게 메시지를 보냅니다 (발송 큐에 등록되어 job_id를 즉시 반환)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "receiver_uuids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "친구 UUID 배열 (필수, 최소 1개 이상)"
+                },
+                "message": {"type": "string", "description": "발송할 메시지 내용 (필수, 최대 200자)"},
+                "web_url": {"type": "string", "description": "웹 URL 링크 (선택)"},
+                "mobile_web_url": {"type": "string", "description": "모바일 웹 URL 링크 (선택)"},
+                "button_title": {"type": "string", "description": "버튼 제목 (선택)"}
+            },
+            "required": ["receiver_uuids", "message"]
+        },
+        "endpoint": {"method": "POST", "path": "/mcp/kakao/send-to-friends"}
+    },
+    {
+        "name": "find_kakao_friend",
+        "description": "카카오톡 친구를 이름으로 검색해 UUID 조회 (로컬 동기화된 전체 친구 목록, 부분 일치/초성/오타 허용)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "친구 이름 또는 일부 (예: 홍길동, 길동, ㅎㄱㄷ) (필수)"},
+                "limit": {"type": "integer", "description": "최대 결과 수 (기본 5)"}
+            },
+            "required": ["name"]
+        },
+        "endpoint": {"method": "GET", "path": "/mcp/kakao/friends/find"}
+    },
+    {
+        "name": "get_kakao_message_job",
+        "description": "카카오톡 발송 작업 상태 조회 (queued/running/succeeded/failed, 결과와 시도 횟수)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "job_id": {"type": "string", "description": "발송 요청 시 받은 job_id (필수)"}
+            },
+            "required": ["job_id"]
+        },
+        "endpoint": {"method": "GET", "path": "/mcp/kakao/jobs/{job_id}"}
+    }
+]
+
+# 표준 MCP JSON-RPC 엔드포인트 (POST /mcp: initialize, tools/list, tools/call)
+register_mcp_endpoint(app, 'kakao_mcp_server', TOOLS)
+
 @app.route('/mcp/kakao/send', methods=['POST'])
 def send_kakao_message():
     """
@@ -499,7 +724,8 @@ def send_kakao_message():
         "message": "안녕하세요",
         "web_url": "https://example.com",  // optional
         "mobile_web_url": "https://example.com",  // optional
-        "button_title": "바로 확인"  // optional
+        "button_title": "바로 확인",  // optional
+        "wait": false  // optional, true면 큐를 거치지 않고 발송 결과까지 대기
     }
     """
     try:
@@ -525,6 +751,14 @@ def send_kakao_message():
             # 템플릿 전송은 현재 receiver_id를 사용하지 않습니다
             print("[kakao_mcp_server] calling messenger.send_template_message (self memo path)")
             result = messenger.send_template_message(None, template_id, template_args)
+        elif KAKAO_SEND_ASYNC and not data.get('wait'):
+            body, status = enqueue_send('memo', {
+                "message": message,
+                "web_url": web_url,
+                "mobile_web_url": mobile_web_url,
+                "button_title": button_title
+            })
+            return jsonify(body), status
         else:
             print("[kakao_mcp_server] calling messenger.send_message (self memo path)")
             result = messenger.send_message(
@@ -550,7 +784,8 @@ def send_kakao_message_to_friends():
         "message": "안녕하세요",
         "web_url": "https://example.com",  // optional
         "mobile_web_url": "https://example.com",  // optional
-        "button_title": "바로 확인"  // optional
+        "button_title": "바로 확인",  // optional
+        "wait": false  // optional, true면 큐를 거치지 않고 발송 결과까지 대기
     }
     """
     try:
@@ -576,6 +811,16 @@ def send_kakao_message_to_friends():
                 "error": "message는 필수입니다."
             }), 400
         
+        if KAKAO_SEND_ASYNC and not data.get('wait'):
+            body, status = enqueue_send('friends', {
+                "receiver_uuids": receiver_uuids,
+                "message": message,
+                "web_url": web_url,
+                "mobile_web_url": mobile_web_url,
+                "button_title": button_title
+            })
+            return jsonify(body), status
+        
         print("[kakao_mcp_server] calling messenger.send_message_to_friends (friends path)")
         result = messenger.send_message_to_friends(
             receiver_uuids=receiver_uuids,
@@ -590,6 +835,17 @@ def send_kakao_message_to_friends():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/mcp/kakao/jobs/<job_id>', methods=['GET'])
+def get_kakao_message_job(job_id):
+    """MCP 엔드포인트: 발송 작업 상태 조회"""
+    try:
+        job = outbox.get(job_id)
+        if job is None:
+            return jsonify({"success": False, "error": f"작업을 찾을 수 없습니다: {job_id}"}), 404
+        return jsonify({"success": True, "job": job}), 200
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/mcp/kakao/health', methods=['GET'])
 def health_check():
     """MCP 서버 헬스 체크"""
@@ -602,46 +858,7 @@ def health_check():
 @app.route('/mcp/kakao/capabilities', methods=['GET'])
 def get_capabilities():
     """MCP 서버가 제공하는 기능 목록"""
-    return jsonify({
-        "tools": [
-            {
-                "name": "send_kakao_message",
-                "description": "카카오톡 메시지 발송",
-                "parameters": {
-                    "message": "string (required) - 메시지 내용",
-                    "template_id": "string (optional) - 템플릿 ID",
-                    "web_url": "string (optional) - 웹 URL",
-                    "mobile_web_url": "string (optional) - 모바일 웹 URL",
-                    "button_title": "string (optional) - 버튼 제목"
-                }
-            },
-            {
-                "name": "get_kakao_friends",
-                "description": "카카오톡 친구 목록 조회",
-                "parameters": {
-                    "offset": "number (optional) - 시작 위치",
-                    "limit": "number (optional) - 조회 개수",
-                    "order": "string (optional) - asc 또는 desc"
-                }
-            },
-            {
-                "name": "get_kakao_me",
-                "description": "카카오 사용자 정보(내정보) 조회",
-                "parameters": {}
-            },
-            {
-                "name": "send_kakao_message_to_friends",
-                "description": "카카오톡 친구에게 메시지 발송",
-                "parameters": {
-                    "receiver_uuids": "array (required) - 친구 UUID 배열",
-                    "message": "string (required) - 메시지 내용",
-                    "web_url": "string (optional) - 웹 URL",
-                    "mobile_web_url": "string (optional) - 모바일 웹 URL",
-                    "button_title": "string (optional) - 버튼 제목"
-                }
-            }
-        ]
-    }), 200
+    return jsonify({"tools": TOOLS}), 200
 
 @app.route('/mcp/kakao/login', methods=['GET'])
 def kakao_login():
@@ -684,10 +901,15 @@ def kakao_oauth_callback():
 @app.route('/mcp/kakao/token-status', methods=['GET'])
 def kakao_token_status():
     tokens = load_tokens()
+    refresh_in = token_store.seconds_until_refresh()
     masked = {
         'has_access_token': bool(tokens.get('access_token')),
         'has_refresh_token': bool(tokens.get('refresh_token')),
-        'updated_at': tokens.get('updated_at')
+        'updated_at': tokens.get('updated_at'),
+        'expires_at': datetime.fromtimestamp(tokens['expires_at']).isoformat() if tokens.get('expires_at') else None,
+        'proactive_refresh_in_seconds': int(refresh_in) if refresh_in is not None else None,
+        'refresh_count': token_broker.refresh_count,
+        'last_refresh_error': token_broker.last_error
     }
     return jsonify({"success": True, "tokens": masked, "redirect_uri": KAKAO_REDIRECT_URI}), 200
 
@@ -704,6 +926,39 @@ def get_kakao_friends():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/mcp/kakao/friends/find', methods=['GET'])
+def find_kakao_friend():
+    """MCP 엔드포인트: 로컬 친구 목록에서 이름으로 UUID 검색"""
+    try:
+        name = request.args.get('name', default='', type=str)
+        limit = request.args.get('limit', default=5, type=int)
+        if not name.strip():
+            return jsonify({"success": False, "error": "name은 필수입니다."}), 400
+        # 아직 동기화된 목록이 없으면 최초 1회 동기 수행
+        if len(friend_store) == 0:
+            synced = friend_store.sync()
+            if not synced.get("success"):
+                return jsonify(synced), 200
+        matches = friend_store.find(name, limit=limit)
+        return jsonify({
+            "success": True,
+            "query": name,
+            "matches": matches,
+            "total_friends": len(friend_store),
+            "synced_at": friend_store.synced_at
+        }), 200
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/mcp/kakao/friends/sync', methods=['POST'])
+def sync_kakao_friends():
+    """MCP 엔드포인트: 친구 목록 즉시 재동기화"""
+    try:
+        result = friend_store.sync()
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/mcp/kakao/me', methods=['GET'])
 def get_kakao_me():
     """MCP 엔드포인트: 카카오 사용자 정보(내정보) 조회"""
@@ -713,7 +968,13 @@ def get_kakao_me():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+def start_background_workers():
+    """만료 전 액세스 토큰 선제 갱신 스케줄러, 발송 큐 워커, 친구 목록 동기화 기동"""
+    token_broker.start_scheduler()
+    outbox.start()
+    friend_store.start(KAKAO_FRIENDS_SYNC_INTERVAL)
+
 if __name__ == '__main__':
     port = int(os.getenv('MCP_SERVER_PORT', 5003))
-    app.run(debug=True, host='0.0.0.0', port=port)
+    run_server(app, port, uds_env='KAKAO_MCP_UDS', on_start=start_background_workers)
 
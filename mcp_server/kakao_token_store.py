@@ -0,0 +1,271 @@
+"""
+카카오 OAuth 토큰 저장소 (data/kakao_tokens.json) 메모리 캐시 + 갱신 브로커
+
+kakao_mcp_server와 kakao_calendar_mcp_server가 같은 파일을 공유합니다.
+- TokenStore.load(): 파일 mtime/크기/inode가 바뀌었을 때만 다시 읽고, 그 외에는 메모리 캐시를 반환
+- TokenStore.save(): 임시 파일 + os.replace로 원자적으로 기록하고 expires_at(epoch초)을 함께 저장
+- TokenBroker.refresh(): 프로세스 내 single-flight + 프로세스 간 파일 락(kakao_tokens.json.lock)으로
+  만료 1회당 kauth 갱신 호출을 정확히 한 번만 수행하고, 대기하던 요청은 그 결과를 재사용
+- TokenBroker.start_scheduler(): expires_in 기준 만료 전에 백그라운드에서 미리 갱신
+  (사용자 요청이 401 -> 갱신 -> 재시도 비용을 치르지 않도록)
+
+환경변수:
+- KAKAO_TOKENS_PATH (기본 data/kakao_tokens.json, import 시점에 읽음)
+- KAKAO_REST_API_KEY: refresh_token 갱신용 REST API 키
+- KAKAO_AUTH_BASE_URL (기본 https://kauth.kakao.com)
+- KAKAO_TOKEN_REFRESH_MARGIN (기본 600초): 만료 몇 초 전에 갱신할지 (expires_in의 절반을 넘지 않음)
+- KAKAO_TOKEN_REFRESH_RETRY  (기본 60초): 갱신 실패 시 재시도 간격
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내 single-flight만 적용
+    fcntl = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN_STORE_PATH = os.getenv('KAKAO_TOKENS_PATH') or os.path.join(PROJECT_ROOT, 'data', 'kakao_tokens.json')
+
+# 같은 만료 토큰으로 방금 실패한 갱신을 대기자들이 반복하지 않도록 하는 간격(초)
+FAILED_REFRESH_COOLDOWN = 5
+
+
+def _env_int(name, default):
+    # 서버 모듈이 load_dotenv 전에 import 하므로 호출 시점에 읽음
+    return int(os.getenv(name, default))
+
+
+def token_expires_at(tokens):
+    """토큰 만료 시각(epoch초). expires_at이 없으면 updated_at + expires_in으로 추정"""
+    if tokens.get('expires_at'):
+        return float(tokens['expires_at'])
+    expires_in = tokens.get('expires_in')
+    updated_at = tokens.get('updated_at')
+    if expires_in and updated_at:
+        try:
+            return datetime.fromisoformat(updated_at).timestamp() + float(expires_in)
+        except ValueError:
+            return None
+    return None
+
+
+class TokenStore:
+    """파일 변경 시에만 다시 읽는 토큰 캐시"""
+
+    def __init__(self, path=TOKEN_STORE_PATH):
+        self.path = path
+        self._tokens = {}
+        self._signature = None
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._scheduler = None
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load(self):
+        """토큰 dict (사본). 파일이 바뀌지 않았으면 디스크를 읽지 않음"""
+        signature = self._stat_signature()
+        if signature != self._signature:
+            with self._lock:
+                signature = self._stat_signature()
+                if signature != self._signature:
+                    tokens = {}
+                    if signature is not None:
+                        try:
+                            with open(self.path, 'r', encoding='utf-8') as f:
+                                tokens = json.load(f)
+                        except Exception:
+                            # 쓰는 중이거나 손상된 파일: 직전 캐시 유지, 다음 호출에서 재시도
+                            return dict(self._tokens)
+                    self._tokens = tokens
+                    self._signature = signature
+                    self._changed.set()
+        return dict(self._tokens)
+
+    def save(self, tokens):
+        """토큰 저장 (updated_at, expires_at 갱신). 성공 여부 반환"""
+        try:
+            tokens = dict(tokens)
+            now = datetime.now()
+            tokens['updated_at'] = now.isoformat()
+            if tokens.get('expires_in'):
+                tokens['expires_at'] = now.timestamp() + float(tokens['expires_in'])
+            else:
+                tokens.pop('expires_at', None)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(tokens, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            with self._lock:
+                self._tokens = tokens
+                self._signature = self._stat_signature()
+            self._changed.set()
+            return True
+        except Exception:
+            return False
+
+    def access_token(self, default=''):
+        return self.load().get('access_token') or default
+
+    # ===== 선제 갱신 =====
+    def refresh_schedule(self, margin=None):
+        """
+        (갱신 시점까지 남은 초, 그 판단에 쓴 access_token). 갱신 불가/만료 정보 없음이면 (None, token)
+
+        margin은 expires_in의 절반을 넘지 않게 줄입니다. (수명이 margin보다 짧은 토큰을 받자마자 다시 갱신하지 않도록)
+        """
+        if margin is None:
+            margin = _env_int('KAKAO_TOKEN_REFRESH_MARGIN', 600)
+        tokens = self.load()
+        expires_at = token_expires_at(tokens)
+        if not tokens.get('refresh_token') or expires_at is None:
+            return None, tokens.get('access_token')
+        try:
+            margin = min(margin, float(tokens.get('expires_in')) / 2)
+        except (TypeError, ValueError):
+            pass
+        return expires_at - margin - time.time(), tokens.get('access_token')
+
+    def seconds_until_refresh(self, margin=None):
+        """갱신 시점까지 남은 초 (갱신 불가/만료 정보 없음이면 None)"""
+        return self.refresh_schedule(margin)[0]
+
+    def _refresh_loop(self, refresh_fn, margin):
+        while True:
+            retry = _env_int('KAKAO_TOKEN_REFRESH_RETRY', 60)
+            wait, token = self.refresh_schedule(margin)
+            if wait is not None and wait <= 0:
+                try:
+                    # 판단에 쓴 토큰을 넘겨, 그 사이 다른 스레드/프로세스가 갱신했으면 kauth 호출 없이 끝나게 함
+                    if refresh_fn(stale_token=token):
+                        print("[kakao_token_store] access token refreshed ahead of expiry")
+                        wait = self.seconds_until_refresh(margin)
+                except Exception as e:
+                    print("[kakao_token_store] proactive refresh error:", e)
+                # 갱신 직후에도 여전히 갱신 시점이면(짧은 수명 토큰 등) kauth를 연달아 호출하지 않도록 재시도 간격만큼 대기
+                if wait is None or wait <= 0:
+                    wait = retry
+            # 토큰 파일이 바뀌면(로그인/다른 프로세스 갱신) 즉시 일정 재계산
+            self._changed.clear()
+            self._changed.wait(timeout=min(wait if wait is not None else retry, 300))
+
+    def start_refresh_scheduler(self, refresh_fn, margin=None):
+        """만료 margin초 전에 refresh_fn(stale_token=판단에 쓴 토큰)을 호출하는 데몬 스레드 시작 (중복 호출 무시)"""
+        if self._scheduler is not None:
+            return
+        self._scheduler = threading.Thread(
+            target=self._refresh_loop, args=(refresh_fn, margin),
+            name='kakao-token-refresh', daemon=True
+        )
+        self._scheduler.start()
+
+
+def request_token_refresh(refresh_token):
+    """kauth refresh_token 갱신 호출 (응답 JSON 반환, 실패 시 예외)"""
+    data = {
+        'grant_type': 'refresh_token',
+        'client_id': os.getenv('KAKAO_REST_API_KEY', ''),
+        'refresh_token': refresh_token,
+    }
+    auth_base = os.getenv('KAKAO_AUTH_BASE_URL', 'https://kauth.kakao.com')
+    resp = requests.post(f"{auth_base}/oauth/token", data=data, timeout=10)
+    if resp.status_code == 200:
+        return resp.json()
+    raise Exception(f"토큰 갱신 실패: {resp.status_code} {resp.text}")
+
+
+@contextmanager
+def file_lock(path):
+    """프로세스 간 배타 락 (fcntl.flock, 락 파일은 남겨 둠)"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class TokenBroker:
+    """kakao/kakao_calendar 서버 공용 토큰 갱신기 (만료 1회당 갱신 1회)"""
+
+    def __init__(self, store, refresh_fn=request_token_refresh):
+        self.store = store
+        self.refresh_fn = refresh_fn
+        self.lock_path = f"{store.path}.lock"
+        self._lock = threading.Lock()
+        self.refresh_count = 0
+        self.last_error = None
+        self._last_failure = (None, 0.0)  # (실패한 토큰, 시각)
+
+    def refresh(self, stale_token=None):
+        """
+        stale_token(401을 받은 액세스 토큰)을 갱신
+
+        다른 스레드/프로세스가 이미 갱신했으면 kauth 호출 없이 True를 반환합니다.
+
+        Returns:
+            bool: 사용할 수 있는 새 토큰이 저장소에 있으면 True
+        """
+        if stale_token is None:
+            stale_token = self.store.access_token()
+        # 프로세스 내 single-flight: 대기하던 스레드는 선행 갱신 결과를 확인하고 재사용
+        with self._lock:
+            if self.store.access_token() != stale_token:
+                return True
+            failed_token, failed_at = self._last_failure
+            if failed_token == stale_token and time.time() - failed_at < FAILED_REFRESH_COOLDOWN:
+                return False
+            # 프로세스 간: 파일 락 안에서 디스크를 다시 확인 (다른 서버 프로세스가 갱신했을 수 있음)
+            with file_lock(self.lock_path):
+                tokens = self.store.load()
+                if tokens.get('access_token') != stale_token:
+                    return True
+                refresh_token_value = tokens.get('refresh_token')
+                if not (os.getenv('KAKAO_REST_API_KEY') and refresh_token_value):
+                    self.last_error = "KAKAO_REST_API_KEY 또는 refresh_token이 없습니다."
+                    return False
+                try:
+                    refreshed = self.refresh_fn(refresh_token_value)
+                except Exception as e:
+                    self.last_error = str(e)
+                    self._last_failure = (stale_token, time.time())
+                    return False
+                merged = {
+                    'access_token': refreshed.get('access_token', tokens.get('access_token')),
+                    'refresh_token': refreshed.get('refresh_token', tokens.get('refresh_token')),
+                    'token_type': refreshed.get('token_type', tokens.get('token_type')),
+                    'expires_in': refreshed.get('expires_in', tokens.get('expires_in')),
+                    'scope': refreshed.get('scope', tokens.get('scope')),
+                }
+                if not self.store.save(merged):
+                    self.last_error = "토큰 저장 실패"
+                    return False
+                self.refresh_count += 1
+                self.last_error = None
+                return True
+
+    def start_scheduler(self, margin=None):
+        """만료 전 선제 갱신 스케줄러 (여러 서버가 호출해도 프로세스당 1개)"""
+        self.store.start_refresh_scheduler(self.refresh, margin=margin)
+
+
+# 같은 프로세스(embedded 모드 포함)의 서버들이 공유하는 인스턴스
+token_store = TokenStore()
+token_broker = TokenBroker(token_store)
@@ -0,0 +1,56 @@
+"""
+MCP 서버 라우트 인프로세스 호출 헬퍼
+
+HTTP 소켓을 거치지 않고 Flask 앱의 라우트 함수를 직접 실행합니다.
+(웹챗의 embedded 모드, 서버의 MCP JSON-RPC 엔드포인트에서 사용)
+"""
+
+
+def resolve_endpoint(endpoint, arguments=None):
+    """
+    capabilities endpoint 정의와 도구 인자로 실제 호출 정보 계산
+
+    Args:
+        endpoint (dict): {"method": "GET|POST", "path": "/mcp/...", "param_map": {...}}
+        arguments (dict|None): 도구 인자
+    Returns:
+        tuple: (method, path, args)
+    """
+    args = {k: v for k, v in (arguments or {}).items() if v is not None}
+    # 인자명 -> 서버 파라미터명 매핑 (예: date_from -> from)
+    for src, dst in (endpoint.get('param_map') or {}).items():
+        if src in args:
+            args[dst] = args.pop(src)
+    path = endpoint['path']
+    # 경로 템플릿 치환 (예: /mcp/kakao/jobs/{job_id})
+    for key in list(args.keys()):
+        placeholder = '{' + key + '}'
+        if placeholder in path:
+            path = path.replace(placeholder, str(args.pop(key)))
+    method = (endpoint.get('method') or 'GET').upper()
+    return method, path, args
+
+
+def call_route(app, method, path, args=None):
+    """
+    Flask 앱 라우트를 인프로세스로 호출
+
+    Args:
+        app (Flask): MCP 서버 Flask 앱
+        method (str): HTTP 메소드
+        path (str): 라우트 경로 (예: /mcp/devtalk/unanswered-count)
+        args (dict|None): GET이면 쿼리, 그 외에는 JSON 바디
+    Returns:
+        tuple: (status_code, dict|None)
+    """
+    method = method.upper()
+    endpoint, view_args = app.url_map.bind('localhost').match(path, method=method)
+    kwargs = {'method': method}
+    if method == 'GET':
+        kwargs['query_string'] = args or {}
+    else:
+        kwargs['json'] = args or {}
+    with app.test_request_context(path, **kwargs):
+        rv = app.view_functions[endpoint](**view_args)
+        response = app.make_response(rv)
+    return response.status_code, response.get_json(silent=True)
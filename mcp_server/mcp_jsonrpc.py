@@ -0,0 +1,180 @@
+"""
+Model Context Protocol JSON-RPC 엔드포인트 (Streamable HTTP)
+
+각 MCP 서버의 TOOLS(capabilities)를 표준 MCP 도구로 노출합니다.
+- POST /mcp   : JSON-RPC 요청(단건/배치) -> application/json 또는 text/event-stream 응답
+- GET  /mcp   : 서버 발신 스트림 미지원 (405)
+- DELETE /mcp : 세션 종료
+
+지원 메소드: initialize, notifications/initialized, ping, tools/list, tools/call
+세션은 initialize 응답의 Mcp-Session-Id 헤더로 발급되며 이후 요청에 필수입니다.
+DELETE 없이 버려진 세션은 MCP_SESSION_IDLE_TTL(기본 3600초) 동안 쓰이지 않으면 만료되고,
+세션 수가 MCP_SESSION_MAX(기본 1000)를 넘으면 가장 오래 쓰이지 않은 세션부터 정리합니다. (initialize 시점)
+만료된 세션으로 요청하면 404이며, 클라이언트는 다시 initialize 하면 됩니다.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from flask import Response, jsonify, request
+from mcp_dispatch import call_route, resolve_endpoint
+
+PROTOCOL_VERSION = '2025-03-26'
+SUPPORTED_PROTOCOL_VERSIONS = ('2025-03-26', '2024-11-05')
+
+# JSON-RPC 에러 코드
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+SESSION_IDLE_TTL = float(os.getenv('MCP_SESSION_IDLE_TTL', 3600))
+SESSION_MAX = int(os.getenv('MCP_SESSION_MAX', 1000))
+
+
+def _rpc_result(req_id, result):
+    return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+
+def _rpc_error(req_id, code, message):
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+
+def _tool_result(status_code, data):
+    """라우트 응답을 MCP tools/call 결과로 변환"""
+    is_error = status_code >= 400 or (isinstance(data, dict) and data.get('success') is False)
+    result = {
+        "content": [{"type": "text", "text": json.dumps(data, ensure_ascii=False)}],
+        "isError": is_error
+    }
+    if isinstance(data, dict):
+        result["structuredContent"] = data
+    return result
+
+
+def register_mcp_endpoint(app, server_name, tools, version='1.0.0', path='/mcp'):
+    """
+    Flask 앱에 MCP JSON-RPC 엔드포인트 등록
+
+    Args:
+        app (Flask): MCP 서버 앱
+        server_name (str): serverInfo.name
+        tools (list): capabilities TOOLS (name/description/parameters/endpoint)
+        version (str): serverInfo.version
+        path (str): 엔드포인트 경로
+    """
+    sessions = OrderedDict()  # session_id -> {"created_at", "last_used_at"} (오래 쓰이지 않은 순)
+    sessions_lock = threading.Lock()
+
+    def prune_sessions(now):
+        """유휴 TTL이 지난 세션 제거 + 상한 초과분을 오래 쓰이지 않은 순으로 제거 (sessions_lock 보유)"""
+        while sessions:
+            oldest = next(iter(sessions.values()))
+            if now - oldest["last_used_at"] < SESSION_IDLE_TTL and len(sessions) < SESSION_MAX:
+                break
+            sessions.popitem(last=False)
+
+    def handle(message, session_id):
+        """단건 JSON-RPC 메시지 처리. 알림이면 None 반환"""
+        if not isinstance(message, dict) or message.get('jsonrpc') != '2.0' or 'method' not in message:
+            return _rpc_error(message.get('id') if isinstance(message, dict) else None, INVALID_REQUEST, "Invalid Request")
+        req_id = message.get('id')
+        method = message['method']
+        params = message.get('params') or {}
+
+        if method.startswith('notifications/'):
+            return None
+
+        try:
+            if method == 'initialize':
+                requested = params.get('protocolVersion')
+                negotiated = requested if requested in SUPPORTED_PROTOCOL_VERSIONS else PROTOCOL_VERSION
+                return _rpc_result(req_id, {
+                    "protocolVersion": negotiated,
+                    "capabilities": {"tools": {"listChanged": False}},
+                    "serverInfo": {"name": server_name, "version": version}
+                })
+            if method == 'ping':
+                return _rpc_result(req_id, {})
+            if method == 'tools/list':
+                return _rpc_result(req_id, {"tools": [
+                    {
+                        "name": t['name'],
+                        "description": t.get('description', ''),
+                        "inputSchema": t.get('parameters') or {"type": "object", "properties": {}}
+                    }
+                    for t in tools
+                ]})
+            if method == 'tools/call':
+                name = params.get('name')
+                tool = next((t for t in tools if t['name'] == name), None)
+                if tool is None or not tool.get('endpoint'):
+                    return _rpc_error(req_id, INVALID_PARAMS, f"Unknown tool: {name}")
+                route_method, route_path, args = resolve_endpoint(tool['endpoint'], params.get('arguments'))
+                status_code, data = call_route(app, route_method, route_path, args)
+                return _rpc_result(req_id, _tool_result(status_code, data))
+            return _rpc_error(req_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+        except Exception as e:
+            return _rpc_error(req_id, INTERNAL_ERROR, str(e))
+
+    def mcp_post():
+        try:
+            payload = json.loads(request.get_data(as_text=True) or 'null')
+        except ValueError:
+            return jsonify(_rpc_error(None, PARSE_ERROR, "Parse error")), 400
+
+        messages = payload if isinstance(payload, list) else [payload]
+        is_initialize = any(isinstance(m, dict) and m.get('method') == 'initialize' for m in messages)
+
+        session_id = request.headers.get('Mcp-Session-Id')
+        if is_initialize:
+            session_id = uuid.uuid4().hex
+            now = time.time()
+            with sessions_lock:
+                prune_sessions(now)
+                sessions[session_id] = {"created_at": now, "last_used_at": now}
+        else:
+            if not session_id:
+                return jsonify(_rpc_error(None, INVALID_REQUEST, "Mcp-Session-Id header required")), 400
+            now = time.time()
+            with sessions_lock:
+                session = sessions.get(session_id)
+                if session is None or now - session["last_used_at"] >= SESSION_IDLE_TTL:
+                    sessions.pop(session_id, None)
+                    return jsonify(_rpc_error(None, INVALID_REQUEST, "Session not found")), 404
+                session["last_used_at"] = now
+                sessions.move_to_end(session_id)
+
+        responses = [r for r in (handle(m, session_id) for m in messages) if r is not None]
+        headers = {'Mcp-Session-Id': session_id}
+        if not responses:
+            # 알림/응답만 있는 경우
+            return Response(status=202, headers=headers)
+
+        body = responses if isinstance(payload, list) else responses[0]
+        accept = request.headers.get('Accept', '')
+        if 'text/event-stream' in accept and 'application/json' not in accept:
+            events = ''.join(
+                f"event: message\ndata: {json.dumps(r, ensure_ascii=False)}\n\n" for r in responses
+            )
+            return Response(events, status=200, mimetype='text/event-stream', headers=headers)
+        resp = jsonify(body)
+        resp.headers.update(headers)
+        return resp, 200
+
+    def mcp_get():
+        # 서버 발신(notification) 스트림은 제공하지 않음
+        return Response(status=405, headers={'Allow': 'POST, DELETE'})
+
+    def mcp_delete():
+        session_id = request.headers.get('Mcp-Session-Id')
+        with sessions_lock:
+            removed = sessions.pop(session_id, None) if session_id else None
+        return Response(status=200 if removed else 404)
+
+    app.add_url_rule(path, 'mcp_jsonrpc_post', mcp_post, methods=['POST'])
+    app.add_url_rule(path, 'mcp_jsonrpc_get', mcp_get, methods=['GET'])
+    app.add_url_rule(path, 'mcp_jsonrpc_delete', mcp_delete, methods=['DELETE'])
@@ -0,0 +1,162 @@
+"""
+페이지 단위 목록 API 전체 캐시 (동시 페이지 조회 + 페이지별 ETag/Last-Modified 재검증)
+
+- refresh(): 1페이지로 전체 건수를 확인한 뒤 나머지 페이지를 동시에 조회해 전체 목록을 만듭니다.
+  전체 건수를 알 수 없으면 workers개 페이지씩 묶어 조회하고 짧은(빈) 페이지가 나오면 멈춥니다.
+- 두 번째 refresh부터는 페이지마다 저장된 ETag/Last-Modified로 조건부 요청(If-None-Match/If-Modified-Since)을 보내고
+  304 페이지는 저장된 항목을 그대로 씁니다.
+- 응답 본문 구조가 확정되지 않았으므로 항목 목록/전체 건수는 흔한 키(list/items/content/rows/data, total/totalCount 등)에서 찾습니다.
+
+호출 측은 보통 swr_cache.SWRCache의 loader로 refresh를 넘겨 TTL/백그라운드 갱신을 맡깁니다.
+"""
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+ITEM_KEYS = ('list', 'items', 'content', 'rows', 'results', 'data')
+TOTAL_KEYS = ('total', 'total_count', 'totalCount', 'totalElements')
+
+
+def page_items(payload):
+    """응답 본문에서 항목 목록 추출"""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for key in ITEM_KEYS:
+            value = payload.get(key)
+            if isinstance(value, list):
+                return value
+            if isinstance(value, dict):
+                return page_items(value)
+    return []
+
+
+def page_total(payload):
+    """응답 본문에서 전체 건수 추출 (없으면 None)"""
+    if isinstance(payload, dict):
+        for key in TOTAL_KEYS:
+            if isinstance(payload.get(key), int):
+                return payload[key]
+        for value in payload.values():
+            if isinstance(value, dict):
+                total = page_total(value)
+                if total is not None:
+                    return total
+    return None
+
+
+class CatalogFetchError(Exception):
+    """페이지 조회 실패 (200/304 이외 응답)"""
+
+    def __init__(self, status_code, body):
+        super().__init__(f"upstream error: {status_code} {str(body)[:200]}")
+        self.status_code = status_code
+        self.body = body
+
+
+class PagedCatalog:
+    """페이지별 검증자(ETag/Last-Modified) + 항목을 보관하는 전체 목록"""
+
+    def __init__(self, fetch_page, limit=100, workers=6, max_pages=500, name='paged_catalog'):
+        """
+        Args:
+            fetch_page (callable): fn(page, limit, headers) -> requests.Response (headers는 조건부 요청 헤더)
+            limit (int): 페이지 크기
+            workers (int): 동시 조회 수
+            max_pages (int): 안전 상한
+            name (str): 로그 이름
+        """
+        self.fetch_page = fetch_page
+        self.limit = limit
+        self.workers = max(1, workers)
+        self.max_pages = max_pages
+        self.name = name
+        self._pages = {}   # page -> {"etag", "last_modified", "items", "total"}
+        self._lock = threading.Lock()
+        self.refreshed_at = None
+        self.last_refresh = None
+
+    def _fetch(self, page, limit, stats):
+        """페이지 하나 조회 -> (items, total, 304 여부)"""
+        with self._lock:
+            cached = self._pages.get(page)
+        headers = {}
+        if cached and cached.get("limit") == limit:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        resp = self.fetch_page(page, limit, headers)
+        if resp.status_code == 304 and cached:
+            stats["not_modified"] += 1
+            return cached["items"], cached["total"], True
+        if resp.status_code != 200:
+            raise CatalogFetchError(resp.status_code, resp.text)
+        payload = resp.json()
+        entry = {
+            "etag": resp.headers.get('ETag'),
+            "last_modified": resp.headers.get('Last-Modified'),
+            "items": page_items(payload),
+            "total": page_total(payload),
+            "limit": limit
+        }
+        with self._lock:
+            self._pages[page] = entry
+        stats["fetched"] += 1
+        return entry["items"], entry["total"], False
+
+    def refresh(self):
+        """
+        전체 목록 재구성 (변경 없는 페이지는 304로 재사용)
+
+        Returns:
+            list: 전체 항목 (페이지 순서)
+        Raises:
+            CatalogFetchError / requests 예외
+        """
+        t0 = time.perf_counter()
+        stats = {"fetched": 0, "not_modified": 0}
+        limit = self.limit
+        first, total, _ = self._fetch(1, limit, stats)
+        # 서버가 페이지 크기를 더 작게 제한하면 실제 크기로 페이지 수를 계산
+        if total is not None and len(first) < limit and total > len(first) and first:
+            limit = len(first)
+        pages = [first]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            if total is not None:
+                last_page = min(self.max_pages, max(1, math.ceil(total / limit)))
+                rest = list(pool.map(lambda p: self._fetch(p, limit, stats)[0], range(2, last_page + 1)))
+                pages.extend(rest)
+            else:
+                last_page = 1
+                done = len(first) < limit
+                while not done and last_page < self.max_pages:
+                    batch = range(last_page + 1, min(self.max_pages, last_page + self.workers) + 1)
+                    for items in pool.map(lambda p: self._fetch(p, limit, stats)[0], batch):
+                        if done:
+                            break
+                        pages.append(items)
+                        last_page += 1
+                        done = len(items) < limit
+        with self._lock:
+            for page in [p for p in self._pages if p > last_page]:
+                del self._pages[page]
+        items = [item for page in pages for item in page]
+        self.refreshed_at = datetime.now().isoformat()
+        self.last_refresh = {
+            **stats,
+            "pages": last_page,
+            "page_limit": limit,
+            "items": len(items),
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1)
+        }
+        print(f"[{self.name}] refreshed {len(items)} items: {last_page} pages "
+              f"({stats['fetched']} fetched, {stats['not_modified']} not modified)")
+        return items
+
+    def snapshot(self):
+        with self._lock:
+            pages = len(self._pages)
+        return {"pages_cached": pages, "refreshed_at": self.refreshed_at, "last_refresh": self.last_refresh}
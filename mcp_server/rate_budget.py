@@ -0,0 +1,186 @@
+"""
+응답 헤더 기반 레이트 리밋 예산 스케줄러 (GitHub X-RateLimit-Limit/Remaining/Reset)
+
+- 매 응답(304, 오류 포함)의 X-RateLimit-* 헤더로 남은 예산과 리셋 시각을 갱신합니다.
+- 우선순위
+  - interactive(채팅 중 호출): 예산이 남아 있으면 바로 진행하고, 대기 중인 background보다 항상 먼저 나갑니다.
+    예산이 소진되면 리셋까지 기다리지 않고 RateLimitExhausted (max_wait 이내로 풀리는 경우만 대기)
+  - background(선조회/동기화): 남은 예산이 reserve 이하이면 리셋까지 미루고,
+    남은 예산이 limit * pace_below 아래로 내려가면 리셋까지 남은 시간에 고르게 퍼지도록 호출 간격을 둡니다.
+- 403/429 응답에 Retry-After가 있거나 남은 예산이 0이면 그 시각까지 새 호출을 막습니다. (2차 레이트 리밋 포함)
+- 진행 중인 호출 수만큼 남은 예산에서 미리 빼고 판단하므로 동시 호출로 예산을 넘기지 않습니다.
+"""
+import threading
+import time
+from datetime import datetime
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+
+class RateLimitExhausted(Exception):
+    """예산 소진으로 호출하지 않음"""
+
+    def __init__(self, retry_at):
+        self.retry_at = retry_at
+        self.retry_after = max(0.0, retry_at - time.time()) if retry_at else None
+        super().__init__(f"rate limit exhausted, retry after {round(self.retry_after or 0)}s")
+
+
+class RateBudget:
+    """남은 예산 + 우선순위별 대기 관리"""
+
+    def __init__(self, reserve=100, pace_below=0.5, interactive_max_wait=5.0, background_max_wait=3600.0):
+        """
+        Args:
+            reserve (int): background가 쓰지 않고 interactive용으로 남겨 둘 예산
+            pace_below (float): 남은 예산 비율이 이 값 아래면 background 호출 간격 조절
+            interactive_max_wait (float): interactive가 차단 해제를 기다릴 최대 시간(초)
+            background_max_wait (float): background가 기다릴 최대 시간(초)
+        """
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self.interactive_max_wait = interactive_max_wait
+        self.background_max_wait = background_max_wait
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.resource = None
+        self.updated_at = None
+        self.blocked_until = 0.0
+        self._inflight = 0
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._last_background = 0.0
+        self._cond = threading.Condition()
+        self.stats = {INTERACTIVE: 0, BACKGROUND: 0, "delayed": 0, "rejected": 0, "throttled_responses": 0}
+
+    def _available(self, now):
+        """진행 중 호출을 뺀 남은 예산 (모르거나 리셋 시각이 지났으면 None)"""
+        if self.remaining is None or not self.reset_at or now >= self.reset_at:
+            return None
+        return self.remaining - self._inflight
+
+    def _reserve(self):
+        """limit이 작은 경우(미인증 60회 등) reserve가 예산 전체를 막지 않도록 limit의 20%로 제한"""
+        return min(self.reserve, int(self.limit * 0.2)) if self.limit else self.reserve
+
+    def _wait_time(self, priority, now):
+        """지금 진행하려면 더 기다려야 하는 시간(초), 0이면 진행"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        available = self._available(now)
+        if priority == INTERACTIVE:
+            if available is not None and available <= 0:
+                return self.reset_at - now
+            return 0.0
+        if self._waiting[INTERACTIVE]:
+            return 0.5
+        if available is None:
+            return 0.0
+        reserve = self._reserve()
+        if available <= reserve:
+            return self.reset_at - now
+        if self.limit and available < self.limit * self.pace_below:
+            interval = (self.reset_at - now) / max(1, available - reserve)
+            return max(0.0, self._last_background + interval - now)
+        return 0.0
+
+    def acquire(self, priority=INTERACTIVE, max_wait=None):
+        """
+        호출 슬롯 획득 (release로 반환)
+
+        Raises:
+            RateLimitExhausted: max_wait 안에 진행할 수 없을 때
+        """
+        if max_wait is None:
+            max_wait = self.interactive_max_wait if priority == INTERACTIVE else self.background_max_wait
+        deadline = time.time() + max_wait
+        delayed = False
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.time()
+                    wait = self._wait_time(priority, now)
+                    if wait <= 0:
+                        break
+                    if now + wait > deadline:
+                        self.stats["rejected"] += 1
+                        raise RateLimitExhausted(now + wait)
+                    if not delayed:
+                        delayed = True
+                        self.stats["delayed"] += 1
+                    self._cond.wait(min(wait, 1.0))
+                self._inflight += 1
+                self.stats[priority] += 1
+                if priority == BACKGROUND:
+                    self._last_background = now
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def release(self, response=None):
+        """호출 완료: 슬롯 반환 + 응답 헤더로 예산 갱신"""
+        with self._cond:
+            self._inflight = max(0, self._inflight - 1)
+            if response is not None:
+                self.update(response.headers, response.status_code)
+            self._cond.notify_all()
+
+    def update(self, headers, status_code=200):
+        """X-RateLimit-* / Retry-After 헤더 반영"""
+        with self._cond:
+            now = time.time()
+            try:
+                if headers.get('X-RateLimit-Remaining') is not None:
+                    self.remaining = int(headers['X-RateLimit-Remaining'])
+                    self.updated_at = now
+                if headers.get('X-RateLimit-Limit') is not None:
+                    self.limit = int(headers['X-RateLimit-Limit'])
+                if headers.get('X-RateLimit-Reset') is not None:
+                    self.reset_at = float(headers['X-RateLimit-Reset'])
+            except (TypeError, ValueError):
+                pass
+            self.resource = headers.get('X-RateLimit-Resource') or self.resource
+            if status_code in (403, 429):
+                retry_after = headers.get('Retry-After')
+                if retry_after is not None:
+                    try:
+                        self.blocked_until = max(self.blocked_until, now + float(retry_after))
+                    except ValueError:
+                        pass
+                elif self.remaining == 0 and self.reset_at:
+                    self.blocked_until = max(self.blocked_until, self.reset_at)
+                self.stats["throttled_responses"] += 1
+            self._cond.notify_all()
+
+    def run(self, request_fn, priority=INTERACTIVE):
+        """슬롯을 잡고 request_fn() 실행 -> requests.Response"""
+        self.acquire(priority)
+        response = None
+        try:
+            response = request_fn()
+            return response
+        finally:
+            self.release(response)
+
+    def snapshot(self):
+        with self._cond:
+            now = time.time()
+            available = self._available(now)
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "used": (self.limit - self.remaining) if self.limit is not None and self.remaining is not None else None,
+                "reset_at": datetime.fromtimestamp(self.reset_at).isoformat() if self.reset_at else None,
+                "reset_in_seconds": round(max(0.0, self.reset_at - now)) if self.reset_at else None,
+                "resource": self.resource,
+                "updated_at": datetime.fromtimestamp(self.updated_at).isoformat() if self.updated_at else None,
+                "reserve_for_interactive": self._reserve(),
+                "background_paused": available is not None and available <= self._reserve(),
+                "background_paced": bool(available is not None and self.limit and available < self.limit * self.pace_below),
+                "blocked_for_seconds": round(max(0.0, self.blocked_until - now), 1),
+                "inflight": self._inflight,
+                "waiting": dict(self._waiting),
+                **self.stats
+            }
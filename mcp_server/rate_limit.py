@@ -0,0 +1,59 @@
+"""
+MCP 서버 공용 토큰 버킷 레이트 리미터
+
+업스트림 API(카카오, devtalk 등) 호출 속도를 초당 rate개, 순간 최대 burst개로 제한합니다.
+여러 스레드가 하나의 버킷을 공유할 수 있습니다. rate <= 0 이면 제한하지 않습니다.
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """초당 rate개 토큰이 채워지는 버킷 (최대 burst개)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """즉시 획득 가능하면 True (대기하지 않음)"""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        토큰을 얻을 때까지 대기
+
+        Returns:
+            bool: timeout 안에 획득했으면 True
+        """
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
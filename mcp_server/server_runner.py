@@ -0,0 +1,44 @@
+"""
+MCP 서버 공통 실행기 (TCP 포트 + 선택적 Unix domain socket)
+
+환경변수:
+- <서버>_MCP_UDS: 소켓 경로 지정 시 해당 경로에서도 수신 (예: KAKAO_MCP_UDS=/tmp/kakao_mcp.sock)
+- MCP_UDS_ONLY: 1/true 이면 TCP 포트 없이 소켓에서만 수신
+"""
+import os
+import threading
+from werkzeug.serving import make_server
+
+
+def _is_serving_process(debug):
+    # debug 리로더 사용 시 실제 서빙은 자식 프로세스(WERKZEUG_RUN_MAIN=true)에서만 수행
+    return not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+
+
+def run_server(app, port, uds_env=None, debug=True, on_start=None):
+    """
+    Flask 앱 실행
+
+    Args:
+        app (Flask): MCP 서버 앱
+        port (int): TCP 포트
+        uds_env (str|None): 소켓 경로를 담은 환경변수 이름
+        debug (bool): Flask debug 모드
+        on_start (callable|None): 서빙 프로세스에서 한 번 호출할 함수 (백그라운드 작업 기동)
+    """
+    uds_path = os.getenv(uds_env, '') if uds_env else ''
+    uds_only = os.getenv('MCP_UDS_ONLY', '').lower() in ('1', 'true', 'yes')
+
+    if on_start is not None and _is_serving_process(debug):
+        on_start()
+
+    if uds_path and uds_only:
+        app.run(debug=debug, host=f'unix://{uds_path}', port=0)
+        return
+
+    if uds_path and _is_serving_process(debug):
+        server = make_server(f'unix://{uds_path}', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, name='uds-server', daemon=True).start()
+        print(f"[server_runner] listening on unix://{uds_path}")
+
+    app.run(debug=debug, host='0.0.0.0', port=port)
@@ -0,0 +1,144 @@
+"""
+stale-while-revalidate 캐시 (느린 업스트림 조회 결과 재사용)
+
+- TTL 이내: 캐시된 결과를 그대로 반환
+- TTL 경과 ~ max_stale 이내: 캐시된 결과를 즉시 반환하고 백그라운드에서 갱신
+- 캐시가 없거나 max_stale 초과(또는 force): 조회가 끝날 때까지 대기
+- 같은 키의 조회는 동시에 하나만 실행되고, 나머지 요청은 그 결과를 함께 받습니다. (single-flight)
+- 백그라운드 갱신이 실패하면 이전 결과를 유지하고 last_error에 기록합니다.
+"""
+import threading
+import time
+from datetime import datetime
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SWRCache:
+    """키별 결과 + 조회 시각 캐시"""
+
+    def __init__(self, ttl=60, max_stale=3600, name='swr_cache'):
+        """
+        Args:
+            ttl (float): 이 시간(초) 안의 결과는 새것으로 간주
+            max_stale (float): 이 시간(초)을 넘은 결과는 반환하지 않고 새로 조회 (0 이하이면 무제한)
+            name (str): 로그/스레드 이름
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.name = name
+        self._entries = {}   # key -> (value, fetched_at)
+        self._flights = {}   # key -> _Flight (진행 중 조회)
+        self._errors = {}    # key -> 마지막 갱신 오류
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "upstream_calls": 0, "coalesced": 0}
+
+    def _run(self, key, loader, flight):
+        self.stats["upstream_calls"] += 1
+        try:
+            value = loader()
+            with self._lock:
+                self._entries[key] = (value, time.time())
+                self._errors.pop(key, None)
+            flight.value = value
+        except Exception as e:
+            with self._lock:
+                self._errors[key] = str(e)
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _start_flight(self, key, loader, background):
+        """진행 중인 조회가 있으면 (flight, False), 없으면 새로 시작해 (flight, True)"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.stats["coalesced"] += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+        if background:
+            threading.Thread(target=self._run, args=(key, loader, flight),
+                             name=f"{self.name}-refresh", daemon=True).start()
+        else:
+            self._run(key, loader, flight)
+        return flight, True
+
+    def _meta(self, key, fetched_at, cached, stale):
+        with self._lock:
+            refreshing = key in self._flights
+            last_error = self._errors.get(key)
+        return {
+            "cached": cached,
+            "stale": stale,
+            "refreshing": refreshing,
+            "fetched_at": datetime.fromtimestamp(fetched_at).isoformat(),
+            "age_seconds": round(max(0.0, time.time() - fetched_at), 1),
+            "ttl_seconds": self.ttl,
+            "last_refresh_error": last_error
+        }
+
+    def get(self, key, loader, force=False):
+        """
+        캐시 조회 (필요하면 loader 실행)
+
+        Args:
+            key: 캐시 키
+            loader (callable): fn() -> value (실패 시 예외)
+            force (bool): True면 캐시를 무시하고 조회 완료까지 대기
+        Returns:
+            tuple: (value, meta dict)
+        Raises:
+            대기 조회가 실패하면 loader의 예외
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        now = time.time()
+        if entry is not None and not force:
+            value, fetched_at = entry
+            age = now - fetched_at
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return value, self._meta(key, fetched_at, cached=True, stale=False)
+            if self.max_stale <= 0 or age < self.max_stale:
+                self.stats["stale_hits"] += 1
+                self._start_flight(key, loader, background=True)
+                return value, self._meta(key, fetched_at, cached=True, stale=True)
+
+        self.stats["misses"] += 1
+        flight, _ = self._start_flight(key, loader, background=False)
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        with self._lock:
+            _, fetched_at = self._entries[key]
+        return flight.value, self._meta(key, fetched_at, cached=False, stale=False)
+
+    def invalidate(self, key=None):
+        """키(생략 시 전체) 캐시 삭제 (진행 중인 조회 결과는 그대로 저장됨)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._errors.clear()
+            else:
+                self._entries.pop(key, None)
+                self._errors.pop(key, None)
+
+    def snapshot(self):
+        with self._lock:
+            entries = {
+                str(key): {
+                    "fetched_at": datetime.fromtimestamp(fetched_at).isoformat(),
+                    "age_seconds": round(time.time() - fetched_at, 1),
+                    "refreshing": key in self._flights,
+                    "last_refresh_error": self._errors.get(key)
+                }
+                for key, (_, fetched_at) in self._entries.items()
+            }
+        return {"ttl_seconds": self.ttl, "max_stale_seconds": self.max_stale, **self.stats, "entries": entries}
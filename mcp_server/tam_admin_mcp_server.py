@@ -1,16 +1,31 @@
 """
 tam-admin API 연동을 위한 로컬 MCP 서버 (스캐폴딩)
 
-현재는 헬스체크 및 기능 목록(capabilities)만 제공하고,
-제너릭 프록시 엔드포인트는 501(Not Implemented)을 반환합니다.
+제너릭 프록시(/mcp/tam-admin/proxy)는 허용된 action만 TAM_ADMIN_API_HOST의 고정 method/path로 전달합니다.
+(PROXY_ACTIONS + TAM_ADMIN_PROXY_ACTIONS env JSON으로 추가) 업스트림 호출은 연결 풀 세션을 공유하고,
+GET action은 action별 TTL(cache_ttl) 동안 같은 파라미터의 응답을 재사용합니다.
+
+데브톡 사전 답변 목록은 all=true이면 전체 페이지를 동시에 받아 메모리에 두고(페이지별 ETag/Last-Modified 조건부 재검증),
+major_category/sub_category 필터는 메모리에서 잘라 응답합니다.
 
 환경 변수:
 - TAM_ADMIN_API_BASE_URL: 실제 tam-admin API 루트 URL (미정)
 - TAM_ADMIN_MCP_SERVER_PORT: 이 MCP 서버 포트 (기본 5005)
+- TAM_ADMIN_MATCHING_TTL: 전체 사전 답변 목록 재검증 주기(초, 기본 300)
+- TAM_ADMIN_FETCH_WORKERS: 전체 목록 동시 페이지 조회 수 (기본 6)
+- TAM_ADMIN_PROXY_ACTIONS: 프록시 action 추가 JSON
+  예) {"get_customer": {"method": "GET", "path": "/api/customers/{customer_id}", "cache_ttl": 30}}
+- TAM_ADMIN_POOL_SIZE: 업스트림 연결 풀 크기 (기본 10)
 """
+import json
+import time
 import os
 import requests
 from flask import Flask, request, jsonify
+from server_runner import run_server
+from mcp_jsonrpc import register_mcp_endpoint
+from paged_catalog import PagedCatalog, CatalogFetchError
+from swr_cache import SWRCache
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -26,6 +41,68 @@ TAM_ADMIN_API_HOST = os.getenv('TAM_ADMIN_API_HOST', '')
 TAM_ADMIN_API_AUTH = os.getenv('TAM_ADMIN_API_AUTH', '')
 TAM_ADMIN_API_UA = 'tam-batch'
 TAM_ADMIN_CLIENT = 'TAM-AGENT'
+MATCHING_PAGE_LIMIT = 100
+
+# 제너릭 프록시 허용 action -> 업스트림 method/path (path의 {name}은 payload 값으로 채움)
+# cache_ttl(초) > 0인 GET action은 같은 파라미터 응답을 TTL 동안 재사용
+PROXY_ACTIONS = {
+    "get_devtalk_chat_matching_list": {"method": "GET", "path": "/api/devtalk/chat-matching-list", "cache_ttl": 60},
+}
+try:
+    PROXY_ACTIONS.update(json.loads(os.getenv('TAM_ADMIN_PROXY_ACTIONS') or '{}'))
+except ValueError as e:
+    print("[tam_admin_mcp_server] TAM_ADMIN_PROXY_ACTIONS 파싱 실패:", e)
+
+# 업스트림 연결 풀 (keep-alive 재사용)
+POOL_SIZE = int(os.getenv('TAM_ADMIN_POOL_SIZE', 10))
+http = requests.Session()
+http.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=POOL_SIZE))
+http.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=POOL_SIZE))
+
+# GET action 응답 캐시 (action별 TTL, TTL이 지나면 새로 조회)
+proxy_caches = {
+    name: SWRCache(ttl=spec["cache_ttl"], max_stale=spec["cache_ttl"], name=f"tam-admin-{name}")
+    for name, spec in PROXY_ACTIONS.items()
+    if spec.get("method", "GET").upper() == "GET" and spec.get("cache_ttl", 0) > 0
+}
+
+# MCP 도구 목록 (parameters: OpenAI/JSON Schema, endpoint: 호출 라우트)
+TOOLS = [
+    {
+        "name": "tam_admin_action",
+        "description": "tam-admin API 제너릭 액션 프록시 (허용된 action만, GET 응답 캐시)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "action": {"type": "string", "enum": sorted(PROXY_ACTIONS), "description": "수행할 액션명"},
+                "payload": {"type": "object", "description": "경로 변수 + 요청 파라미터(GET은 query, 그 외는 JSON 바디)"},
+                "method": {"type": "string", "description": "HTTP 메소드 (생략 시 action에 정해진 메소드)"},
+                "no_cache": {"type": "boolean", "description": "true면 캐시를 쓰지 않고 조회"}
+            },
+            "required": ["action"]
+        },
+        "endpoint": {"method": "POST", "path": "/mcp/tam-admin/proxy"}
+    },
+    {
+        "name": "get_devtalk_chat_matching_list",
+        "description": "분류별 데브톡 사전 답변 목록 조회. all=true로 호출하면 전체 사전 답변에서 분류 필터 (캐시, 왕복 1회)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "major_category": {"type": "string", "description": "대분류 (선택)"},
+                "sub_category": {"type": "string", "description": "소분류 (선택)"},
+                "all": {"type": "boolean", "description": "true면 전체 페이지 목록(캐시)에서 필터링 (권장, 생략 시 단일 페이지 조회)"},
+                "page": {"type": "integer", "description": "페이지 (기본 1)"},
+                "limit": {"type": "integer", "description": "페이지 크기 (all=false 기본 20, all=true는 생략 시 전체)"}
+            },
+            "required": []
+        },
+        "endpoint": {"method": "GET", "path": "/mcp/tam-admin/devtalk-chat-matching-list"}
+    }
+]
+
+# 표준 MCP JSON-RPC 엔드포인트 (POST /mcp: initialize, tools/list, tools/call)
+register_mcp_endpoint(app, 'tam_admin_mcp_server', TOOLS)
 
 @app.route('/mcp/tam-admin/health', methods=['GET'])
 def health_check():
@@ -39,33 +116,110 @@ def health_check():
 
 @app.route('/mcp/tam-admin/capabilities', methods=['GET'])
 def get_capabilities():
-    """MCP 서버가 제공(예정)하는 기능 목록(placeholder)"""
+    """MCP 서버가 제공하는 기능 목록"""
+    return jsonify({"tools": TOOLS}), 200
+
+def tam_admin_headers():
+    return {
+        "Authorization": TAM_ADMIN_API_AUTH,
+        "User-Agent": TAM_ADMIN_API_UA,
+        "TAM-CLIENT": TAM_ADMIN_CLIENT,
+    }
+
+def fetch_matching_page(page, limit, conditional_headers):
+    """전체 목록용 사전 답변 페이지 조회 (조건부 요청 헤더 포함)"""
+    url = TAM_ADMIN_API_HOST.rstrip("/") + "/api/devtalk/chat-matching-list"
+    return http.get(url, headers={**tam_admin_headers(), **conditional_headers},
+                    params={'page': page, 'limit': limit}, timeout=10)
+
+matching_catalog = PagedCatalog(
+    fetch_matching_page,
+    limit=MATCHING_PAGE_LIMIT,
+    workers=int(os.getenv('TAM_ADMIN_FETCH_WORKERS', 6)),
+    name='tam_admin_matching'
+)
+# 전체 목록 + 분류 인덱스 캐시 (TTL이 지나면 이전 목록으로 응답하며 백그라운드 재검증)
+matching_cache = SWRCache(
+    ttl=float(os.getenv('TAM_ADMIN_MATCHING_TTL', 300)),
+    max_stale=float(os.getenv('TAM_ADMIN_MATCHING_MAX_STALE', 24 * 3600)),
+    name='tam-admin-matching'
+)
+
+def _category(item, *keys):
+    for key in keys:
+        value = item.get(key) if isinstance(item, dict) else None
+        if value is not None:
+            return str(value)
+    return None
+
+def build_matching_index():
+    """전체 사전 답변 -> {"items", "by_major", "by_pair", "categories"}"""
+    items = matching_catalog.refresh()
+    by_major, by_pair = {}, {}
+    for item in items:
+        major = _category(item, 'major_category', 'majorCategory')
+        sub = _category(item, 'sub_category', 'subCategory')
+        by_major.setdefault(major, []).append(item)
+        by_pair.setdefault((major, sub), []).append(item)
+    categories = {}
+    for (major, sub), pair_items in by_pair.items():
+        categories.setdefault(major or '', {})[sub or ''] = len(pair_items)
+    return {"items": items, "by_major": by_major, "by_pair": by_pair, "categories": categories}
+
+def matching_list_from_cache():
+    """all=true: 전체 목록 캐시에서 분류 필터 + (선택) 페이지 슬라이스"""
+    major = request.args.get('major_category') or None
+    sub = request.args.get('sub_category') or None
+    force = (request.args.get('refresh') or '').lower() in ('1', 'true', 'yes')
+    try:
+        index, meta = matching_cache.get('all', build_matching_index, force=force)
+    except CatalogFetchError as e:
+        return jsonify({
+            "success": False,
+            "error": f"tam-admin API 오류: {e.status_code}",
+            "error_message": e.body,
+            "status_code": e.status_code,
+        }), e.status_code
+    except requests.Timeout:
+        return jsonify({"success": False, "error": "tam-admin API 호출 시간 초과"}), 504
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+    if major and sub:
+        items = index["by_pair"].get((major, sub), [])
+    elif major:
+        items = index["by_major"].get(major, [])
+    elif sub:
+        items = [item for (_, s), pair_items in index["by_pair"].items() if s == sub for item in pair_items]
+    else:
+        items = index["items"]
+    total = len(items)
+    limit = request.args.get('limit', type=int)
+    page = request.args.get('page', default=1, type=int) or 1
+    if limit:
+        items = items[(page - 1) * limit:page * limit]
     return jsonify({
-        "tools": [
-            {
-                "name": "tam_admin_action",
-                "description": "tam-admin API에 대한 제너릭 액션 프록시 (스펙 확정 전)",
-                "parameters": {
-                    "action": "string (required) - 수행할 액션명",
-                    "payload": "object (optional) - 요청 바디",
-                    "method": "string (optional) - HTTP 메소드 (기본 POST)"
-                }
-            },
-            {
-                "name": "get_devtalk_chat_matching_list",
-                "description": "분류별 데브톡 사전 답변 목록 조회",
-                "parameters": {}
-            }
-        ]
+        "success": True,
+        "data": items,
+        "total": total,
+        "total_all": len(index["items"]),
+        "filters": {"major_category": major, "sub_category": sub, "page": page if limit else None, "limit": limit},
+        "categories": index["categories"] if not (major or sub) else None,
+        "cache": {**meta, "catalog": matching_catalog.snapshot()}
     }), 200
 
 @app.route('/mcp/tam-admin/devtalk-chat-matching-list', methods=['GET'])
 def devtalk_chat_matching_list():
     """
     분류별 데브톡 사전 답변 목록 조회 프록시 - page=1, limit=20 기본값 적용
+
+    all=true: 전체 페이지를 캐시해 두고 major_category/sub_category 필터를 메모리에서 적용
+              (limit를 주면 필터 결과를 page/limit로 자름, refresh=true면 즉시 재검증)
     """
     if not TAM_ADMIN_API_HOST:
         return jsonify({"success": False, "error": "TAM_ADMIN_API_HOST env not set"}), 500
+    if (request.args.get('all') or '').lower() in ('1', 'true', 'yes'):
+        return matching_list_from_cache()
 
     url = TAM_ADMIN_API_HOST.rstrip("/") + "/api/devtalk/chat-matching-list"
     params = {}
@@ -78,13 +232,8 @@ def devtalk_chat_matching_list():
         params['page'] = 1
     if 'limit' not in params:
         params['limit'] = 20
-    headers = {
-        "Authorization": TAM_ADMIN_API_AUTH,
-        "User-Agent": TAM_ADMIN_API_UA,
-        "TAM-CLIENT": TAM_ADMIN_CLIENT,
-    }
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=10)
+        resp = http.get(url, headers=tam_admin_headers(), params=params, timeout=10)
         if resp.status_code == 200:
             return jsonify({"success": True, "data": resp.json()}), 200
         else:
@@ -99,40 +248,122 @@ def devtalk_chat_matching_list():
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+class ProxyUpstreamError(Exception):
+    """프록시 업스트림 오류 응답 (2xx 이외)"""
+
+    def __init__(self, status_code, body):
+        super().__init__(f"tam-admin API 오류: {status_code}")
+        self.status_code = status_code
+        self.body = body
+
+def resolve_action(spec, payload):
+    """action 정의 + payload -> (method, path, 나머지 파라미터) (경로 변수가 없으면 KeyError)"""
+    method = spec.get("method", "GET").upper()
+    path = spec["path"]
+    path_keys = [part[1:-1] for part in path.split('/') if part.startswith('{') and part.endswith('}')]
+    values = {key: requests.utils.quote(str(payload[key]), safe='') for key in path_keys}
+    rest = {k: v for k, v in payload.items() if k not in path_keys}
+    return method, path.format(**values), rest
+
+def call_action(method, path, params):
+    """업스트림 호출 -> 응답 JSON (2xx 이외는 ProxyUpstreamError)"""
+    url = TAM_ADMIN_API_HOST.rstrip("/") + path
+    if method == 'GET':
+        resp = http.request(method, url, headers=tam_admin_headers(), params=params, timeout=10)
+    else:
+        resp = http.request(method, url, headers=tam_admin_headers(), json=params, timeout=15)
+    if not 200 <= resp.status_code < 300:
+        raise ProxyUpstreamError(resp.status_code, resp.text)
+    if not resp.content:
+        return None
+    try:
+        return resp.json()
+    except ValueError:
+        return resp.text
+
 @app.route('/mcp/tam-admin/proxy', methods=['POST'])
 def tam_admin_proxy():
     """
-    제너릭 프록시 (스펙 확정 전): 현재는 501 반환
+    제너릭 프록시: 허용된 action만 정해진 method/path로 전달
 
     Request Body 예시:
     {
-        "action": "get_customer",
-        "payload": { ... },
-        "method": "POST"
+        "action": "get_devtalk_chat_matching_list",
+        "payload": {"major_category": "login", "page": 1, "limit": 20},
+        "no_cache": false
     }
+
+    GET action은 cache_ttl 동안 같은 payload 응답을 재사용하고(cache.cached), 그 외 action이 성공하면 GET 캐시를 비웁니다.
     """
     try:
         data = request.get_json(silent=True) or {}
         action = data.get('action')
-        payload = data.get('payload')
-        method = data.get('method', 'POST').upper()
+        payload = data.get('payload') or {}
+        spec = PROXY_ACTIONS.get(action)
+        if spec is None:
+            return jsonify({
+                "success": False,
+                "error": f"허용되지 않은 action입니다: {action}",
+                "allowed_actions": sorted(PROXY_ACTIONS)
+            }), 400
+        if not isinstance(payload, dict):
+            return jsonify({"success": False, "error": "payload는 객체여야 합니다."}), 400
+        if not TAM_ADMIN_API_HOST:
+            return jsonify({"success": False, "error": "TAM_ADMIN_API_HOST env not set"}), 500
+        try:
+            method, path, params = resolve_action(spec, payload)
+        except KeyError as e:
+            return jsonify({"success": False, "error": f"payload에 경로 변수 {e.args[0]}가 필요합니다."}), 400
+        requested = (data.get('method') or method).upper()
+        if requested != method:
+            return jsonify({"success": False, "error": f"{action}은 {method} 전용입니다."}), 400
 
+        t0 = time.perf_counter()
+        cache = proxy_caches.get(action)
+        meta = None
+        if cache is not None:
+            key = json.dumps([path, params], sort_keys=True, ensure_ascii=False, default=str)
+            result, meta = cache.get(key, lambda: call_action(method, path, params), force=bool(data.get('no_cache')))
+        else:
+            result = call_action(method, path, params)
+            if method != 'GET':
+                for get_cache in proxy_caches.values():
+                    get_cache.invalidate()
         return jsonify({
-            "success": False,
-            "error": "Not Implemented",
-            "message": "tam-admin API 스펙 확정 전입니다.",
+            "success": True,
             "action": action,
             "method": method,
+            "data": result,
+            "cache": meta,
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
             "timestamp": datetime.now().isoformat()
-        }), 501
+        }), 200
+    except ProxyUpstreamError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "error_message": e.body,
+            "status_code": e.status_code,
+        }), e.status_code
+    except requests.Timeout:
+        return jsonify({"success": False, "error": "tam-admin API 호출 시간 초과"}), 504
     except Exception as e:
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
+@app.route('/mcp/tam-admin/cache', methods=['GET'])
+def cache_status():
+    """전체 사전 답변 목록/프록시 응답 캐시 상태"""
+    return jsonify({
+        "success": True,
+        "matching_list": {**matching_cache.snapshot(), "catalog": matching_catalog.snapshot()},
+        "proxy": {name: cache.snapshot() for name, cache in proxy_caches.items()}
+    }), 200
+
 if __name__ == '__main__':
     port = int(os.getenv('TAM_ADMIN_MCP_SERVER_PORT', 5005))
-    app.run(debug=True, host='0.0.0.0', port=port)
+    run_server(app, port, uds_env='TAM_ADMIN_MCP_UDS')
 
 
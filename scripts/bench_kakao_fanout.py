@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+친구에게 보내기 fan-out 처리량 벤치마크 (로컬 가짜 카카오 API)
+
+가짜 API는 실제 제약을 흉내 냅니다.
+- 호출당 수신자 5명 초과 시 400
+- 호출마다 --latency 초 지연
+- 수신자별 첫 시도는 --fail-rate 확률로 failure_info에 담아 실패 (재시도 시 성공)
+
+사용법:
+    python scripts/bench_kakao_fanout.py [-n 200] [--latency 0.08] [--fail-rate 0.05]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'mcp_server'))
+
+import kakao_mcp_server
+from rate_limit import TokenBucket
+
+MAX_RECEIVERS = 5
+
+
+def make_fake_kakao(latency, fail_rate):
+    seen = set()
+    seen_lock = threading.Lock()
+    stats = {"calls": 0}
+
+    class FakeKakao(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            form = parse_qs(self.rfile.read(length).decode('utf-8'))
+            uuids = json.loads(form.get('receiver_uuids', ['[]'])[0])
+            stats["calls"] += 1
+            time.sleep(latency)
+            if len(uuids) > MAX_RECEIVERS:
+                self._reply(400, {"code": -2, "msg": f"receiver_uuids must be <= {MAX_RECEIVERS}"})
+                return
+            ok, failed = [], []
+            with seen_lock:
+                for uuid in uuids:
+                    first = uuid not in seen
+                    seen.add(uuid)
+                    (failed if first and random.random() < fail_rate else ok).append(uuid)
+            body = {"successful_receiver_uuids": ok}
+            if failed:
+                body["failure_info"] = [{"code": -532, "msg": "temporary failure", "receiver_uuids": failed}]
+            self._reply(200, body)
+
+        def _reply(self, status, body):
+            raw = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def log_message(self, *args):
+            pass
+
+    return FakeKakao, seen, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=200, help='수신자 수')
+    parser.add_argument('--latency', type=float, default=0.08, help='가짜 API 호출당 지연(초)')
+    parser.add_argument('--fail-rate', type=float, default=0.05, help='수신자별 첫 시도 실패 확률')
+    opts = parser.parse_args()
+
+    handler, seen, stats = make_fake_kakao(opts.latency, opts.fail_rate)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ['KAKAO_API_BASE_URL'] = f"http://127.0.0.1:{server.server_port}"
+
+    uuids = [f"uuid-{i:05d}" for i in range(opts.n)]
+    configs = [
+        # (이름, 청크 크기, 동시성, 초당 호출 수)
+        ("single-call", opts.n, 1, 0),
+        ("sequential", MAX_RECEIVERS, 1, 0),
+        ("parallel-4", MAX_RECEIVERS, 4, 0),
+        ("parallel-8@20rps", MAX_RECEIVERS, 8, 20),
+        ("parallel-16", MAX_RECEIVERS, 16, 0),
+    ]
+
+    print(f"receivers={opts.n} latency={opts.latency * 1000:.0f}ms fail_rate={opts.fail_rate}")
+    print(f"{'mode':18s} {'sec':>7s} {'recv/s':>8s} {'calls':>6s} {'rounds':>6s} {'ok':>5s} {'failed':>6s}")
+    for name, chunk_size, workers, rate in configs:
+        seen.clear()
+        stats["calls"] = 0
+        messenger = kakao_mcp_server.KakaoMessenger(access_token='bench-token')
+        messenger.friends_chunk_size = chunk_size
+        messenger.send_workers = workers
+        messenger.send_backoff = 0.05
+        messenger.send_limiter = TokenBucket(rate, burst=max(1, workers))
+        t0 = time.perf_counter()
+        result = messenger.send_message_to_friends(uuids, "benchmark")
+        elapsed = time.perf_counter() - t0
+        ok = len(result.get("successful_receiver_uuids", []))
+        failed = sum(len(f.get("receiver_uuids", [])) for f in result.get("failure_info", []))
+        rounds = (result.get("fan_out") or {}).get("rounds", 1)
+        print(f"{name:18s} {elapsed:7.2f} {ok / elapsed:8.0f} {stats['calls']:6d} {rounds:6d} {ok:5d} {failed:6d}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
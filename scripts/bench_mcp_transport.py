@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+MCP 전송 모드별 도구 호출 지연 벤치마크 (http vs embedded)
+
+로컬 가짜 업스트림(카카오/명언/Devtalk API)을 띄우고, MCP 서버들을 같은 프로세스의
+스레드에서 HTTP로 서빙한 뒤 MCPClient를 각 모드로 만들어 도구별 지연을 비교합니다.
+업스트림 응답은 즉시 반환되므로 측정값은 순수하게 웹챗 -> MCP 서버 구간 오버헤드입니다.
+
+사용법:
+    python scripts/bench_mcp_transport.py [-n 200]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'mcp_server'))
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    """모든 요청에 작은 JSON으로 즉시 응답하는 가짜 업스트림"""
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        body = json.dumps({"contents": "bench", "name": "bench", "elements": [], "calendars": []}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_in_thread(server):
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    return server
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=200, help='도구별 호출 횟수')
+    opts = parser.parse_args()
+
+    upstream = serve_in_thread(ThreadingHTTPServer(('127.0.0.1', 0), FakeUpstreamHandler))
+    upstream_url = f"http://127.0.0.1:{upstream.server_address[1]}"
+
+    # MCP 서버 모듈이 import 시점에 환경변수를 읽으므로 먼저 설정
+    os.environ['KAKAO_API_BASE_URL'] = upstream_url
+    os.environ['FAMOUSSAYING_API_URL'] = upstream_url + '/api/famoussaying'
+    os.environ['DEVTALK_HOST'] = upstream_url
+    os.environ.setdefault('DEVTALK_API_KEY', 'bench')
+    os.environ.setdefault('DEVTALK_API_USERNAME', 'bench')
+    os.environ.setdefault('KAKAO_ACCESS_TOKEN', 'bench')
+    # 서버 모듈이 import 시 여는 로컬 저장소(친구 목록, 발송 큐, 토픽 DB, 토큰 등)는 임시 디렉터리로 돌려
+    # 벤치마크가 data/ 아래 실제 파일을 덮어쓰지 않게 함
+    data_dir = tempfile.mkdtemp(prefix='bench-mcp-')
+    for name, filename in (
+        ('KAKAO_TOKENS_PATH', 'kakao_tokens.json'),
+        ('KAKAO_FRIENDS_PATH', 'kakao_friends.json'),
+        ('KAKAO_OUTBOX_PATH', 'kakao_outbox.sqlite3'),
+        ('KAKAO_CAL_IDEMPOTENCY_PATH', 'kakao_calendar_idempotency.sqlite3'),
+        ('KAKAO_HOLIDAYS_PATH', 'kakao_holidays.json'),
+        ('DEVTALK_TOPICS_PATH', 'devtalk_topics.sqlite3'),
+        ('DEVTALK_REPLY_IDEMPOTENCY_PATH', 'devtalk_reply_idempotency.sqlite3'),
+        ('DEVTALK_REPLY_JOBS_PATH', 'devtalk_reply_jobs.sqlite3'),
+        ('GITHUB_REPOS_PATH', 'github_repos.json'),
+    ):
+        os.environ[name] = os.path.join(data_dir, filename)
+
+    import importlib
+    import logging
+    from werkzeug.serving import make_server
+    from mcp_client import MCPClient, MCP_SERVER_MODULES
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    urls = {}
+    for server in ('kakao', 'famoussaying', 'devtalk', 'kakao_calendar'):
+        module = importlib.import_module(MCP_SERVER_MODULES[server])
+        httpd = serve_in_thread(make_server('127.0.0.1', 0, module.app, threaded=True))
+        urls[server] = f"http://127.0.0.1:{httpd.server_port}"
+
+    def make_client(transport):
+        client = MCPClient(base_url=urls['kakao'], transport=transport)
+        client.famoussaying_base_url = urls['famoussaying']
+        client.devtalk_base_url = urls['devtalk']
+        client.kakao_cal_base_url = urls['kakao_calendar']
+        return client
+
+    tools = {
+        'get_famous_saying': lambda c: c.get_famous_saying(),
+        'get_kakao_me': lambda c: c.get_kakao_me(),
+        'get_kakao_friends': lambda c: c.get_kakao_friends(limit=10),
+        'get_devtalk_unanswered_count': lambda c: c.get_devtalk_unanswered_count(),
+        'get_kakao_calendars': lambda c: c.get_kakao_calendars(),
+    }
+
+    print(f"{'tool':32s} {'mode':9s} {'mean_ms':>8s} {'p50_ms':>8s} {'p95_ms':>8s}")
+    for name, call in tools.items():
+        for transport in ('http', 'embedded'):
+            client = make_client(transport)
+            result = call(client)  # 워밍업 (embedded 모듈 적재 포함)
+            if not result.get('success', True):
+                print(f"[warn] {name}/{transport}: {result}")
+            samples = []
+            for _ in range(opts.n):
+                t0 = time.perf_counter()
+                call(client)
+                samples.append((time.perf_counter() - t0) * 1000)
+            print(f"{name:32s} {transport:9s} {statistics.mean(samples):8.2f} "
+                  f"{percentile(samples, 50):8.2f} {percentile(samples, 95):8.2f}")
+
+
+if __name__ == '__main__':
+    main()
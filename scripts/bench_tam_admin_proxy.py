@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+tam-admin 제너릭 프록시 지연 벤치마크 (로컬 스텁 tam-admin)
+
+같은 GET action을 -n번 프록시로 호출하며 모드별 호출 지연을 비교합니다.
+- no-pool: 호출마다 새 연결 (requests 모듈 함수 직접 사용)
+- pooled: 연결 풀 세션, 캐시 미사용(no_cache)
+- pooled+cache: 연결 풀 세션 + action 응답 캐시 (--keys개 고객을 돌아가며 조회)
+
+사용법:
+    python scripts/bench_tam_admin_proxy.py [-n 300] [--latency 0.02] [--keys 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'mcp_server'))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+from stub_tam_admin import start_stub
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=300, help='모드별 호출 수')
+    parser.add_argument('--latency', type=float, default=0.02, help='스텁 응답 지연(초)')
+    parser.add_argument('--keys', type=int, default=10, help='돌아가며 조회할 고객 수')
+    opts = parser.parse_args()
+
+    server, url, state = start_stub(latency=opts.latency)
+    os.environ.update({
+        'TAM_ADMIN_API_HOST': url,
+        'TAM_ADMIN_API_AUTH': 'bench',
+        'TAM_ADMIN_PROXY_ACTIONS': json.dumps({
+            "get_customer": {"method": "GET", "path": "/api/customers/{customer_id}", "cache_ttl": 60}
+        })
+    })
+    import tam_admin_mcp_server
+    client = tam_admin_mcp_server.app.test_client()
+    pooled = tam_admin_mcp_server.http
+
+    modes = [
+        # (이름, HTTP 클라이언트, no_cache)
+        ("no-pool", requests, True),
+        ("pooled", pooled, True),
+        ("pooled+cache", pooled, False),
+    ]
+    print(f"calls={opts.n} stub_latency={opts.latency * 1000:.0f}ms keys={opts.keys}")
+    print(f"{'mode':14s} {'p50 ms':>8s} {'p95 ms':>8s} {'total s':>8s} {'upstream':>9s}")
+    for name, http, no_cache in modes:
+        tam_admin_mcp_server.http = http
+        for cache in tam_admin_mcp_server.proxy_caches.values():
+            cache.invalidate()
+        state["calls"] = 0
+        latencies = []
+        t0 = time.perf_counter()
+        for i in range(opts.n):
+            body = {"action": "get_customer", "payload": {"customer_id": i % opts.keys + 1}, "no_cache": no_cache}
+            start = time.perf_counter()
+            resp = client.post('/mcp/tam-admin/proxy', json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if resp.status_code != 200:
+                print(f"  {name}: call {i} failed: {resp.get_json()}")
+                break
+        total = time.perf_counter() - t0
+        print(f"{name:14s} {statistics.median(latencies):8.2f} {percentile(latencies, 95):8.2f} "
+              f"{total:8.2f} {state['calls']:9d}")
+    tam_admin_mcp_server.http = pooled
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
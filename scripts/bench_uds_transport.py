@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+MCP 서버 전송 계층 지연 벤치마크 (TCP loopback vs Unix domain socket)
+
+같은 MCP 서버 앱을 별도 프로세스에서 TCP 포트와 Unix domain socket으로 동시에 서빙하고,
+MCPClient로 업스트림 호출이 없는 라우트(health, capabilities)를 반복 호출해 비교합니다.
+- tcp-new:  요청마다 새 TCP 연결 (기존 requests.get 방식)
+- tcp:      keep-alive 세션 (MCPClient 기본)
+- uds:      http+unix:// keep-alive 세션
+
+사용법:
+    python scripts/bench_uds_transport.py [-n 2000]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'mcp_server'))
+
+import requests
+from werkzeug.serving import make_server
+
+from mcp_client import MCPClient
+from uds_transport import uds_url
+import famoussaying_mcp_server
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def serve(tcp_port, sock_path):
+    """별도 프로세스: 같은 앱을 TCP와 UDS에서 서빙"""
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    uds_server = make_server(f'unix://{sock_path}', 0, famoussaying_mcp_server.app, threaded=True)
+    threading.Thread(target=uds_server.serve_forever, daemon=True).start()
+    make_server('127.0.0.1', tcp_port, famoussaying_mcp_server.app, threaded=True).serve_forever()
+
+
+def free_port():
+    import socket
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=2000, help='라우트별 호출 횟수')
+    opts = parser.parse_args()
+
+    sock_path = os.path.join(tempfile.mkdtemp(), 'famoussaying_mcp.sock')
+    tcp_port = free_port()
+    proc = multiprocessing.Process(target=serve, args=(tcp_port, sock_path), daemon=True)
+    proc.start()
+    tcp_url = f"http://127.0.0.1:{tcp_port}"
+    for _ in range(100):
+        try:
+            requests.get(tcp_url + '/mcp/famoussaying/health', timeout=1)
+            if os.path.exists(sock_path):
+                break
+        except requests.exceptions.ConnectionError:
+            pass
+        time.sleep(0.05)
+
+    tcp_client = MCPClient(transport='http')
+    tcp_client.famoussaying_base_url = tcp_url
+    uds_client = MCPClient(transport='http')
+    uds_client.famoussaying_base_url = uds_url(sock_path)
+
+    calls = {
+        'tcp-new': lambda path: requests.get(tcp_url + path, timeout=5),
+        'tcp': lambda path: tcp_client._request('famoussaying', 'GET', path, timeout=5),
+        'uds': lambda path: uds_client._request('famoussaying', 'GET', path, timeout=5),
+    }
+
+    print(f"{'route':36s} {'transport':9s} {'mean_us':>8s} {'p50_us':>8s} {'p99_us':>8s}")
+    for path in ('/mcp/famoussaying/health', '/mcp/famoussaying/capabilities'):
+        for name, call in calls.items():
+            call(path).raise_for_status()  # 워밍업
+            samples = []
+            for _ in range(opts.n):
+                t0 = time.perf_counter()
+                call(path)
+                samples.append((time.perf_counter() - t0) * 1e6)
+            print(f"{path:36s} {name:9s} {statistics.mean(samples):8.0f} "
+                  f"{percentile(samples, 50):8.0f} {percentile(samples, 99):8.0f}")
+    proc.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+기록된 Devtalk(Discourse) 웹훅을 devtalk 서버에 재생
+
+입력 파일은 JSONL(한 줄에 한 이벤트) 또는 JSON 배열이며, 각 항목은 다음 중 하나입니다.
+- {"event": "topic_created", "payload": {"topic": {...}}}
+- {"headers": {"X-Discourse-Event": "post_created", ...}, "body": {"post": {...}}}  (Discourse 전달 기록 형식)
+
+각 본문을 --secret으로 서명(X-Discourse-Event-Signature)해 POST 합니다.
+--in-process를 주면 서버를 띄우지 않고 Flask test client로 재생합니다. (임시 DB 사용, 포럼/네트워크 불필요)
+
+사용법:
+    python scripts/replay_devtalk_webhooks.py scripts/devtalk_webhook_samples.jsonl --in-process
+    python scripts/replay_devtalk_webhooks.py recorded.jsonl --url http://127.0.0.1:5006/mcp/devtalk/webhook --secret $DEVTALK_WEBHOOK_SECRET
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'mcp_server'))
+
+import devtalk_webhooks
+
+
+def load_events(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read().strip()
+    if text.startswith('['):
+        records = json.loads(text)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip() and not line.lstrip().startswith('#')]
+    events = []
+    for record in records:
+        headers = record.get('headers') or {}
+        event = record.get('event') or headers.get(devtalk_webhooks.EVENT_HEADER)
+        payload = record.get('payload') or record.get('body')
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        events.append((event, payload))
+    return events
+
+
+def make_sender(args):
+    """(event, body bytes, headers) -> (status, json) 전송 함수"""
+    if args.in_process:
+        os.environ['DEVTALK_WEBHOOK_SECRET'] = args.secret
+        os.environ.setdefault('DEVTALK_TOPICS_PATH', os.path.join(tempfile.mkdtemp(prefix='devtalk-replay-'), 'topics.sqlite3'))
+        import devtalk_mcp_server
+        client = devtalk_mcp_server.app.test_client()
+
+        def send(body, headers):
+            resp = client.post('/mcp/devtalk/webhook', data=body, headers=headers)
+            return resp.status_code, resp.get_json()
+
+        def get(path):
+            return client.get(path).get_json()
+        return send, get
+
+    session = requests.Session()
+    base = args.url.rsplit('/mcp/devtalk/webhook', 1)[0]
+
+    def send(body, headers):
+        resp = session.post(args.url, data=body, headers=headers, timeout=10)
+        try:
+            return resp.status_code, resp.json()
+        except ValueError:
+            return resp.status_code, {"error": resp.text[:200]}
+
+    def get(path):
+        return session.get(base + path, timeout=10).json()
+    return send, get
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('file', help='기록된 웹훅 파일 (JSONL 또는 JSON 배열)')
+    parser.add_argument('--url', default=f"http://127.0.0.1:{os.getenv('DEVTALK_MCP_SERVER_PORT', 5006)}/mcp/devtalk/webhook")
+    parser.add_argument('--secret', default=os.getenv('DEVTALK_WEBHOOK_SECRET') or 'replay-secret')
+    parser.add_argument('--in-process', action='store_true', help='서버 없이 Flask test client로 재생')
+    parser.add_argument('--delay', type=float, default=0.0, help='이벤트 사이 대기(초)')
+    args = parser.parse_args()
+
+    events = load_events(args.file)
+    send, get = make_sender(args)
+    t0 = time.perf_counter()
+    failures = 0
+    for i, (event, payload) in enumerate(events, 1):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = {
+            'Content-Type': 'application/json',
+            devtalk_webhooks.EVENT_HEADER: event or '',
+            devtalk_webhooks.SIGNATURE_HEADER: devtalk_webhooks.sign(args.secret, body),
+        }
+        status, result = send(body, headers)
+        if status != 200:
+            failures += 1
+        result = result or {}
+        print(f"{i:4d} {event:<14} topic={result.get('topic_id')} -> {status} "
+              f"{result.get('reason') or result.get('error')} (open {result.get('open')})")
+        if args.delay:
+            time.sleep(args.delay)
+    elapsed = time.perf_counter() - t0
+
+    count = get('/mcp/devtalk/unanswered-count')
+    listing = get('/mcp/devtalk/unanswered-list')
+    print(f"\nreplayed {len(events)} events in {elapsed * 1000:.1f}ms ({failures} failed)")
+    print(f"unanswered count: {count.get('count')}")
+    for row in (listing.get('data') or {}).get('rows') or []:
+        print(f"  - {row[0]} {row[1]}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+로컬 tam-admin 스텁 서버 (tam_admin_mcp_server 프록시/전체 목록 시험용)
+
+제공 API (Authorization 헤더가 없으면 401):
+- GET  /api/devtalk/chat-matching-list?page=&limit=&major_category=&sub_category=
+       페이지 단위 사전 답변 (data.list, data.totalCount), 페이지별 ETag / If-None-Match 304 지원
+- GET  /api/customers/{id}          고객 조회 (없으면 404)
+- POST /api/customers/{id}/notes    메모 추가 (JSON 바디 그대로 저장 후 201)
+
+모든 요청은 --latency 초 지연됩니다.
+
+사용법:
+    python scripts/stub_tam_admin.py [--port 5905] [--items 500] [--latency 0.05]
+    TAM_ADMIN_API_HOST=http://127.0.0.1:5905 TAM_ADMIN_API_AUTH=stub \\
+    TAM_ADMIN_PROXY_ACTIONS='{"get_customer": {"method": "GET", "path": "/api/customers/{customer_id}", "cache_ttl": 30},
+                              "add_customer_note": {"method": "POST", "path": "/api/customers/{customer_id}/notes"}}' \\
+        python mcp_server/tam_admin_mcp_server.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MAJOR_CATEGORIES = ['login', 'message', 'calendar', 'channel']
+SUB_CATEGORIES = ['error', 'setting', 'policy']
+
+
+def make_items(n):
+    return [
+        {
+            "id": i + 1,
+            "major_category": MAJOR_CATEGORIES[i % len(MAJOR_CATEGORIES)],
+            "sub_category": SUB_CATEGORIES[i % len(SUB_CATEGORIES)],
+            "title": f"사전 답변 {i + 1}",
+            "answer": f"{MAJOR_CATEGORIES[i % len(MAJOR_CATEGORIES)]} 관련 안내 {i + 1}"
+        }
+        for i in range(n)
+    ]
+
+
+def make_handler(state, latency):
+    class StubTamAdmin(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # keep-alive 연결에서 헤더/본문이 따로 나가 지연 ACK에 걸리지 않도록 버퍼링 + Nagle 해제
+        wbufsize = -1
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, body=None, headers=None):
+            data = b'' if body is None else json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            if body is not None:
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _authorized(self):
+            with state["lock"]:
+                state["calls"] += 1
+            time.sleep(latency)
+            if not self.headers.get('Authorization'):
+                self._reply(401, {"error": "unauthorized"})
+                return False
+            return True
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            parts = url.path.strip('/').split('/')
+            if url.path == '/api/devtalk/chat-matching-list':
+                items = [
+                    item for item in state["items"]
+                    if query.get('major_category') in (None, item["major_category"])
+                    and query.get('sub_category') in (None, item["sub_category"])
+                ]
+                page, limit = int(query.get('page', 1)), int(query.get('limit', 20))
+                etag = f'"v{state["version"]}-{url.query}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self._reply(304, headers={'ETag': etag})
+                    return
+                body = {"data": {"list": items[(page - 1) * limit:page * limit], "totalCount": len(items)}}
+                self._reply(200, body, headers={'ETag': etag})
+            elif len(parts) == 3 and parts[:2] == ['api', 'customers']:
+                customer = state["customers"].get(parts[2])
+                if customer is None:
+                    self._reply(404, {"error": "customer not found"})
+                else:
+                    self._reply(200, customer)
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            parts = urlparse(self.path).path.strip('/').split('/')
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if len(parts) == 4 and parts[:2] == ['api', 'customers'] and parts[3] == 'notes':
+                customer = state["customers"].get(parts[2])
+                if customer is None:
+                    self._reply(404, {"error": "customer not found"})
+                    return
+                with state["lock"]:
+                    customer["notes"].append(body)
+                self._reply(201, {"customer_id": parts[2], "notes": len(customer["notes"])})
+            else:
+                self._reply(404, {"error": "not found"})
+
+    return StubTamAdmin
+
+
+def start_stub(port=0, items=500, latency=0.05):
+    """스텁 서버를 백그라운드 스레드로 기동 -> (server, base_url, state)"""
+    state = {
+        "items": make_items(items),
+        "customers": {str(i): {"id": str(i), "name": f"고객 {i}", "notes": []} for i in range(1, 21)},
+        "version": 1,
+        "calls": 0,
+        "lock": threading.Lock()
+    }
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}", state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 tam-admin 스텁 서버')
+    parser.add_argument('--port', type=int, default=5905)
+    parser.add_argument('--items', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+    server, url, _ = start_stub(args.port, args.items, args.latency)
+    print(f"stub tam-admin listening on {url} (items={args.items}, latency={args.latency}s)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+MCP 서버 capabilities 기반 도구 레지스트리
+
+각 MCP 서버의 /capabilities를 동시에 조회해 OpenAI tool 스키마와
+도구 이름 -> 호출 정보(dict) 디스패치 테이블을 구성합니다.
+- 시작 시 디스크 캐시(data/tool_registry_cache.json)를 먼저 적재해 콜드 스타트를 빠르게 합니다.
+- 백그라운드 스레드가 주기적으로 재동기화하며, capabilities가 바뀐 서버만 반영합니다.
+- 표준 MCP 서버(MCP_TRANSPORT=mcp 또는 MCP_EXTRA_SERVERS)는 tools/list로 조회하고 tools/call로 호출합니다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from mcp_client import mcp_client
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(PROJECT_ROOT, 'data', 'tool_registry_cache.json')
+
+
+class ToolRegistry:
+    """capabilities 기반 도구 스키마/디스패치 테이블"""
+
+    def __init__(self, client, servers=None, cache_path=CACHE_PATH, sync_interval=None):
+        self.client = client
+        self.servers = list(servers or client.servers)
+        self.cache_path = cache_path
+        self.sync_interval = sync_interval or int(os.getenv('TOOL_REGISTRY_SYNC_INTERVAL', 60))
+        # 서버별 {"tools": [...], "hash": str, "fetched_at": str}
+        self._server_tools = {}
+        # 도구 이름 -> {"server": str, "endpoint": dict}
+        self._dispatch = {}
+        self._definitions = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    # ===== 캐시 =====
+    def _load_cache(self):
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
+
+    def _save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self._server_tools, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print("[tool_registry] cache save error:", e)
+
+    # ===== 동기화 =====
+    @staticmethod
+    def _hash_tools(tools):
+        raw = json.dumps(tools, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _fetch(self, server):
+        try:
+            if self.client.uses_mcp(server):
+                tools = self.client.list_tools(server)
+            else:
+                tools = self.client.get_capabilities(server, timeout=3).get('tools') or []
+            return server, tools
+        except Exception as e:
+            print(f"[tool_registry] capabilities fetch failed ({server}):", e)
+            return server, None
+
+    def sync(self):
+        """모든 서버 capabilities를 동시에 조회하고 변경된 서버만 반영. 변경 여부 반환"""
+        with ThreadPoolExecutor(max_workers=max(1, len(self.servers))) as pool:
+            results = list(pool.map(self._fetch, self.servers))
+
+        changed = False
+        with self._lock:
+            for server, tools in results:
+                if tools is None:
+                    # 조회 실패 시 직전(캐시) 정보 유지
+                    continue
+                digest = self._hash_tools(tools)
+                if (self._server_tools.get(server) or {}).get('hash') == digest:
+                    continue
+                self._server_tools[server] = {
+                    "tools": tools,
+                    "hash": digest,
+                    "fetched_at": datetime.now().isoformat()
+                }
+                changed = True
+                print(f"[tool_registry] capabilities updated: {server} ({len(tools)} tools)")
+            if changed:
+                self._rebuild()
+                self._save_cache()
+        return changed
+
+    def _rebuild(self):
+        """서버별 도구 목록으로 스키마/디스패치 테이블 재구성 (호출자는 lock 보유)"""
+        dispatch = {}
+        definitions = []
+        for server in self.servers:
+            for tool in (self._server_tools.get(server) or {}).get('tools', []):
+                name = tool.get('name')
+                endpoint = tool.get('endpoint')
+                if not name or name in dispatch:
+                    continue
+                # REST 호출은 endpoint 정의가 필요 (표준 MCP는 tools/call로 호출)
+                if not endpoint and not self.client.uses_mcp(server):
+                    continue
+                dispatch[name] = {"server": server, "endpoint": endpoint}
+                definitions.append({
+                    "type": "function",
+                    "function": {
+                        "name": name,
+                        "description": tool.get('description', ''),
+                        "parameters": tool.get('parameters') or {"type": "object", "properties": {}, "required": []}
+                    }
+                })
+        # 참조 교체로 읽는 쪽은 lock 없이 일관된 스냅샷을 사용
+        self._dispatch = dispatch
+        self._definitions = definitions
+
+    def _sync_loop(self):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                print("[tool_registry] sync error:", e)
+            time.sleep(self.sync_interval)
+
+    def start(self):
+        """디스크 캐시 적재 후 백그라운드 동기화 시작 (캐시가 없으면 최초 1회는 동기 조회)"""
+        if self._thread is not None:
+            return
+        cached = self._load_cache()
+        with self._lock:
+            self._server_tools = {k: v for k, v in cached.items() if k in self.servers}
+            self._rebuild()
+        if not self._definitions:
+            self.sync()
+        self._thread = threading.Thread(target=self._sync_loop, name='tool-registry-sync', daemon=True)
+        self._thread.start()
+
+    # ===== 조회/디스패치 =====
+    def get_tool_definitions(self):
+        """OpenAI tools 형식의 MCP 도구 스키마 목록"""
+        return list(self._definitions)
+
+    def has_tool(self, name):
+        return name in self._dispatch
+
+    def dispatch(self, name, arguments):
+        """도구 이름으로 MCP 서버 endpoint 호출 (O(1) 조회)"""
+        entry = self._dispatch.get(name)
+        if entry is None:
+            return {"success": False, "error": f"알 수 없는 함수: {name}"}
+        if self.client.uses_mcp(entry['server']):
+            idempotent = (entry.get('endpoint') or {}).get('method', 'POST').upper() == 'GET'
+            return self.client.call_tool(entry['server'], name, arguments, idempotent=idempotent)
+        return self.client.call_endpoint(entry['server'], entry['endpoint'], arguments)
+
+
+# 전역 인스턴스
+tool_registry = ToolRegistry(mcp_client)
@@ -0,0 +1,83 @@
+"""
+Unix domain socket용 requests 어댑터
+
+같은 호스트의 MCP 서버를 TCP loopback 대신 UDS로 호출합니다.
+URL 형식: http+unix://<URL 인코딩된 소켓 경로>/경로
+  예) MCP_SERVER_URL=http+unix://%2Ftmp%2Fkakao_mcp.sock
+"""
+import socket
+import threading
+from urllib.parse import unquote, urlparse
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+UDS_SCHEME = 'http+unix://'
+
+
+def uds_url(socket_path):
+    """소켓 경로로 http+unix base URL 생성"""
+    return UDS_SCHEME + socket_path.replace('/', '%2F')
+
+
+class UnixHTTPConnection(HTTPConnection):
+    """TCP 대신 AF_UNIX 소켓으로 연결하는 HTTPConnection"""
+
+    def __init__(self, socket_path, timeout=None, **kwargs):
+        super().__init__('localhost', **kwargs)
+        self.socket_path = socket_path
+        self._uds_timeout = timeout
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        timeout = self._uds_timeout if isinstance(self._uds_timeout, (int, float)) else None
+        sock.settimeout(timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+
+class UnixHTTPConnectionPool(HTTPConnectionPool):
+    """소켓 경로별 keep-alive 연결 풀"""
+
+    def __init__(self, socket_path, timeout=None, maxsize=10):
+        super().__init__('localhost', timeout=timeout, maxsize=maxsize)
+        self.socket_path = socket_path
+
+    def _new_conn(self):
+        return UnixHTTPConnection(self.socket_path, timeout=self.timeout.connect_timeout)
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """http+unix:// URL을 처리하는 requests 어댑터"""
+
+    def __init__(self, pool_maxsize=10, **kwargs):
+        super().__init__(pool_maxsize=pool_maxsize, **kwargs)
+        self._uds_pool_maxsize = pool_maxsize
+        self._uds_pools = {}
+        self._uds_lock = threading.Lock()
+
+    def _pool_for(self, url):
+        socket_path = unquote(urlparse(url).netloc)
+        with self._uds_lock:
+            pool = self._uds_pools.get(socket_path)
+            if pool is None:
+                pool = UnixHTTPConnectionPool(socket_path, maxsize=self._uds_pool_maxsize)
+                self._uds_pools[socket_path] = pool
+        return pool
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self._pool_for(request.url)
+
+    def get_connection(self, url, proxies=None):
+        return self._pool_for(url)
+
+    def request_url(self, request, proxies):
+        return request.path_url
+
+    def close(self):
+        super().close()
+        with self._uds_lock:
+            for pool in self._uds_pools.values():
+                pool.close()
+            self._uds_pools.clear()